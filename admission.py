@@ -0,0 +1,143 @@
+"""
+요청 수락 제어 (admission control)
+
+대기 중인 명함 수 × 단계별 관측 지연시간으로 예상 대기시간을 계산하고,
+SLO를 넘기거나 메모리에 올라간 이미지 바이트가 상한을 넘으면 새 작업을 거절한다.
+"""
+import math
+import threading
+
+
+class AdmissionRejected(Exception):
+    """수락 거절 (HTTP 429 + Retry-After 로 응답)"""
+
+    def __init__(self, message: str, retry_after: int, status_code: int = 429):
+        super().__init__(message)
+        self.retry_after = retry_after
+        self.status_code = status_code
+
+
+class AdmissionTicket:
+    """수락된 요청 하나의 미처리 작업량"""
+
+    def __init__(self, controller: 'AdmissionController', cards: int, nbytes: int):
+        self._controller = controller
+        self.cards = cards
+        self.pending = {stage: cards for stage in controller.stages}
+        self.nbytes = nbytes
+        self.closed = False
+
+    def complete(self, stage: str, elapsed: float = None):
+        """명함 하나가 stage를 마침 (elapsed가 있으면 지연시간 통계에 반영)"""
+        self._controller._complete(self, stage, elapsed)
+
+    def adjust(self, cards: int):
+        """수락 시 추정한 명함 수를 실제 명함 수로 보정 (스트리밍 업로드용)"""
+        self._controller._adjust(self, cards)
+
+    def close(self):
+        """요청 종료: 남은 대기 작업과 이미지 바이트를 반환"""
+        self._controller._close(self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class AdmissionController:
+    """단계별 대기열 추정 기반 수락 제어기"""
+
+    def __init__(self, slo_seconds: float, max_inflight_bytes: int, concurrency: dict, initial_latency: dict, alpha: float = 0.2):
+        self.slo_seconds = slo_seconds
+        self.max_inflight_bytes = max_inflight_bytes
+        self.stages = tuple(concurrency)
+        self.concurrency = dict(concurrency)
+        self.latency = dict(initial_latency)  # 단계별 지수이동평균 지연시간(초)
+        self.alpha = alpha
+        self._lock = threading.Lock()
+        self._pending = {stage: 0 for stage in self.stages}
+        self._inflight_bytes = 0
+        self.admitted = 0
+        self.rejected = 0
+
+    def _wait_locked(self, extra_cards: int = 0) -> float:
+        return sum(
+            (self._pending[stage] + extra_cards) * self.latency[stage] / max(1, self.concurrency[stage])
+            for stage in self.stages
+        )
+
+    def estimated_wait(self, extra_cards: int = 0) -> float:
+        """현재 대기열에 extra_cards를 더했을 때 마지막 명함이 끝날 때까지의 예상 시간(초)"""
+        with self._lock:
+            return self._wait_locked(extra_cards)
+
+    def admit(self, cards: int, nbytes: int) -> AdmissionTicket:
+        """작업 수락 또는 AdmissionRejected 발생"""
+        if nbytes > self.max_inflight_bytes:
+            raise AdmissionRejected('요청 크기가 서버 처리 한도를 초과합니다.', retry_after=0, status_code=413)
+
+        with self._lock:
+            current_wait = self._wait_locked()
+            busy = any(self._pending.values())
+
+            if busy and self._inflight_bytes + nbytes > self.max_inflight_bytes:
+                self.rejected += 1
+                raise AdmissionRejected('처리 중인 이미지가 너무 많습니다.', retry_after=max(1, math.ceil(current_wait)))
+
+            # 유휴 상태에서는 SLO보다 큰 배치라도 수락 (그렇지 않으면 영원히 처리되지 않음)
+            new_wait = self._wait_locked(cards)
+            if busy and new_wait > self.slo_seconds:
+                self.rejected += 1
+                raise AdmissionRejected('서버가 혼잡합니다. 잠시 후 다시 시도해주세요.', retry_after=max(1, math.ceil(new_wait - self.slo_seconds)))
+
+            for stage in self.stages:
+                self._pending[stage] += cards
+            self._inflight_bytes += nbytes
+            self.admitted += 1
+            return AdmissionTicket(self, cards, nbytes)
+
+    def _complete(self, ticket: AdmissionTicket, stage: str, elapsed: float = None):
+        with self._lock:
+            if elapsed is not None:
+                self.latency[stage] += self.alpha * (elapsed - self.latency[stage])
+            if ticket.closed or ticket.pending[stage] <= 0:
+                return
+            ticket.pending[stage] -= 1
+            self._pending[stage] -= 1
+
+    def _adjust(self, ticket: AdmissionTicket, cards: int):
+        with self._lock:
+            if ticket.closed:
+                return
+            delta = cards - ticket.cards
+            ticket.cards = cards
+            for stage in self.stages:
+                change = max(-ticket.pending[stage], delta)
+                ticket.pending[stage] += change
+                self._pending[stage] += change
+
+    def _close(self, ticket: AdmissionTicket):
+        with self._lock:
+            if ticket.closed:
+                return
+            ticket.closed = True
+            for stage in self.stages:
+                self._pending[stage] -= ticket.pending[stage]
+                ticket.pending[stage] = 0
+            self._inflight_bytes -= ticket.nbytes
+
+    def stats(self) -> dict:
+        """헬스 체크용 통계"""
+        with self._lock:
+            return {
+                'pending': dict(self._pending),
+                'latency': {stage: round(value, 3) for stage, value in self.latency.items()},
+                'estimated_wait': round(self._wait_locked(), 3),
+                'slo_seconds': self.slo_seconds,
+                'inflight_bytes': self._inflight_bytes,
+                'max_inflight_bytes': self.max_inflight_bytes,
+                'admitted': self.admitted,
+                'rejected': self.rejected,
+            }
@@ -1,26 +1,53 @@
-from flask import Flask, request, jsonify, render_template_string, send_file, make_response
+from flask import Flask, request, jsonify, render_template_string, send_file, make_response, Response
 import os
 import json
 import re
 import time
 import base64
 import requests
-import qrcode
 from datetime import datetime
 import io
 from werkzeug.utils import secure_filename
 import tempfile
-import zipfile
+import shutil
 import asyncio
 import aiohttp
-from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed, wait, FIRST_COMPLETED
+from concurrent.futures import TimeoutError as FutureTimeoutError
+import uuid
 import threading
 from functools import partial
 import multiprocessing
+import sqlite3
 
 # pipeline_card.py의 핵심 로직 통합
 import ollama
 import dotenv
+from singleflight import SingleFlight, content_hash
+from admission import AdmissionController, AdmissionRejected
+from streaming_upload import UploadedFile, UploadTooLarge, get_multipart_boundary, iter_uploaded_files
+from deadline import Deadline, DeadlineRegistry, WastedWorkCounter, latest_remaining
+from zipstream import stream_zip
+from result_store import ResultStore
+from contact_db import ContactStore
+from qr_render import MATRIX_CACHE, MIME_TYPES, negotiate_format, payload_hash, qr_base64, render, render_qr_job
+import contact_sheet
+from contact_export import EXPORT_FORMATS, stream_export
+import vcard
+from qr_payload import PAYLOAD_STYLES, build_qr_payload
+import qr_payload
+from dedupe import DedupeIndex, merge_records
+import dedupe
+from perceptual_hash import ImageHashIndex, hamming
+import perceptual_hash
+import card_crop
+import card_pairing
+import image_quality
+import ocr_layout
+import ocr_refine
+import line_labels
+import line_classifier
+import layout_templates
 dotenv.load_dotenv()
 
 app = Flask(__name__)
@@ -34,6 +61,105 @@ NAVER_OCR_INVOKE_URL = os.environ.get('NAVER_OCR_INVOKE_URL')
 MAX_WORKERS = min(32, (os.cpu_count() or 1) + 4)  # CPU 코어 수에 따른 최적화
 OCR_SEMAPHORE = threading.Semaphore(5)  # OCR API 동시 호출 제한
 LLM_SEMAPHORE = threading.Semaphore(3)  # LLM 동시 처리 제한
+PIPELINE_THREADS = MAX_WORKERS * 2  # 단계 조율용 스레드 (워커 풀 결과 대기)
+MAX_UPLOAD_FILE_BYTES = 10 * 1024 * 1024  # 명함 이미지 1장 최대 크기
+ESTIMATED_CARD_BYTES = 1024 * 1024  # 명함 수를 모를 때 본문 크기로 추정하는 기준
+REQUEST_DEADLINE_SECONDS = float(os.environ.get('REQUEST_DEADLINE_SECONDS', 120))  # 요청당 최대 처리 시간
+STAGE_GRACE_SECONDS = 2.0  # 워커가 자체 timeout으로 끝날 때까지 기다려주는 여유 시간
+RESULT_POLL_SECONDS = 0.5  # 취소 여부를 확인하는 주기
+VCARD_VERSION = os.environ.get('VCARD_VERSION', vcard.DEFAULT_VERSION)  # 생성하는 vCard 버전 (3.0 / 4.0)
+QR_PAYLOAD_STYLE = os.environ.get('QR_PAYLOAD_STYLE', qr_payload.DEFAULT_STYLE)  # QR 페이로드 형식 (vcard / vcard-min / mecard)
+DEDUPE_THRESHOLD = float(os.environ.get('DEDUPE_THRESHOLD', dedupe.DEFAULT_THRESHOLD))  # 중복으로 볼 필드 유사도
+CARD_CROP = os.environ.get('CARD_CROP', 'auto')  # OCR 전 명함 영역 자르기 (auto: 신뢰도가 낮으면 원본 / off)
+CARD_SPLIT = os.environ.get('CARD_SPLIT', 'auto')  # 여러 장이 찍힌 사진을 명함별로 분리 (auto / off)
+EXTRACT_MODE = os.environ.get('EXTRACT_MODE', 'json')  # LLM 추출 방식 (json: 값을 JSON으로 받음 / labels: 줄 번호 → 필드 라벨만 받고 값은 OCR 줄에서 조립)
+LABEL_MAX_TOKENS = 160  # 라벨링 모드 LLM 최대 출력 토큰 (줄 20개 라벨 분량)
+LINE_CLASSIFIER = os.environ.get('LINE_CLASSIFIER', 'auto')  # 사용자 수정으로 학습한 줄 분류기를 LLM 전에 사용 (auto: 충분히 학습되면 / off: 학습도 하지 않음)
+LINE_CLASSIFIER_CONFIDENCE = float(os.environ.get('LINE_CLASSIFIER_CONFIDENCE', 0.9))  # 모든 줄의 확률이 이 이상일 때만 LLM 생략
+LAYOUT_TEMPLATES = os.environ.get('LAYOUT_TEMPLATES', 'auto')  # 확정된 명함 디자인을 템플릿으로 저장해 같은 디자인은 위치로 추출 (auto / off: 저장도 하지 않음)
+OCR_REFINE = os.environ.get('OCR_REFINE', 'auto')  # 신뢰도 낮은 전화번호/이메일 필드만 고해상도로 다시 OCR (auto / off)
+QUALITY_GATE = os.environ.get('QUALITY_GATE', 'check')  # OCR 전 사진 품질 검사 (check: 흔들림/어두움 등은 바로 거절 / off)
+CARD_PAIRING = os.environ.get('CARD_PAIRING', 'off')  # 일괄 처리에서 한글/영문면 자동 짝짓기 (auto: 모든 OCR이 끝난 뒤 LLM 시작 / off)
+IMAGE_REUSE = os.environ.get('IMAGE_REUSE', 'exact')  # 처리된 이미지 결과 재사용 (off / exact: 같은 파일만 / similar: 근접 중복 포함)
+NEAR_DUPLICATE_DISTANCE = int(os.environ.get('NEAR_DUPLICATE_DISTANCE', perceptual_hash.DEFAULT_MAX_DISTANCE))  # pHash 해밍 거리 임계값
+DEDUPE_MAX_BLOCK_SIZE = int(os.environ.get('DEDUPE_MAX_BLOCK_SIZE', dedupe.DEFAULT_MAX_BLOCK_SIZE))  # 이보다 흔한 blocking key는 비교 제외
+
+# 요청 간 공유 워커 풀 (요청마다 새 프로세스를 띄우지 않도록 지연 생성)
+_worker_pool = None
+_pipeline_executor = None
+_pool_lock = threading.Lock()
+
+# 동일 이미지/동일 OCR 텍스트의 중복 처리 방지
+IMAGE_FLIGHT = SingleFlight('image')
+LLM_FLIGHT = SingleFlight('llm')
+
+def get_worker_pool() -> ProcessPoolExecutor:
+    """OCR/LLM 단계를 실행하는 공유 프로세스 풀"""
+    global _worker_pool
+    with _pool_lock:
+        if _worker_pool is None:
+            _worker_pool = ProcessPoolExecutor(max_workers=MAX_WORKERS)
+        return _worker_pool
+
+def get_pipeline_executor() -> ThreadPoolExecutor:
+    """명함 단위 파이프라인(OCR → LLM)을 조율하는 공유 스레드 풀"""
+    global _pipeline_executor
+    with _pool_lock:
+        if _pipeline_executor is None:
+            _pipeline_executor = ThreadPoolExecutor(max_workers=PIPELINE_THREADS)
+        return _pipeline_executor
+
+# 처리된 명함 결과 보관 (다운로드/수정 요청은 card id + 수정 필드만 전송)
+RESULT_STORE = ResultStore(
+    ttl_seconds=float(os.environ.get('RESULT_TTL_SECONDS', 6 * 60 * 60)),
+    max_items=int(os.environ.get('RESULT_STORE_MAX_ITEMS', 10000)),
+)
+
+# 추출된 연락처 영구 저장소 (SQLite WAL + FTS5 검색)
+CONTACT_DB = ContactStore(os.environ.get('CONTACT_DB_PATH', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'contacts.db')))
+
+# 줄 분류기 (학습할 때마다 LINE_MODEL_DIR에 새 버전 저장, 시작 시 최신 버전 로드)
+LINE_MODEL = line_classifier.LineClassifier(
+    os.environ.get('LINE_MODEL_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'line_model'))
+    if LINE_CLASSIFIER != 'off' else None
+)
+
+# 명함 레이아웃 템플릿 (확정될 때마다 TEMPLATE_INDEX_PATH에 저장, 시작 시 로드)
+TEMPLATE_INDEX = layout_templates.TemplateIndex(
+    os.environ.get('TEMPLATE_INDEX_PATH', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'layout_templates.json'))
+    if LAYOUT_TEMPLATES != 'off' else None
+)
+
+# 저장된 연락처의 중복 클러스터 (첫 조회 시 DB에서 구성, 이후 저장될 때마다 증분 갱신)
+DEDUPE = DedupeIndex(threshold=DEDUPE_THRESHOLD, max_block_size=DEDUPE_MAX_BLOCK_SIZE)
+
+# OCR 전 명함 영역 자르기 전후 비교 통계
+CROP_STATS = card_crop.CropStats()
+
+# 처리된 명함 이미지의 pHash 색인 (첫 업로드 시 DB에서 구성)
+IMAGE_HASHES = ImageHashIndex(max_distance=NEAR_DUPLICATE_DISTANCE)
+IMAGE_REUSE_MODES = ('off', 'exact', 'similar')
+CARD_SPLIT_MODES = ('off', 'auto')
+CARD_PAIRING_MODES = ('off', 'auto')
+QUALITY_MODES = ('off', 'check')
+
+# OCR 전 사진 품질 검사 통계 (임계값 조정용 점수는 로그로 남김)
+QUALITY_STATS = image_quality.QualityStats()
+
+# 필드 재인식 통계 (재인식은 워커 프로세스에서 하고, 결과 줄 목록으로 메인 프로세스에서 집계)
+REFINE_STATS = ocr_refine.RefineStats()
+
+# 진행 중인 요청의 마감시간 (취소 API용)과 취소로 절약한 작업 통계
+ACTIVE_REQUESTS = DeadlineRegistry()
+WASTED_WORK = WastedWorkCounter()
+
+# 수락 제어: 예상 대기시간이 SLO를 넘거나 메모리 내 이미지가 상한을 넘으면 429
+ADMISSION = AdmissionController(
+    slo_seconds=float(os.environ.get('ADMISSION_SLO_SECONDS', 60)),
+    max_inflight_bytes=int(os.environ.get('MAX_INFLIGHT_IMAGE_BYTES', 256 * 1024 * 1024)),
+    concurrency={'ocr': OCR_SEMAPHORE._value, 'llm': LLM_SEMAPHORE._value},
+    initial_latency={'ocr': 2.0, 'llm': 8.0},
+)
 
 # GPU 활용을 위한 Ollama 설정 확인
 def check_ollama_gpu():
@@ -218,6 +344,8 @@ HTML_TEMPLATE = """
                 <div id="batch-mode-ui">
                     <div class="upload-area" id="batch-upload-area"><p>파일을 드래그하거나 클릭</p></div>
                     <input type="file" id="batch-file-input" multiple accept="image/*" class="hidden">
+                    <label style="display: block; margin-top: 0.75rem; font-size: 0.9rem; color: var(--text-secondary);"><input type="checkbox" id="reuse-similar"> 비슷한 사진은 이전 결과 재사용 (OCR 생략)</label>
+                    <label style="display: block; margin-top: 0.5rem; font-size: 0.9rem; color: var(--text-secondary);"><input type="checkbox" id="pair-sides"> 한글/영문면 사진을 자동으로 짝지어 양면 처리</label>
                     <button class="btn btn-primary" style="width: 100%; margin-top: 1rem;" onclick="processBatchFiles()">일괄 처리 시작</button>
                 </div>
 
@@ -230,6 +358,11 @@ HTML_TEMPLATE = """
                     <input type="file" id="back-file-input" accept="image/*" class="hidden">
                     <button class="btn btn-primary" style="width: 100%; margin-top: 1rem;" onclick="processTwoSidedFiles()">양면 처리 시작</button>
                 </div>
+
+                <div id="contact-search-ui" style="margin-top: 1.5rem;">
+                    <input type="text" class="input-group" id="contact-search" placeholder="저장된 연락처 찾기 (초성 검색 가능: ㅎㄱㄷ)" autocomplete="off" oninput="suggestContacts()">
+                    <ul class="result-list" id="contact-suggestions"></ul>
+                </div>
             </div>
 
             <!-- 나머지 패널들은 이전과 동일 -->
@@ -258,7 +391,18 @@ HTML_TEMPLATE = """
                         </div>
                     </div>
                     <div id="download-section" style="margin-top: 1.5rem;">
-                         <button class="btn btn-primary" style="width: 100%;" onclick="downloadBatch()">전체 VCF 다운로드</button>
+                         <select id="export-format" class="input-group" style="width: 100%; margin-bottom: 0.5rem;">
+                            <option value="zip">연락처별 VCF (ZIP)</option>
+                            <option value="vcf">하나의 VCF 파일</option>
+                            <option value="csv-google">CSV (Google 주소록)</option>
+                            <option value="csv-outlook">CSV (Outlook)</option>
+                            <option value="jsonl">JSON Lines</option>
+                         </select>
+                         <button class="btn btn-primary" style="width: 100%;" onclick="downloadBatch()">전체 연락처 다운로드</button>
+                         <div class="action-buttons" style="margin-top: 0.5rem;">
+                            <button class="btn btn-secondary" onclick="downloadContactSheet('pdf')">QR 시트 (PDF)</button>
+                            <button class="btn btn-secondary" onclick="downloadContactSheet('png')">QR 시트 (PNG)</button>
+                         </div>
                          <p id="download-notice" style="font-size: 0.9rem; color: var(--text-secondary); margin-top: 0.5rem; text-align:center;"></p>
                     </div>
                 </div>
@@ -285,6 +429,7 @@ HTML_TEMPLATE = """
                 <li id="step-3"><div class="status-icon"></div><span>VCF/QR 생성</span></li>
             </ul>
             <p id="loader-message">GPU 가속으로 처리 중...</p>
+            <button class="btn btn-secondary" onclick="cancelProcessing()">취소</button>
         </div>
     </div>
     
@@ -377,6 +522,14 @@ HTML_TEMPLATE = """
     }
     const hideLoader = () => document.getElementById('loader').classList.add('hidden');
 
+    // 재사용/근접 중복 표시 (근접 중복은 같은 디자인의 다른 사람 명함일 수 있으므로 확인 필요)
+    function duplicateNote(item) {
+        if (item.paired) return '<p style="font-size: 0.8rem; color: var(--text-secondary);">🔗 앞/뒷면 사진을 합친 양면 결과</p>';
+        if (item.reused) return `<p style="font-size: 0.8rem; color: var(--text-secondary);">♻️ 이전 결과 재사용${item.reused.match === 'similar' ? ' (비슷한 이미지)' : ''}</p>`;
+        if (item.near_duplicate) return '<p style="font-size: 0.8rem; color: var(--text-secondary);">⚠️ 이전에 처리한 명함과 비슷합니다</p>';
+        return '';
+    }
+
     function renderBatchResults() {
         const listEl = document.getElementById('result-list');
         listEl.innerHTML = '';
@@ -388,7 +541,7 @@ HTML_TEMPLATE = """
                 li.className = `result-item ${item.id === activeItemId ? 'active' : ''}`;
                 li.id = `item-${item.id}`;
                 li.onclick = () => selectItem(item.id);
-                li.innerHTML = `<img src="data:image/jpeg;base64,${item.thumbnail}" alt="thumbnail"><div class="result-item-info"><p style="font-weight: 600;">${item.data.name||'이름 없음'}</p><p style="font-size: 0.9rem; color: var(--text-secondary);">${item.data.company||'회사 정보 없음'}</p></div>`;
+                li.innerHTML = `${item.thumbnail ? `<img src="data:image/jpeg;base64,${item.thumbnail}" alt="thumbnail">` : ''}<div class="result-item-info"><p style="font-weight: 600;">${item.data.name||item.data.name_ko||'이름 없음'}</p><p style="font-size: 0.9rem; color: var(--text-secondary);">${item.data.company||item.data.company_ko||'회사 정보 없음'}</p>${duplicateNote(item)}</div>`;
                 listEl.appendChild(li);
             });
         
@@ -398,14 +551,52 @@ HTML_TEMPLATE = """
     
     function filterResults() { renderBatchResults(); }
 
+    // 저장된 연락처 자동완성: 입력이 잠시 멈추면 요청하고, 진행 중인 이전 요청은 취소 (늦게 온 응답이 최신 결과를 덮지 않도록)
+    let suggestTimer = null, suggestController = null;
+    function suggestContacts() {
+        clearTimeout(suggestTimer);
+        suggestTimer = setTimeout(async () => {
+            const query = document.getElementById('contact-search').value.trim();
+            const listEl = document.getElementById('contact-suggestions');
+            if (suggestController) suggestController.abort();
+            if (!query) { listEl.innerHTML = ''; return; }
+            suggestController = new AbortController();
+            try {
+                const response = await fetch(`/api/contacts/autocomplete?q=${encodeURIComponent(query)}`, { signal: suggestController.signal });
+                const result = await response.json();
+                listEl.innerHTML = '';
+                result.items.forEach(item => {
+                    const li = document.createElement('li'), info = document.createElement('div');
+                    const name = document.createElement('p'), company = document.createElement('p');
+                    li.className = 'result-item'; info.className = 'result-item-info';
+                    name.style.fontWeight = '600'; name.textContent = item.data.name_ko || item.data.name || '이름 없음';
+                    company.style.cssText = 'font-size: 0.9rem; color: var(--text-secondary);';
+                    company.textContent = item.data.company_ko || item.data.company || '회사 정보 없음';
+                    info.append(name, company); li.appendChild(info);
+                    li.onclick = () => addStoredContact(item);
+                    listEl.appendChild(li);
+                });
+            } catch (error) { if (error.name !== 'AbortError') console.error(error); }
+        }, 120);
+    }
+
+    // 선택한 저장 연락처를 결과 목록에 추가하고 선택 (썸네일 없음)
+    function addStoredContact(item) {
+        if (currentMode !== 'batch') switchMode('batch');
+        if (!batchData.some(d => d.id === item.id)) batchData.push({ id: item.id, source: item.source, data: item.data });
+        document.getElementById('contact-search').value = '';
+        document.getElementById('contact-suggestions').innerHTML = '';
+        selectItem(item.id);
+    }
+
     async function selectItem(itemId) {
         activeItemId = itemId;
         const item = batchData.find(d => d.id === itemId);
         if (!item) return;
 
         renderBatchResults();
-        renderEditor(item.data, false);
-        generateQrAndVcf(item.data, 'batch', false);
+        renderEditor(item.data, Boolean(item.paired));
+        generateQrAndVcf(item.data, 'batch', false, item);
         
         document.getElementById('batch-item-details').classList.remove('hidden');
         updatePanelsVisibility();
@@ -423,8 +614,43 @@ HTML_TEMPLATE = """
         }
     }
     
-    async function processFiles(apiEndpoint, formData) {
+    // 진행 중인 처리 요청 ID (페이지를 떠나거나 취소 버튼을 누르면 서버에 취소 요청)
+    let currentRequestId = null;
+
+    function newRequestId() {
+        return crypto.randomUUID ? crypto.randomUUID() : `${Date.now()}-${Math.random().toString(16).slice(2)}`;
+    }
+
+    function cancelProcessing() {
+        if (currentRequestId) fetch(`/api/cancel/${currentRequestId}`, { method: 'POST' });
+    }
+
+    window.addEventListener('pagehide', () => {
+        if (currentRequestId) navigator.sendBeacon(`/api/cancel/${currentRequestId}`);
+    });
+
+    // 서버가 429를 반환하면 Retry-After 만큼 기다렸다가 재시도
+    const MAX_ADMISSION_RETRIES = 3;
+
+    async function fetchWithRetryAfter(url, options) {
+        const messageEl = document.getElementById('loader-message');
+        const defaultMessage = messageEl.textContent;
+        for (let attempt = 0; ; attempt++) {
+            const response = await fetch(url, options);
+            if (response.status !== 429 || attempt >= MAX_ADMISSION_RETRIES) return response;
+
+            const retryAfter = parseInt(response.headers.get('Retry-After'), 10) || 5;
+            for (let remaining = retryAfter; remaining > 0; remaining--) {
+                messageEl.textContent = `서버가 혼잡합니다. ${remaining}초 후 다시 시도합니다...`;
+                await new Promise(r => setTimeout(r, 1000));
+            }
+            messageEl.textContent = defaultMessage;
+        }
+    }
+    
+    async function processFiles(apiEndpoint, formData, headers = {}) {
         showLoader(true);
+        currentRequestId = newRequestId();
         try {
             updateLoaderStep(0, 'in-progress');
             await new Promise(r => setTimeout(r, 500));
@@ -432,10 +658,10 @@ HTML_TEMPLATE = """
             updateLoaderStep(0, 'completed');
             updateLoaderStep(1, 'in-progress');
             
-            const response = await fetch(apiEndpoint, { method: 'POST', body: formData });
+            const response = await fetchWithRetryAfter(apiEndpoint, { method: 'POST', body: formData, headers: { ...headers, 'X-Request-Id': currentRequestId } });
             const result = await response.json();
 
-            if (!result.success) throw new Error(result.error);
+            if (!result.success) throw Object.assign(new Error(result.error), { quality: result.quality });
             
             updateLoaderStep(1, 'completed');
             updateLoaderStep(2, 'in-progress');
@@ -446,6 +672,7 @@ HTML_TEMPLATE = """
             return result;
         } finally {
             // Loader will be hidden by the calling function after VCF generation
+            currentRequestId = null;
         }
     }
 
@@ -458,10 +685,26 @@ HTML_TEMPLATE = """
         for(const file of files) formData.append('images', file);
         
         try {
-            const result = await processFiles('/api/process-batch', formData);
+            const reuse = document.getElementById('reuse-similar').checked ? 'similar' : 'exact';
+            const pairing = document.getElementById('pair-sides').checked ? 'auto' : 'off';
+            const result = await processFiles(`/api/process-batch?reuse=${reuse}&pairing=${pairing}`, formData, { 'X-Card-Count': String(files.length) });
             batchData = result.results;
             updateLoaderStep(2, 'completed');
             renderBatchResults();
+            // 품질 검사에서 거절된 사진: 이유를 보여주고 원하면 검사 없이 다시 처리
+            const rejected = result.rejected || [];
+            if (rejected.length) {
+                const reasons = rejected.map(r => `- ${files[r.index].name}: ${r.problems.map(p => p.message).join(' ')}`).join('\n');
+                if (confirm(`${rejected.length}장은 사진 품질 문제로 처리하지 않았습니다.\n${reasons}\n\n그래도 처리할까요?`)) {
+                    const retryData = new FormData();
+                    rejected.forEach(r => retryData.append('images', files[r.index]));
+                    const forced = await processFiles(`/api/process-batch?reuse=${reuse}&pairing=${pairing}&quality=off`, retryData, { 'X-Card-Count': String(rejected.length) });
+                    batchData = batchData.concat(forced.results);
+                    renderBatchResults();
+                }
+            }
+            if (batchData.length > 0) prefetchBatchQrCodes().catch(console.error);
+            if (result.partial) alert(`시간 초과 또는 취소로 ${result.unfinished}개 명함은 처리되지 않았습니다.`);
         } catch (error) {
             alert('오류: ' + error.message);
         } finally {
@@ -470,7 +713,7 @@ HTML_TEMPLATE = """
         }
     }
 
-    async function processTwoSidedFiles() {
+    async function processTwoSidedFiles(skipQualityCheck = false) {
         const frontFile = document.getElementById('front-file-input').files[0];
         const backFile = document.getElementById('back-file-input').files[0];
         if (!frontFile || !backFile) return alert('앞면과 뒷면 파일을 모두 선택해주세요.');
@@ -481,15 +724,20 @@ HTML_TEMPLATE = """
         formData.append('backImage', backFile);
         
         try {
-            const result = await processFiles('/api/process-two-sided', formData);
-            await generateQrAndVcf(result.contactInfo, 'single', false);
+            const result = await processFiles(`/api/process-two-sided${skipQualityCheck ? '?quality=off' : ''}`, formData);
+            await generateQrAndVcf(result.contactInfo, 'single', false, { id: result.id });
             
             updateLoaderStep(2, 'completed');
             
-            singleResultData = result.contactInfo;
+            singleResultData = { ...result.contactInfo, id: result.id };
             renderEditor(singleResultData, true);
             updatePanelsVisibility();
         } catch (error) {
+            if (error.quality) {
+                hideLoader();
+                if (confirm(`사진 품질 문제로 처리하지 않았습니다.\n${error.message}\n\n그래도 처리할까요?`)) await processTwoSidedFiles(true);
+                return;
+            }
             alert('처리 중 오류가 발생했습니다: ' + error.message);
         } finally {
             await new Promise(r => setTimeout(r, 500));
@@ -497,29 +745,46 @@ HTML_TEMPLATE = """
         }
     }
     
-    async function downloadBatch() {
+    // 서버에 저장된 명함은 id와 수정한 필드만 보냄 (만료되었으면 썸네일을 뺀 전체 데이터로 재요청)
+    function postJson(url, body) {
+        return fetch(url, { method: 'POST', headers: {'Content-Type': 'application/json'}, body: JSON.stringify(body) });
+    }
+
+    // 저장된 id로 요청하고, 만료(410)되었으면 썸네일을 뺀 전체 데이터로 다시 요청하여 파일로 저장
+    async function downloadBatchFile(url, fallbackName) {
         if (batchData.length === 0) return alert('다운로드할 데이터가 없습니다.');
         showLoader(false);
         try {
-            const response = await fetch('/api/download-batch', {
-                method: 'POST', headers: {'Content-Type': 'application/json'}, body: JSON.stringify({ items: batchData })
-            });
+            const edits = Object.fromEntries(batchData.filter(d => d.edits).map(d => [d.id, d.edits]));
+            let response = await postJson(url, { ids: batchData.map(d => d.id), edits });
+            if (response.status === 410) {
+                response = await postJson(url, { items: batchData.map(({ id, data }) => ({ id, data })) });
+            }
             if (response.ok) {
-                const blob = await response.blob(), url = window.URL.createObjectURL(blob);
+                const blob = await response.blob(), objectUrl = window.URL.createObjectURL(blob);
                 const a = document.createElement('a');
-                a.href = url;
+                a.href = objectUrl;
                 const disposition = response.headers.get('Content-Disposition');
-                let filename = 'contacts.zip';
+                let filename = fallbackName;
                 if (disposition) {
                     const match = disposition.match(/filename="(.+)"/);
                     if (match) filename = match[1];
                 }
-                a.download = filename; a.click(); window.URL.revokeObjectURL(url);
+                a.download = filename; a.click(); window.URL.revokeObjectURL(objectUrl);
             } else alert('다운로드 실패');
         } catch (error) { alert('다운로드 중 오류가 발생했습니다: ' + error.message); } 
         finally { hideLoader(); }
     }
 
+    function downloadBatch() {
+        const format = document.getElementById('export-format').value;
+        return downloadBatchFile(`/api/download-batch?format=${format}`, `contacts.${format === 'zip' ? 'zip' : format.split('-')[0]}`);
+    }
+
+    function downloadContactSheet(format) {
+        return downloadBatchFile(`/api/export/contact-sheet?format=${format}`, format === 'png' ? 'qr_sheet.zip' : 'qr_sheet.pdf');
+    }
+
     function updateItemData() {
         let dataObject;
         if (currentMode === 'batch') {
@@ -533,27 +798,68 @@ HTML_TEMPLATE = """
         const form = document.getElementById('editor-form');
         form.querySelectorAll('input').forEach(input => {
             const key = input.id.replace('edit-', '');
-            if (key in dataObject) dataObject[key] = input.value;
+            if (key in dataObject && dataObject[key] !== input.value) {
+                dataObject[key] = input.value;
+                // 서버 저장본에 반영할 필드 단위 수정사항
+                const owner = currentMode === 'batch' ? batchData.find(d => d.id === activeItemId) : singleResultData;
+                owner.edits = { ...(owner.edits || {}), [key]: input.value };
+                delete owner.qr;
+            }
         });
         alert('저장되었습니다.');
         if (currentMode === 'batch') {
             renderBatchResults(); selectItem(activeItemId);
         } else {
-            renderEditor(dataObject, true); generateQrAndVcf(dataObject, 'single');
+            renderEditor(dataObject, true); generateQrAndVcf(dataObject, 'single', true, dataObject);
+        }
+    }
+
+    // 배치 결과 전체의 VCF/QR을 한 번의 요청으로 미리 생성 (NDJSON 스트림을 받는 대로 저장)
+    // 명함마다 한 줄: 실패한 명함은 {index, id, error} 줄로 오며, 저장하지 않고 선택할 때 개별 요청으로 다시 생성
+    async function prefetchBatchQrCodes() {
+        const response = await postJson('/api/generate-vcf-qr/bulk', { ids: batchData.map(d => d.id) });
+        if (!response.ok || !response.body) return;
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        let buffered = '';
+        while (true) {
+            const { done, value } = await reader.read();
+            if (done) break;
+            buffered += decoder.decode(value, { stream: true });
+            const lines = buffered.split('\n');
+            buffered = lines.pop();
+            for (const line of lines) {
+                if (!line) continue;
+                const result = JSON.parse(line);
+                if (result.error) {
+                    console.warn(`VCF/QR 미리 생성 실패: ${result.id} (${result.error})`);
+                    continue;
+                }
+                const item = batchData.find(d => d.id === result.id);
+                if (item && !item.edits) item.qr = result;
+            }
         }
     }
 
-    async function generateQrAndVcf(data, type, showOwnLoader = true) {
+    async function generateQrAndVcf(data, type, showOwnLoader = true, card = null) {
         if (showOwnLoader) showLoader(false);
         try {
-            const response = await fetch('/api/generate-vcf-qr', {
-                method: 'POST', headers: {'Content-Type': 'application/json'}, body: JSON.stringify({ contactData: data })
-            });
-            const result = await response.json();
-            if (!result.success) throw new Error(result.error);
+            // 일괄 생성으로 미리 받아둔 결과가 있으면 요청 없이 사용
+            let result = card && card.qr;
+            if (!result) {
+                let response = card && card.id
+                    ? await postJson('/api/generate-vcf-qr', { id: card.id, edits: card.edits })
+                    : null;
+                if (!response || response.status === 410) {
+                    response = await postJson('/api/generate-vcf-qr', { contactData: data });
+                }
+                result = await response.json();
+                if (!result.success) throw new Error(result.error);
+            }
 
             const name = data.name_en || data.name_ko || data.name || 'contact';
-            const qrImgSrc = `data:image/png;base64,${result.qrCode}`;
+            const qrMimeType = result.qrMimeType || 'image/png';
+            const qrImgSrc = `data:${qrMimeType};base64,${result.qrCode}`;
             
             const ids = type === 'batch' 
                 ? { qr: 'batch-qr-code', vcf: 'batch-vcf-download', qrLink: 'batch-qr-download' }
@@ -566,7 +872,7 @@ HTML_TEMPLATE = """
             
             const qrLink = document.getElementById(ids.qrLink);
             qrLink.href = qrImgSrc;
-            qrLink.download = `${name}_qrcode.png`;
+            qrLink.download = `${name}_qrcode.${qrMimeType === 'image/svg+xml' ? 'svg' : 'png'}`;
         } finally {
             if (showOwnLoader) hideLoader();
         }
@@ -614,30 +920,30 @@ async def ocr_agent_async(image_path: str, session: aiohttp.ClientSession) -> li
                 response.raise_for_status()
                 result_json = await response.json()
         
-        full_text = ""
-        for image_result in result_json.get('images', []):
-            for field in image_result.get('fields', []):
-                full_text += field.get('inferText', '') + " "
-        
-        sentences = [s.strip() for s in full_text.strip().replace('\n', ' ').split('.') if s.strip()]
-        return [{'id': idx + 1, 'text': sentence} for idx, sentence in enumerate(sentences)]
+        return ocr_layout.assemble(result_json)
         
     except Exception as e:
         print(f"[OCR Async Error] {e}")
         return []
 
-def extract_structured_info_with_gpu(raw_text: str, model_name: str = 'mistral:latest') -> dict:
+def ollama_client(timeout: float = None):
+    """timeout이 있으면 전용 클라이언트, 없으면 기본 ollama 모듈 함수 사용"""
+    return ollama.Client(timeout=timeout) if timeout else ollama
+
+def extract_structured_info_with_gpu(raw_text: str, model_name: str = 'mistral:latest', timeout: float = None) -> dict:
     """GPU 가속화된 정보 추출"""
     prompt = f"""You are an expert business card information extractor. From the provided text, extract the required information into a valid JSON format. For missing information, use an empty string "". Return ONLY valid JSON.
 
     Required JSON structure: {{"name": "", "title": "", "company": "", "phone": "", "email": "", "address": ""}}
     
+    The text is OCR output, one line per line of the card in reading order.
+
     --- Text to Analyze ---
     {raw_text}"""
     
     try:
         with LLM_SEMAPHORE:  # 동시 LLM 처리 제한
-            response = ollama.chat(
+            response = ollama_client(timeout).chat(
                 model=model_name,
                 messages=[{'role': 'user', 'content': prompt}],
                 format='json',
@@ -657,77 +963,320 @@ def extract_structured_info_with_gpu(raw_text: str, model_name: str = 'mistral:l
         print(f"[LLM GPU Error] {e}")
         return {"name": "", "title": "", "company": "", "phone": "", "email": "", "address": ""}
 
-def process_single_card_parallel(args):
-    """단일 명함 병렬 처리를 위한 워커 함수"""
-    file_path, idx, base64_data = args
+def label_lines_with_gpu(numbered_lines: str, two_sided: bool = False, model_name: str = 'mistral:latest', timeout: float = None):
+    """줄 라벨링: 줄 번호가 붙은 OCR 텍스트 → LLM 응답 원문 ({"줄 번호": "필드"}), 실패하면 None"""
+    side_note = "\n    - The text has a Korean front side and an English back side; label lines on both sides." if two_sided else ""
+    prompt = f"""You label the numbered OCR lines of a business card. Return ONLY a JSON object that maps a line number to the field it contains.
+
+    - Fields: name, title, company, phone, email, address. Leave out lines with none of them.
+    - If one line holds several fields, use a list in reading order, e.g. {{"2": ["name", "title"], "4": "phone"}}.
+    - Do not copy any text from the lines.{side_note}
+
+    --- Numbered Lines ---
+    {numbered_lines}"""
     
     try:
-        # OCR 처리 (동기 방식으로 변경)
-        with OCR_SEMAPHORE:
-            ocr_list = ocr_agent(file_path)
-        
+        with LLM_SEMAPHORE:
+            response = ollama_client(timeout).chat(
+                model=model_name,
+                messages=[{'role': 'user', 'content': prompt}],
+                format='json',
+                options={
+                    'temperature': 0.1,
+                    'num_gpu': -1,  # 모든 GPU 사용
+                    'num_thread': 4,
+                    'num_predict': LABEL_MAX_TOKENS,
+                }
+            )
+            print(f"🏷️ 줄 라벨링 출력 토큰: {response.get('eval_count', '?')}")
+            return response['message']['content']
+
+    except Exception as e:
+        print(f"[Label LLM GPU Error] {e}")
+        return None
+
+def extract_by_labels(ocr_lists, timeout: float = None) -> dict:
+    """라벨링 모드 추출: [OCR 줄 목록] (단면 1개 / 한글면, 영문면 2개) → 추출 결과
+
+    라벨을 해석할 수 없으면 같은 남은 시간 안에서 JSON 추출로 한 번 더 시도한다.
+    """
+    start = time.time()
+    if len(ocr_lists) == 1:
+        ocr_list = ocr_lists[0]
+        line_ids = {line['id'] for line in ocr_list}
+        labels = line_labels.parse_labels(label_lines_with_gpu(ocr_layout.numbered_text(ocr_list), timeout=timeout), line_ids)
+        if labels:
+            return line_labels.assemble(ocr_list, labels)
+    else:
+        front, back = ocr_lists[0], line_labels.renumber(ocr_lists[1], len(ocr_lists[0]))
+        line_ids = {line['id'] for line in front + back}
+        numbered_lines = f"--- Front Side (Korean) ---\n{ocr_layout.numbered_text(front)}\n\n--- Back Side (English) ---\n{ocr_layout.numbered_text(back)}"
+        labels = line_labels.parse_labels(label_lines_with_gpu(numbered_lines, two_sided=True, timeout=timeout), line_ids)
+        if labels:
+            return line_labels.assemble_two_sided(front, back, labels)
+
+    print("⚠️ 줄 라벨을 해석할 수 없어 JSON 추출로 다시 시도합니다.")
+    timeout = None if timeout is None else timeout - (time.time() - start)
+    if timeout is not None and timeout <= 0:
+        return None
+    texts = [ocr_layout.plain_text(ocr_list) for ocr_list in ocr_lists]
+    if len(texts) == 1:
+        return extract_structured_info_with_gpu(texts[0], timeout=timeout)
+    return two_sided_extract_agent_gpu(*texts, timeout=timeout)
+
+def remaining_until(deadline_at: float = None):
+    """워커 프로세스에서 절대 마감시각까지 남은 시간 (마감 없음이면 None)"""
+    return None if deadline_at is None else deadline_at - time.time()
+
+def ocr_stage(file_path: str, deadline_at: float = None):
+    """OCR 단계 워커 함수 (프로세스 풀에서 실행)
+
+    큐에서 기다리는 동안 마감이 지났으면 OCR을 호출하지 않고 None을 반환한다.
+    """
+    timeout = remaining_until(deadline_at)
+    if timeout is not None and timeout <= 0:
+        return None
+    with OCR_SEMAPHORE:
+        return ocr_agent(file_path, timeout=timeout)
+
+def llm_stage(full_text: str, deadline_at: float = None) -> dict:
+    """LLM 단계 워커 함수 (프로세스 풀에서 실행)"""
+    timeout = remaining_until(deadline_at)
+    if timeout is not None and timeout <= 0:
+        return None
+    return extract_structured_info_with_gpu(full_text, timeout=timeout)
+
+def two_sided_stage(front_text: str, back_text: str, deadline_at: float = None) -> dict:
+    """양면 LLM 단계 워커 함수 (프로세스 풀에서 실행)"""
+    timeout = remaining_until(deadline_at)
+    if timeout is not None and timeout <= 0:
+        return None
+    return two_sided_extract_agent_gpu(front_text, back_text, timeout=timeout)
+
+def label_stage(ocr_lists, deadline_at: float = None) -> dict:
+    """라벨링 모드 LLM 단계 워커 함수 (프로세스 풀에서 실행, 단면/양면 공용)"""
+    timeout = remaining_until(deadline_at)
+    if timeout is not None and timeout <= 0:
+        return None
+    return extract_by_labels(ocr_lists, timeout=timeout)
+
+def skip_stages(stages, ticket=None):
+    """마감/취소로 실행하지 않은 단계를 절약 통계에 기록"""
+    for stage in stages:
+        WASTED_WORK.record(stage, ADMISSION.latency[stage])
+        if ticket:
+            ticket.complete(stage)
+
+def crop_before_ocr(crop_future, file_path: str, timeout: float = None) -> card_crop.CropResult:
+    """명함 영역 자르기 결과 대기 (시간 초과/오류면 원본 사용)"""
+    try:
+        crop = wait_stage(crop_future, timeout)
+    except Exception as e:
+        print(f"⚠️ 명함 영역 검출 실패: {os.path.basename(file_path)} ({e})")
+        crop = None
+    if crop is None:
+        return card_crop.CropResult(file_path, False, 0.0, 'skipped', 0, 0)
+    CROP_STATS.record(crop)
+    if crop.cropped:
+        print(f"✂️ 명함 영역 자르기: {os.path.basename(file_path)} {crop.bytes_before // 1024}KB → {crop.bytes_after // 1024}KB (신뢰도 {crop.confidence:.2f})")
+    return crop
+
+def wait_stage(future, timeout: float = None):
+    """워커 풀 작업 대기: 마감까지 끝나지 않으면 아직 시작 전인 작업은 취소하고 None"""
+    try:
+        return future.result(timeout=None if timeout is None else timeout + STAGE_GRACE_SECONDS)
+    except FutureTimeoutError:
+        future.cancel()
+        return None
+
+def run_ocr_pipeline(file_path: str, ticket=None, waiters=None, crop: bool = True):
+    """단일 명함 OCR 단계 (명함 영역 자르기 포함): OCR 결과 목록, 마감/실패면 None
+
+    waiters는 이 명함을 기다리는 요청들의 Deadline 목록으로, 모두 마감되면 OCR을 건너뛴다.
+    여러 장 사진에서 분리된 명함은 이미 잘라낸 이미지이므로 crop=False로 호출한다.
+    """
+    def budget():
+        return latest_remaining(waiters) if waiters else None
+
+    try:
+        pool = get_worker_pool()
+        timeout = budget()
+        if timeout is not None and timeout <= 0:
+            skip_stages(('ocr', 'llm'), ticket)
+            return None
+
+        stage_start = time.time()
+        cropped = not crop
+        if crop and CARD_CROP != 'off':
+            crop = crop_before_ocr(pool.submit(card_crop.crop_for_ocr, file_path), file_path, timeout)
+            file_path, cropped = crop.path, crop.cropped
+            timeout = budget()
+        ocr_start = time.time()
+        ocr_future = pool.submit(ocr_stage, file_path, None if timeout is None else time.time() + timeout)
+        ocr_list = wait_stage(ocr_future, timeout)
+        if ocr_list is None:  # 큐에서 취소/워커가 마감 후 건너뜀 (실행 중에 마감되면 LLM만 절약)
+            skip_stages(('llm',) if ocr_future.running() else ('ocr', 'llm'), ticket)
+            return None
+        if ticket:
+            ticket.complete('ocr', time.time() - stage_start)
         if not ocr_list:
             return None
-        
-        full_text = ' '.join([item['text'] for item in ocr_list])
-        contact_info = extract_structured_info_with_gpu(full_text)
-        
-        return {
-            'id': f"card-{int(time.time() * 1000)}-{idx}",
-            'source': os.path.basename(file_path),
-            'data': contact_info,
-            'thumbnail': base64_data
-        }
-        
+        CROP_STATS.record_ocr(cropped, time.time() - ocr_start, sum(len(item['text']) for item in ocr_list))
+        REFINE_STATS.record(ocr_list)
+        return ocr_list
+    except Exception as e:
+        print(f"[OCR Pipeline Error] {e}")
+        return None
+
+def match_layout_template(ocr_list) -> dict:
+    """같은 디자인으로 확정된 명함의 템플릿에 맞으면 위치로 추출 (맞는 템플릿이 없거나 이름/연락처를 못 찾으면 None)"""
+    confidence, template_id, labels = TEMPLATE_INDEX.lookup(ocr_list)
+    if confidence < layout_templates.MIN_CONFIDENCE:
+        return None
+    contact_info = line_labels.assemble(ocr_list, labels)
+    if not contact_info['name'] or not (contact_info['phone'] or contact_info['email']):
+        return None
+    print(f"📐 레이아웃 템플릿으로 추출 (LLM 생략, 템플릿 {template_id}, 신뢰도 {confidence:.2f}): {contact_info['name']}")
+    return contact_info
+
+def classify_lines(ocr_list) -> dict:
+    """학습된 줄 분류기로 추출 (학습이 덜 됐거나, 확신이 낮거나, 이름/연락처를 못 찾으면 None → LLM)"""
+    labels = LINE_MODEL.label(ocr_list, LINE_CLASSIFIER_CONFIDENCE)
+    if not labels:
+        return None
+    contact_info = line_labels.assemble(ocr_list, labels)
+    if not contact_info['name'] or not (contact_info['phone'] or contact_info['email']):
+        return None
+    print(f"🧮 줄 분류기로 추출 (LLM 생략, 모델 v{LINE_MODEL.version}): {contact_info['name']}")
+    return contact_info
+
+def run_extract_pipeline(ocr_lists, ticket=None, waiters=None):
+    """OCR 결과 → LLM 추출 (OCR 텍스트 해시로 single-flight): (추출 결과, 단면이면 OCR 줄 목록)
+
+    ocr_lists가 [한글면, 영문면] 두 개면 양면 추출 한 번으로 두 명함 몫의 LLM 단계를 마친다.
+    단면은 레이아웃 템플릿이 맞거나 줄 분류기가 모든 줄을 확신하면 LLM을 부르지 않는다.
+    OCR 줄 목록은 결과와 함께 보관되어, 확정되면 템플릿과 줄 분류기 학습에 쓰인다.
+    추출 중 오류가 나면 run_card_pipeline과 같이 None을 반환해 그 명함만 빠진다.
+    """
+    try:
+        timeout = latest_remaining(waiters) if waiters else None
+        if timeout is not None and timeout <= 0:
+            skip_stages(('llm',) * len(ocr_lists), ticket)
+            return None
+
+        lines = ocr_lists[0] if len(ocr_lists) == 1 else None
+        for enabled, extract in ((LAYOUT_TEMPLATES != 'off', match_layout_template), (LINE_CLASSIFIER != 'off', classify_lines)):
+            if not lines or not enabled:
+                continue
+            stage_start = time.time()
+            contact_info = extract(lines)
+            if contact_info:
+                if ticket:
+                    ticket.complete('llm', time.time() - stage_start)
+                return contact_info, lines
+
+        texts = [ocr_layout.plain_text(ocr_list) for ocr_list in ocr_lists]
+        deadline_at = None if timeout is None else time.time() + timeout
+        if EXTRACT_MODE == 'labels':
+            stage, args = label_stage, (ocr_lists,)
+        else:
+            stage, args = (llm_stage if len(texts) == 1 else two_sided_stage), texts
+        stage_start = time.time()
+        # LLM Future는 다른 명함과 공유될 수 있으므로 취소하지 않고 워커의 timeout에 맡긴다
+        llm_future = LLM_FLIGHT.submit(content_hash('\0'.join(texts)), get_worker_pool().submit, stage, *args, deadline_at)
+        try:
+            contact_info = llm_future.result(timeout=None if timeout is None else timeout + STAGE_GRACE_SECONDS)
+        except FutureTimeoutError:
+            return None
+        except Exception as e:
+            print(f"[Extract Error] {e}")
+            return None
+        if ticket:
+            ticket.complete('llm', time.time() - stage_start)
+            for _ in texts[1:]:
+                ticket.complete('llm')
+        return contact_info, lines
+    except Exception as e:
+        print(f"[Extract Pipeline Error] {e}")
+        return None
+
+def run_card_pipeline(file_path: str, ticket=None, waiters=None, crop: bool = True):
+    """단일 명함 파이프라인: OCR과 LLM을 공유 워커 풀에서 순서대로 실행
+
+    LLM 단계는 OCR 텍스트 해시로 single-flight 처리되어, 다른 이미지라도
+    같은 텍스트가 동시에 들어오면 한 번만 추론한다.
+    단계별 소요시간은 수락 제어(ticket)의 대기시간 추정에 반영된다.
+    waiters는 이 명함을 기다리는 요청들의 Deadline 목록으로, 모두 마감되면
+    남은 단계를 건너뛰고 각 단계에는 남은 시간이 timeout으로 전달된다.
+    """
+    try:
+        ocr_list = run_ocr_pipeline(file_path, ticket, waiters, crop)
+        if not ocr_list:
+            return None
+        return run_extract_pipeline([ocr_list], ticket, waiters)
+
     except Exception as e:
         print(f"[Single Card Process Error] {e}")
         return None
 
-def ocr_agent(image_path: str) -> list[dict]:
-    """동기 OCR 처리 (병렬 처리용)"""
-    print(f"\n[ OCR Agent ] Processing '{os.path.basename(image_path)}'...")
-    
-    if not NAVER_OCR_SECRET_KEY or not NAVER_OCR_INVOKE_URL:
-        print("[Error] NAVER CLOVA OCR 환경 변수가 설정되지 않았습니다.")
-        return []
-    
+def clova_ocr(name: str, image, fmt: str, timeout: float = None) -> dict:
+    """CLOVA OCR 호출: 이미지 파일 객체/바이트 → 응답 JSON"""
     request_body = {
         'version': 'V2',
         'requestId': 'NCP-OCR-ID-' + str(int(time.time() * 1000)),
         'timestamp': int(time.time() * 1000),
         'lang': 'ko',
         'images': [{
-            'format': os.path.splitext(image_path)[1][1:].upper(),
-            'name': os.path.basename(image_path)
+            'format': fmt.upper(),
+            'name': name
         }]
     }
     
     headers = {'X-OCR-Secret': NAVER_OCR_SECRET_KEY}
+    files = {
+        'file': (name, image, 'image/' + fmt.lower()),
+        'message': (None, json.dumps(request_body).encode('UTF-8'), 'application/json')
+    }
+    response = requests.post(NAVER_OCR_INVOKE_URL, headers=headers, files=files, timeout=timeout)
+    response.raise_for_status()
+    return response.json()
+
+def reocr_weak_fields(image_path: str, result_json: dict, timeout: float = None) -> dict:
+    """신뢰도 낮은 연락처 필드만 고해상도로 다시 OCR (실패/시간 부족이면 첫 OCR 결과 그대로)"""
+    if timeout is not None and timeout <= 0:
+        return result_json
+    try:
+        refined = ocr_refine.refine(image_path, result_json, partial(clova_ocr, timeout=timeout))
+    except Exception as e:
+        print(f"⚠️ 필드 재인식 실패: {os.path.basename(image_path)} ({e})")
+        return result_json
+    if refined is not result_json:
+        fields = [field for image_result in refined.get('images', []) for field in image_result.get('fields', []) if field.get('reocr')]
+        improved = sum(field['reocr'] == 'improved' for field in fields)
+        print(f"🔎 필드 재인식: {os.path.basename(image_path)} {len(fields)}개 중 {improved}개 개선")
+    return refined
+
+def ocr_agent(image_path: str, timeout: float = None) -> list[dict]:
+    """동기 OCR 처리 (병렬 처리용)"""
+    print(f"\n[ OCR Agent ] Processing '{os.path.basename(image_path)}'...")
+    
+    if not NAVER_OCR_SECRET_KEY or not NAVER_OCR_INVOKE_URL:
+        print("[Error] NAVER CLOVA OCR 환경 변수가 설정되지 않았습니다.")
+        return []
     
+    start = time.time()
     try:
         with open(image_path, 'rb') as img_file:
-            files = {
-                'file': (os.path.basename(image_path), img_file, 'image/' + os.path.splitext(image_path)[1][1:].lower()),
-                'message': (None, json.dumps(request_body).encode('UTF-8'), 'application/json')
-            }
-            response = requests.post(NAVER_OCR_INVOKE_URL, headers=headers, files=files)
-            response.raise_for_status()
-        
-        result_json = response.json()
-        full_text = ""
-        
-        for image_result in result_json.get('images', []):
-            for field in image_result.get('fields', []):
-                full_text += field.get('inferText', '') + " "
-        
-        sentences = [s.strip() for s in full_text.strip().replace('\n', ' ').split('.') if s.strip()]
-        return [{'id': idx + 1, 'text': sentence} for idx, sentence in enumerate(sentences)]
+            result_json = clova_ocr(os.path.basename(image_path), img_file, os.path.splitext(image_path)[1][1:], timeout)
+        if OCR_REFINE != 'off':
+            result_json = reocr_weak_fields(image_path, result_json, None if timeout is None else timeout - (time.time() - start))
+        return ocr_layout.assemble(result_json)
         
     except Exception as e:
         print(f"[OCR Error] {e}")
         return []
 
-def two_sided_extract_agent_gpu(front_text: str, back_text: str, model_name: str = 'mistral:latest') -> dict:
+def two_sided_extract_agent_gpu(front_text: str, back_text: str, model_name: str = 'mistral:latest', timeout: float = None) -> dict:
     """GPU 가속화된 양면 명함 분석"""
     combined_text = f"--- Front Side (Korean) ---\n{front_text}\n\n--- Back Side (English) ---\n{back_text}"
     
@@ -736,6 +1285,7 @@ def two_sided_extract_agent_gpu(front_text: str, back_text: str, model_name: str
     - Fill `_ko` fields from Korean text and `_en` fields from English text.
     - For missing information, use an empty string "".
     - `phone` and `email` are usually the same on both sides.
+    - Each side is OCR output, one line per line of the card in reading order.
     - Return ONLY valid JSON.
     
     Required JSON structure: {{"name_ko": "", "name_en": "", "title_ko": "", "title_en": "", "company_ko": "", "company_en": "", "phone": "", "email": "", "address_ko": "", "address_en": ""}}
@@ -745,7 +1295,7 @@ def two_sided_extract_agent_gpu(front_text: str, back_text: str, model_name: str
     
     try:
         with LLM_SEMAPHORE:
-            response = ollama.chat(
+            response = ollama_client(timeout).chat(
                 model=model_name,
                 messages=[{'role': 'user', 'content': prompt}],
                 format='json',
@@ -766,68 +1316,223 @@ def two_sided_extract_agent_gpu(front_text: str, back_text: str, model_name: str
         return {"name_ko": "", "name_en": "", "title_ko": "", "title_en": "", "company_ko": "", "company_en": "", "phone": "", "email": "", "address_ko": "", "address_en": ""}
 
 def generate_vcf_content(data: dict) -> str:
-    """양면 지원 VCF 생성 함수 (이전과 동일)"""
-    vcf_lines = ["BEGIN:VCARD", "VERSION:3.0"]
-    
-    name_ko = data.get('name_ko') or data.get('name', '')
-    name_en = data.get('name_en', '')
-    
-    if name_ko and name_en:
-        vcf_lines.append(f"FN;CHARSET=UTF-8:{name_ko} {name_en}")
-        vcf_lines.append(f"N;CHARSET=UTF-8:{name_ko};{name_en};;;")
-    elif name_ko:
-        vcf_lines.append(f"FN;CHARSET=UTF-8:{name_ko}")
-        vcf_lines.append(f"N;CHARSET=UTF-8:{name_ko};;;;")
-    elif name_en:
-        vcf_lines.append(f"FN;CHARSET=UTF-8:{name_en}")
-        vcf_lines.append(f"N;CHARSET=UTF-8:{name_en};;;;")
-
-    title_ko = data.get('title_ko') or data.get('title', '')
-    title_en = data.get('title_en', '')
-    if title_ko or title_en:
-        full_title = f"{title_ko}{' / ' if title_ko and title_en else ''}{title_en}"
-        vcf_lines.append(f"TITLE;CHARSET=UTF-8:{full_title}")
-    
-    company_ko = data.get('company_ko') or data.get('company', '')
-    company_en = data.get('company_en', '')
-    if company_ko or company_en:
-        full_company = f"{company_ko}{' / ' if company_ko and company_en else ''}{company_en}"
-        vcf_lines.append(f"ORG;CHARSET=UTF-8:{full_company}")
-    
-    if data.get('phone'):
-        vcf_lines.append(f"TEL;TYPE=WORK,VOICE:{data['phone']}")
-    if data.get('email'):
-        vcf_lines.append(f"EMAIL;TYPE=WORK:{data['email']}")
-    
-    address = data.get('address_ko', '') or data.get('address', '')
-    if address:
-        vcf_lines.append(f"ADR;TYPE=WORK;CHARSET=UTF-8:;;{address};;;;")
-    
-    vcf_lines.append(f"REV:{datetime.now().strftime('%Y%m%dT%H%M%SZ')}")
-    vcf_lines.append("END:VCARD")
-    
-    return '\n'.join(vcf_lines)
-
-def generate_qr_code(vcf_content):
-    """QR 코드 생성 함수 (이전과 동일)"""
-    qr = qrcode.QRCode(
-        version=1,
-        error_correction=qrcode.constants.ERROR_CORRECT_L,
-        box_size=10,
-        border=4
-    )
-    qr.add_data(vcf_content)
-    qr.make(fit=True)
-    
-    qr_image = qr.make_image(fill_color="black", back_color="white")
-    img_buffer = io.BytesIO()
-    qr_image.save(img_buffer, format='PNG')
-    return base64.b64encode(img_buffer.getvalue()).decode()
+    """양면 지원 VCF 생성 함수 (단건용 - 여러 건은 vcard.VCardSerializer를 배치마다 하나 만들어 사용)"""
+    return vcard.serialize(data, VCARD_VERSION)
+
+def generate_qr_code(qr, fmt: str = 'png'):
+    """QR 코드 생성 함수 (매트릭스 캐시 + PIL 없이 PNG/SVG 직접 렌더링, base64 반환)"""
+    return qr_base64(qr.payload, fmt, qr.error_correction)
+
+def requested_qr_style(style: str = None) -> str:
+    """요청의 QR 페이로드 형식 (없으면 QR_PAYLOAD_STYLE)"""
+    style = style or QR_PAYLOAD_STYLE
+    if style not in PAYLOAD_STYLES:
+        raise ValueError(f"지원하지 않는 QR 페이로드 형식입니다: {style}")
+    return style
 
 # ==========================================================================
 # GPU 병렬 처리 Flask API Endpoints
 # ==========================================================================
 
+def new_card_id(idx: int) -> str:
+    """결과 저장소 키로 쓰이는 명함 id (요청 간 충돌 방지용 난수 포함)"""
+    return f"card-{int(time.time() * 1000)}-{idx}-{uuid.uuid4().hex[:8]}"
+
+def persist_contacts(records):
+    """처리/수정된 결과를 결과 저장소와 연락처 DB에 저장 (DB 오류로 응답이 실패하지는 않음)"""
+    for record in records:
+        RESULT_STORE.put(record['id'], record)
+    try:
+        CONTACT_DB.save_many(records)
+    except sqlite3.Error as e:
+        print(f"⚠️ 연락처 DB 저장 실패: {e}")
+        return
+    DEDUPE.add_many(records)
+    IMAGE_HASHES.add_many(records)
+
+def learn_from_edits(records):
+    """사용자가 수정한 명함의 (OCR 줄, 최종 필드)로 줄 분류기를 점진 학습 (파이프라인 스레드에서, 같은 최종 값은 한 번만)"""
+    if LINE_CLASSIFIER == 'off':
+        return
+    for record in records:
+        learned = content_hash(json.dumps(record['data'], sort_keys=True, ensure_ascii=False))
+        if not record.get('lines') or record.get('learned') == learned:
+            continue
+        record['learned'] = learned
+        get_pipeline_executor().submit(LINE_MODEL.learn, record['lines'], dict(record['data']))
+
+def remember_layouts(records):
+    """확정된 명함(수정/다운로드)의 OCR 줄 위치로 레이아웃 템플릿을 추가/정리 (파이프라인 스레드에서, 같은 최종 값은 한 번만)"""
+    if LAYOUT_TEMPLATES == 'off':
+        return
+    for record in records:
+        if not record.get('lines'):
+            continue
+        confirmed = content_hash(json.dumps(record['data'], sort_keys=True, ensure_ascii=False))
+        if record.get('template_confirmed') == confirmed:
+            continue
+        record['template_confirmed'] = confirmed
+        get_pipeline_executor().submit(TEMPLATE_INDEX.confirm, record['lines'], dict(record['data']))
+
+def persist_edits(records, edits: dict):
+    """수정사항이 반영된 결과만 연락처 DB에 다시 저장하고 줄 분류기/레이아웃 템플릿 학습에 사용"""
+    edited = [record for record in records if edits and record['id'] in edits]
+    if edited:
+        persist_contacts(edited)
+        learn_from_edits(edited)
+        remember_layouts(edited)
+
+def resolve_requested_items(payload: dict):
+    """요청 본문의 ids(+edits) 또는 기존 방식의 items를 (결과 목록, 만료된 id 목록)으로 변환"""
+    if payload.get('ids'):
+        found, missing = RESULT_STORE.resolve(payload['ids'], payload.get('edits'))
+        persist_edits(found, payload.get('edits'))
+        return found, missing
+    return payload.get('items', []), []
+
+def image_hash_index() -> ImageHashIndex:
+    """pHash 색인 (처음 사용할 때 저장된 모든 pHash로 구성)"""
+    if not IMAGE_HASHES.loaded:
+        IMAGE_HASHES.load(CONTACT_DB.iter_image_phashes())
+    return IMAGE_HASHES
+
+def upload_phash(upload):
+    """업로드 이미지의 pHash (디코드할 수 없는 이미지면 None - OCR은 그대로 시도)"""
+    try:
+        return perceptual_hash.phash(upload.data)
+    except Exception as e:
+        print(f"⚠️ pHash 계산 실패: {upload.filename} ({e})")
+        return None
+
+def find_processed_card(image_hash: str, image_phash, reuse_mode: str):
+    """이미 처리된 같은/비슷한 명함: (재사용할 저장 결과 또는 None, 일치 정보 또는 None)
+
+    같은 파일(SHA-256)은 항상 재사용한다. pHash 근접 중복은 같은 디자인의 다른 사람 명함일 수 있어
+    reuse_mode가 similar일 때만 재사용하고, 아니면 일치 정보만 알려 사용자가 판단하게 한다.
+    """
+    if reuse_mode == 'off':
+        return None, None
+    stored = CONTACT_DB.find_by_image_hash(image_hash)
+    if stored:
+        return stored, {'id': stored['id'], 'source': stored['source'], 'match': 'exact', 'distance': 0}
+    if image_phash is None:
+        return None, None
+    for distance, card_id in image_hash_index().search(image_phash):
+        stored = CONTACT_DB.get(card_id)
+        if stored:  # 병합으로 삭제된 연락처는 건너뜀
+            match = {'id': stored['id'], 'source': stored['source'], 'match': 'similar', 'distance': distance}
+            return (stored if reuse_mode == 'similar' else None), match
+    return None, None
+
+def check_quality(data: bytes, name: str, mode: str) -> image_quality.QualityReport:
+    """OCR 전 품질 검사 (점수는 임계값 조정용으로 항상 로그) - mode가 off면 문제가 있어도 처리"""
+    report = image_quality.assess(data)
+    QUALITY_STATS.record(report, forced=mode == 'off')
+    print(f"🔍 품질 점수: {name} {report.scores}{' → ' + ', '.join(report.problems) if report.problems else ''}")
+    return report
+
+def submit_card_flight(pipeline, file_path: str, *args, **kwargs):
+    """IMAGE_FLIGHT용 제출 함수: 업로드 파일을 작업 전용 임시 폴더로 복사해 파이프라인이 소유하게 한다
+
+    다른 요청이 합류한 작업은 처음 요청이 끝나(마감/취소) 업로드 임시 폴더를 지운 뒤에도 계속되므로,
+    원본 경로 대신 복사본으로 실행하고 작업이 끝나면(모든 대기자가 결과를 받을 수 있게 된 뒤) 폴더를 지운다.
+    """
+    flight_dir = tempfile.mkdtemp(prefix='card-flight-')
+    owned_path = os.path.join(flight_dir, os.path.basename(file_path))
+    try:
+        shutil.copyfile(file_path, owned_path)
+        future = get_pipeline_executor().submit(pipeline, owned_path, *args, **kwargs)
+    except BaseException:
+        shutil.rmtree(flight_dir, ignore_errors=True)
+        raise
+    future.add_done_callback(lambda _: shutil.rmtree(flight_dir, ignore_errors=True))
+    return future
+
+def split_upload(upload: UploadedFile, timeout: float = None) -> list:
+    """여러 장이 함께 찍힌 사진이면 명함별 UploadedFile 목록 (파일명 '<원본>#<번호>'), 아니면 [upload]"""
+    try:
+        cards = wait_stage(get_worker_pool().submit(card_crop.split_cards, upload.path), timeout)
+    except Exception as e:
+        print(f"⚠️ 여러 장 분리 실패: {upload.filename} ({e})")
+        cards = None
+    if not cards:
+        return [upload]
+    CROP_STATS.record_split(len(cards))
+    print(f"🃏 여러 장 분리: {upload.filename} → {len(cards)}장")
+    pieces = []
+    for number, card in enumerate(cards, 1):
+        with open(card.path, 'rb') as f:
+            data = f.read()
+        pieces.append(UploadedFile(upload.index, f"{upload.filename}#{number}", card.path, data, content_hash(data)))
+    return pieces
+
+def pair_uploaded_cards(ocr_futures: dict, ticket, deadline: Deadline) -> tuple:
+    """OCR이 끝난 명함을 한글/영문면으로 짝지어 LLM 추출 시작: ({추출 Future: [결과 인자]}, OCR이 끝나지 않은 명함 수)
+
+    짝은 전체 업로드를 봐야 정할 수 있으므로 마감까지 모든 OCR을 기다린 뒤 한 번에 매칭한다.
+    짝이 된 두 이미지는 양면 추출 한 번으로 하나의 결과가 되고, 짝이 없으면 한 면만으로 추출한다.
+    """
+    pending = set(ocr_futures)
+    while pending and not deadline.expired():
+        _, pending = wait(pending, timeout=min(RESULT_POLL_SECONDS, deadline.remaining()), return_when=FIRST_COMPLETED)
+    cards = [(future, future.result()) for future in ocr_futures if future not in pending]
+    cards = [(future, ocr_list) for future, ocr_list in cards if ocr_list]
+    pairs, singles = card_pairing.pair_sides([' '.join([item['text'] for item in ocr_list]) for _, ocr_list in cards])
+
+    executor = get_pipeline_executor()
+    extract_futures = {}
+    for front, back in pairs:
+        (front_future, front_ocr), (back_future, back_ocr) = cards[front], cards[back]
+        (front_source, idx, thumbnail, front_hash, image_phash, match, _), *front_rest = ocr_futures[front_future]
+        (back_source, _, _, back_hash, _, back_match, _), *back_rest = ocr_futures[back_future]
+        paired = {'front': front_source, 'back': back_source}
+        pair_hash = content_hash(front_hash + back_hash)  # 양면 처리 API와 같은 방식
+        future = executor.submit(run_extract_pipeline, [front_ocr, back_ocr], ticket, [deadline])
+        extract_futures[future] = [(f"{front_source} + {back_source}", idx, thumbnail, pair_hash, image_phash, match or back_match, paired)] + front_rest + back_rest
+        print(f"🔗 앞/뒷면 짝: {front_source} + {back_source}")
+    for index in singles:
+        future, ocr_list = cards[index]
+        extract_futures[executor.submit(run_extract_pipeline, [ocr_list], ticket, [deadline])] = ocr_futures[future]
+    return extract_futures, sum(len(ocr_futures[future]) for future in pending)
+
+def nearest_in_batch(image_phash, batch_hashes):
+    """같은 업로드에서 먼저 들어온 가장 비슷한 이미지 (거리, Future, 파일명) - 임계값 밖이면 None"""
+    if image_phash is None or not batch_hashes:
+        return None
+    nearest = min(
+        ((hamming(image_phash, other_hash), future, source) for other_hash, future, source in batch_hashes),
+        key=lambda item: item[0],
+    )
+    return nearest if nearest[0] <= NEAR_DUPLICATE_DISTANCE else None
+
+def expired_items_response(missing):
+    """저장소에서 만료된 항목 응답 (410) - 프런트엔드는 전체 데이터로 다시 요청"""
+    return jsonify({'success': False, 'error': '만료되었거나 존재하지 않는 항목이 있습니다.', 'missing': missing}), 410
+
+def start_request_deadline() -> Deadline:
+    """요청 마감시간 생성: 서버 기본값과 클라이언트가 보낸 X-Request-Timeout 중 짧은 쪽"""
+    seconds = REQUEST_DEADLINE_SECONDS
+    client_timeout = request.headers.get('X-Request-Timeout', type=float)
+    if client_timeout and client_timeout > 0:
+        seconds = min(seconds, client_timeout)
+    deadline = Deadline(seconds, request.headers.get('X-Request-Id') or uuid.uuid4().hex)
+    ACTIVE_REQUESTS.register(deadline)
+    return deadline
+
+@app.errorhandler(AdmissionRejected)
+def handle_admission_rejected(e):
+    """수락 거절 응답 (429/413 + Retry-After)"""
+    response = jsonify({'success': False, 'error': str(e), 'retry_after': e.retry_after})
+    response.status_code = e.status_code
+    if e.retry_after:
+        response.headers['Retry-After'] = str(e.retry_after)
+    return response
+
+@app.errorhandler(UploadTooLarge)
+def handle_upload_too_large(e):
+    """업로드 파일 크기 초과 응답 (413)"""
+    return jsonify({'success': False, 'error': str(e)}), 413
+
 @app.route('/')
 def index():
     """메인 페이지"""
@@ -835,99 +1540,240 @@ def index():
 
 @app.route('/api/process-batch', methods=['POST'])
 def process_batch_parallel():
-    """GPU 병렬 처리 다중 명함 API"""
-    try:
-        files = request.files.getlist('images')
-        if not files or files[0].filename == '':
-            return jsonify({'success': False, 'error': '이미지 파일이 필요합니다.'})
+    """GPU 병렬 처리 다중 명함 API (?reuse=off|exact|similar, ?split=auto|off, ?pairing=auto|off, ?quality=check|off - 기본값은 환경 변수)
 
-        print(f"\n🚀 GPU 병렬 처리 시작: {len(files)}개 명함")
+    multipart 본문을 스트리밍으로 파싱하여, 파일 파트가 완성되는 즉시 OCR을 시작한다.
+    (나머지 파일이 업로드되는 동안 앞선 명함의 처리가 겹쳐서 진행됨)
+    여러 장이 함께 찍힌 사진은 명함별로 분리하여 각각 한 장의 업로드처럼 처리한다.
+    이미 처리된 이미지(같은 파일, similar면 pHash 근접 중복 포함)는 저장된 결과를 재사용하고,
+    같은 업로드 안의 근접 중복은 similar면 먼저 들어온 이미지의 처리에 합류한다.
+    pairing=auto면 OCR까지만 먼저 진행하고, 한글/영문면을 짝지어 짝마다 양면 추출을 한 번 한다.
+    흔들리거나 어두운 사진은 OCR 없이 rejected로 바로 돌려주고, quality=off로 다시 보내면 그대로 처리한다.
+    """
+    boundary = get_multipart_boundary(request.content_type)
+    if boundary is None:
+        return jsonify({'success': False, 'error': '이미지 파일이 필요합니다.'})
+    reuse_mode = request.args.get('reuse', IMAGE_REUSE)
+    if reuse_mode not in IMAGE_REUSE_MODES:
+        return jsonify({'success': False, 'error': f'지원하지 않는 재사용 방식입니다: {reuse_mode}'}), 400
+    split_mode = request.args.get('split', CARD_SPLIT)
+    if split_mode not in CARD_SPLIT_MODES:
+        return jsonify({'success': False, 'error': f'지원하지 않는 분리 방식입니다: {split_mode}'}), 400
+    pairing = request.args.get('pairing', CARD_PAIRING)
+    if pairing not in CARD_PAIRING_MODES:
+        return jsonify({'success': False, 'error': f'지원하지 않는 짝짓기 방식입니다: {pairing}'}), 400
+    quality_mode = request.args.get('quality', QUALITY_GATE)
+    if quality_mode not in QUALITY_MODES:
+        return jsonify({'success': False, 'error': f'지원하지 않는 품질 검사 방식입니다: {quality_mode}'}), 400
+    # 짝짓기는 OCR 결과가 모두 모여야 하므로 이미지별로는 OCR까지만 진행
+    pipeline, flight_prefix = (run_ocr_pipeline, 'ocr:') if pairing == 'auto' else (run_card_pipeline, '')
+
+    # 명함 수는 본문을 다 받아야 알 수 있으므로, 프런트엔드가 보낸 개수 또는 크기로 추정
+    content_length = request.content_length or 0
+    estimated_cards = request.headers.get('X-Card-Count', type=int) or max(1, content_length // ESTIMATED_CARD_BYTES)
+    ticket = ADMISSION.admit(estimated_cards, content_length)
+    deadline = start_request_deadline()
+    try:
+        print(f"\n🚀 GPU 병렬 처리 시작: 약 {estimated_cards}개 명함 (스트리밍 업로드)")
         start_time = time.time()
         
         results = []
-        with tempfile.TemporaryDirectory() as temp_dir:
-            # 파일 준비
-            file_args = []
-            for idx, file in enumerate(files):
-                filename = secure_filename(file.filename)
-                temp_path = os.path.join(temp_dir, filename)
-                file.save(temp_path)
-                
-                # 썸네일용 base64 생성
-                file.seek(0)
-                thumbnail = base64.b64encode(file.read()).decode('utf-8')
-                
-                file_args.append((temp_path, idx, thumbnail))
+        rejected = []
+        uploaded_count = 0
+        with ticket, tempfile.TemporaryDirectory() as temp_dir:
+            # 파일 파트가 도착할 때마다 바로 파이프라인에 투입: 동일 이미지는 진행 중인 작업에 합류 (요청 간에도 공유)
+            future_to_args = {}
+            batch_hashes = []  # 이 업로드에서 처리 중인 (pHash, Future, 파일명)
+            try:
+                for upload in iter_uploaded_files(request.stream, boundary, temp_dir, 'images', MAX_UPLOAD_FILE_BYTES):
+                    report = check_quality(upload.data, upload.filename, quality_mode)
+                    if not report.ok and quality_mode == 'check':
+                        uploaded_count += 1
+                        ticket.adjust(max(ticket.cards, uploaded_count))
+                        ticket.complete('ocr')
+                        ticket.complete('llm')
+                        rejected.append({'index': upload.index, 'source': upload.filename, 'problems': report.errors(), 'scores': report.scores})
+                        continue
+                    cards = split_upload(upload, deadline.remaining()) if split_mode == 'auto' else [upload]
+                    uploaded_count += len(cards)
+                    ticket.adjust(max(ticket.cards, uploaded_count))
+                    for card in cards:
+                        thumbnail = base64.b64encode(card.data).decode('utf-8')
+                        image_phash = upload_phash(card) if reuse_mode != 'off' else None
+
+                        stored, match = find_processed_card(card.sha256, image_phash, reuse_mode)
+                        if stored:
+                            RESULT_STORE.put(stored['id'], stored)
+                            results.append({'id': stored['id'], 'source': card.filename, 'data': stored['data'], 'thumbnail': thumbnail, 'reused': match})
+                            ticket.complete('ocr')
+                            ticket.complete('llm')
+                            IMAGE_HASHES.record_reuse()
+                            print(f"♻️ 처리된 명함 재사용: {card.filename} → {stored['id']} ({match['match']}, 거리 {match['distance']})")
+                            continue
+
+                        earlier = nearest_in_batch(image_phash, batch_hashes)
+                        if earlier:
+                            distance, future, source = earlier
+                            match = match or {'source': source, 'match': 'similar', 'distance': distance}
+                        if earlier and reuse_mode == 'similar':
+                            print(f"♻️ 같은 업로드의 비슷한 이미지에 합류: {card.filename} → {source} (거리 {distance})")
+                        else:
+                            future = IMAGE_FLIGHT.submit(flight_prefix + card.sha256, submit_card_flight, pipeline, card.path, ticket, waiter=deadline, crop=card is upload)
+                            if image_phash is not None:
+                                batch_hashes.append((image_phash, future, card.filename))
+                            print(f"📥 업로드 완료, 처리 시작: {card.filename} ({len(card.data) // 1024}KB)")
+                        phash_hex = None if image_phash is None else perceptual_hash.to_hex(image_phash)
+                        future_to_args.setdefault(future, []).append((card.filename, card.index, thumbnail, card.sha256, phash_hex, match, None))
+            except Exception:
+                # 업로드 도중 연결이 끊기거나 거절되면 이미 투입된 명함도 더 진행하지 않음
+                deadline.cancel()
+                raise
+
+            if not uploaded_count:
+                return jsonify({'success': False, 'error': '이미지 파일이 필요합니다.'})
+            ticket.adjust(uploaded_count)
+            unfinished = 0
+            if pairing == 'auto':
+                future_to_args, unfinished = pair_uploaded_cards(future_to_args, ticket, deadline)
             
-            # 병렬 처리 실행
-            with ProcessPoolExecutor(max_workers=min(MAX_WORKERS, len(files))) as executor:
-                future_to_file = {executor.submit(process_single_card_parallel, args): args for args in file_args}
-                
-                for future in as_completed(future_to_file):
-                    result = future.result()
-                    if result:
+            # 마감/취소 시 남은 명함은 기다리지 않고 그때까지의 결과만 반환
+            pending = set(future_to_args)
+            while pending and not deadline.expired():
+                done, pending = wait(pending, timeout=min(RESULT_POLL_SECONDS, deadline.remaining()), return_when=FIRST_COMPLETED)
+                for future in done:
+                    contact_info, lines = future.result() or (None, None)
+                    if not contact_info:
+                        continue
+                    records = []
+                    for source, idx, thumbnail, image_hash, image_phash, match, paired in future_to_args[future]:
+                        result = {
+                            'id': new_card_id(idx),
+                            'source': source,
+                            'data': contact_info,
+                            'thumbnail': thumbnail
+                        }
+                        if match:
+                            result['near_duplicate'] = match  # 처리는 했지만 이전 명함과 비슷함 (사용자 확인용)
+                        if paired:
+                            result['paired'] = paired
+                        records.append({'id': result['id'], 'source': source, 'image_hash': image_hash, 'image_phash': image_phash, 'data': dict(contact_info), 'lines': lines})
                         results.append(result)
-                        print(f"✅ 처리 완료: {result['source']} - {result['data'].get('name', 'Unknown')}")
+                        print(f"✅ 처리 완료: {result['source']} - {contact_info.get('name') or contact_info.get('name_ko', 'Unknown')}")
+                    persist_contacts(records)
+
+            unfinished += sum(len(future_to_args[future]) for future in pending)
+            if unfinished:
+                WASTED_WORK.record_partial()
+                reason = '취소' if deadline.cancelled else '시간 초과'
+                print(f"⏱️ {reason}: {unfinished}개 명함은 처리하지 않고 부분 결과 반환")
         
         end_time = time.time()
         processing_time = end_time - start_time
         
-        print(f"🎯 GPU 병렬 처리 완료: {len(results)}/{len(files)} 성공, 소요시간: {processing_time:.2f}초")
+        print(f"🎯 GPU 병렬 처리 완료: {len(results)}/{uploaded_count} 성공, 소요시간: {processing_time:.2f}초")
         print(f"⚡ 평균 처리 속도: {len(results)/processing_time:.2f} 명함/초")
         
         return jsonify({
             'success': True, 
             'results': results,
+            'rejected': rejected,
+            'partial': bool(unfinished),
+            'unfinished': unfinished,
             'processing_time': processing_time,
             'cards_per_second': len(results)/processing_time if processing_time > 0 else 0
         })
         
+    except UploadTooLarge:
+        raise
     except Exception as e:
         print(f"❌ 배치 처리 오류: {e}")
         return jsonify({'success': False, 'error': str(e)})
+    finally:
+        ACTIVE_REQUESTS.unregister(deadline)
 
 @app.route('/api/process-two-sided', methods=['POST'])
 def process_two_sided_gpu():
-    """GPU 가속화된 양면 명함 처리 API"""
-    try:
-        front_file = request.files.get('frontImage')
-        back_file = request.files.get('backImage')
-        
-        if not front_file or not back_file:
-            return jsonify({'success': False, 'error': '앞면과 뒷면 이미지가 모두 필요합니다.'})
+    """GPU 가속화된 양면 명함 처리 API (?quality=check|off, 기본 QUALITY_GATE)"""
+    front_file = request.files.get('frontImage')
+    back_file = request.files.get('backImage')
+    
+    if not front_file or not back_file:
+        return jsonify({'success': False, 'error': '앞면과 뒷면 이미지가 모두 필요합니다.'})
+    quality_mode = request.args.get('quality', QUALITY_GATE)
+    if quality_mode not in QUALITY_MODES:
+        return jsonify({'success': False, 'error': f'지원하지 않는 품질 검사 방식입니다: {quality_mode}'}), 400
 
+    # 양면은 OCR 2회로 계산 (LLM 1회는 과대 추정되지만 보수적으로 처리)
+    ticket = ADMISSION.admit(2, request.content_length or 0)
+    deadline = start_request_deadline()
+    try:
         print("\n🚀 GPU 양면 처리 시작")
         start_time = time.time()
 
-        with tempfile.TemporaryDirectory() as temp_dir:
+        with ticket, tempfile.TemporaryDirectory() as temp_dir:
             front_path = os.path.join(temp_dir, secure_filename(front_file.filename))
             back_path = os.path.join(temp_dir, secure_filename(back_file.filename))
             front_file.save(front_path)
             back_file.save(back_path)
+            with open(front_path, 'rb') as front, open(back_path, 'rb') as back:
+                front_data, back_data = front.read(), back.read()
+            pair_hash = content_hash(content_hash(front_data) + content_hash(back_data))
+            reports = {'front': check_quality(front_data, front_file.filename, quality_mode),
+                       'back': check_quality(back_data, back_file.filename, quality_mode)}
+            if quality_mode == 'check' and not all(report.ok for report in reports.values()):
+                ticket.complete('ocr')
+                ticket.complete('ocr')
+                ticket.complete('llm')
+                quality = {side: {'problems': report.errors(), 'scores': report.scores} for side, report in reports.items() if not report.ok}
+                message = ' '.join(f"{'앞면' if side == 'front' else '뒷면'}: {problem['message']}" for side, item in quality.items() for problem in item['problems'])
+                return jsonify({'success': False, 'error': message, 'quality': quality}), 422
+            if CARD_CROP != 'off':
+                crop_futures = [(get_worker_pool().submit(card_crop.crop_for_ocr, path), path) for path in (front_path, back_path)]
+                front_path, back_path = (crop_before_ocr(future, path, deadline.remaining()).path for future, path in crop_futures)
 
             # 병렬 OCR 처리
+            stage_start = time.time()
             with ThreadPoolExecutor(max_workers=2) as executor:
-                front_future = executor.submit(ocr_agent, front_path)
-                back_future = executor.submit(ocr_agent, back_path)
+                front_future = executor.submit(ocr_agent, front_path, deadline.remaining())
+                back_future = executor.submit(ocr_agent, back_path, deadline.remaining())
                 
                 front_ocr = front_future.result()
                 back_ocr = back_future.result()
+            ticket.complete('ocr', time.time() - stage_start)
+            ticket.complete('ocr')
             
+            REFINE_STATS.record(front_ocr or [])
+            REFINE_STATS.record(back_ocr or [])
             if not front_ocr or not back_ocr:
                 return jsonify({'success': False, 'error': '한쪽 또는 양쪽 면의 OCR 처리에 실패했습니다.'})
             
-            front_text = ' '.join([item['text'] for item in front_ocr])
-            back_text = ' '.join([item['text'] for item in back_ocr])
+            front_text = ocr_layout.plain_text(front_ocr)
+            back_text = ocr_layout.plain_text(back_ocr)
+
+            if deadline.expired():
+                skip_stages(('llm',), ticket)
+                return jsonify({'success': False, 'error': '처리 시간이 초과되었거나 요청이 취소되었습니다.'})
 
-            contact_info = two_sided_extract_agent_gpu(front_text, back_text)
+            stage_start = time.time()
+            if EXTRACT_MODE == 'labels':
+                contact_info = extract_by_labels([front_ocr, back_ocr], timeout=deadline.remaining())
+                if contact_info is None:
+                    skip_stages(('llm',), ticket)
+                    return jsonify({'success': False, 'error': '처리 시간이 초과되었거나 요청이 취소되었습니다.'})
+            else:
+                contact_info = two_sided_extract_agent_gpu(front_text, back_text, timeout=deadline.remaining())
+            ticket.complete('llm', time.time() - stage_start)
         
         end_time = time.time()
         processing_time = end_time - start_time
         
         print(f"🎯 GPU 양면 처리 완료: {contact_info.get('name_ko', 'Unknown')} - 소요시간: {processing_time:.2f}초")
         
+        card_id = new_card_id(0)
+        persist_contacts([{'id': card_id, 'source': front_file.filename, 'image_hash': pair_hash, 'data': dict(contact_info)}])
         return jsonify({
             'success': True, 
+            'id': card_id,
             'contactInfo': contact_info,
             'processing_time': processing_time
         })
@@ -935,29 +1781,169 @@ def process_two_sided_gpu():
     except Exception as e:
         print(f"❌ 양면 처리 오류: {e}")
         return jsonify({'success': False, 'error': str(e)})
+    finally:
+        ACTIVE_REQUESTS.unregister(deadline)
+
+@app.route('/api/cancel/<request_id>', methods=['POST'])
+def cancel_request(request_id):
+    """진행 중인 요청 취소 (클라이언트가 페이지를 떠나거나 취소 버튼을 누를 때)"""
+    cancelled = ACTIVE_REQUESTS.cancel(request_id)
+    return jsonify({'success': cancelled})
 
 @app.route('/api/generate-vcf-qr', methods=['POST'])
 def generate_vcf_qr():
-    """단일 VCF 및 QR 생성 API (이전과 동일)"""
+    """단일 VCF 및 QR 생성 API
+
+    저장된 명함은 {"id", "edits"}로, 그 외에는 {"contactData"}로 요청한다.
+    """
     try:
-        contact_data = request.get_json().get('contactData', {})
+        payload = request.get_json()
+        if payload.get('id'):
+            record = RESULT_STORE.apply_edits(payload['id'], payload.get('edits'))
+            if record is None:
+                return expired_items_response([payload['id']])
+            if payload.get('edits'):
+                persist_contacts([record])
+                learn_from_edits([record])
+                remember_layouts([record])
+            contact_data = record['data']
+        else:
+            contact_data = payload.get('contactData', {})
         vcf_content = generate_vcf_content(contact_data)
-        qr_base64 = generate_qr_code(vcf_content)
-        return jsonify({'success': True, 'vcfContent': vcf_content, 'qrCode': qr_base64})
+        qr = build_qr_payload(contact_data, requested_qr_style(payload.get('qrStyle')), vcf_content)
+        qr_format = negotiate_format(request.accept_mimetypes)
+        qr_code = generate_qr_code(qr, qr_format)
+        return jsonify({'success': True, 'vcfContent': vcf_content, 'qrCode': qr_code, 'qrMimeType': MIME_TYPES[qr_format], **qr.info()})
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)})
 
+@app.route('/api/generate-vcf-qr/bulk', methods=['POST'])
+def generate_vcf_qr_bulk():
+    """여러 명함의 VCF/QR을 한 번에 생성하여 NDJSON으로 스트리밍
+
+    {"ids": [...], "edits": {...}} 또는 {"contacts": [{"id"?, ...필드}]}를 받는다.
+    QR 매트릭스 캐시에 있는 항목은 바로 렌더링하고, 나머지는 워커 풀에서 병렬로 생성한다.
+    각 줄: {"index", "id", "vcfContent", "qrCode", "qrMimeType", "qrVersion", ...} (완료 순서)
+    생성에 실패한 명함은 {"index", "id", "error"} 줄로 알리고 나머지는 계속 보낸다 (모든 명함이 한 줄씩).
+    """
+    payload = request.get_json()
+    try:
+        qr_style = requested_qr_style(payload.get('qrStyle'))
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    if payload.get('ids'):
+        records, missing = resolve_requested_items(payload)
+        if missing:
+            return expired_items_response(missing)
+        cards = [(record['id'], record['data']) for record in records]
+    else:
+        cards = [(contact.get('id'), contact) for contact in payload.get('contacts', [])]
+    if not cards:
+        return jsonify({'success': False, 'error': '생성할 항목이 없습니다.'})
+
+    qr_format = negotiate_format(request.accept_mimetypes)
+    mime_type = MIME_TYPES[qr_format]
+
+    def result_line(index, card_id, vcf_content, qr, qr_code):
+        line = {'index': index, 'id': card_id, 'vcfContent': vcf_content, 'qrCode': qr_code, 'qrMimeType': mime_type, **qr.info()}
+        return json.dumps(line, ensure_ascii=False) + '\n'
+
+    def error_line(index, card_id, error):
+        print(f"⚠️ 일괄 VCF/QR 생성 실패: {card_id or index} ({error})")
+        return json.dumps({'index': index, 'id': card_id, 'error': str(error)}, ensure_ascii=False) + '\n'
+
+    def generate():
+        serializer = vcard.VCardSerializer(VCARD_VERSION)
+        future_to_card = {}
+        for index, (card_id, contact_data) in enumerate(cards):
+            try:
+                vcf_content = serializer.serialize(contact_data)
+                qr = build_qr_payload(contact_data, qr_style, vcf_content)
+                matrix = MATRIX_CACHE.peek(qr.payload, qr.error_correction)
+                if matrix is not None:
+                    yield result_line(index, card_id, vcf_content, qr, base64.b64encode(render(matrix, qr_format)).decode())
+                else:
+                    future = get_worker_pool().submit(render_qr_job, qr.payload, qr_format, qr.error_correction)
+                    future_to_card[future] = (index, card_id, vcf_content, qr)
+            except Exception as e:
+                yield error_line(index, card_id, e)
+
+        for future in as_completed(future_to_card):
+            index, card_id, vcf_content, qr = future_to_card[future]
+            try:
+                matrix, qr_code = future.result()
+            except Exception as e:
+                yield error_line(index, card_id, e)
+                continue
+            MATRIX_CACHE.put(qr.payload, matrix, qr.error_correction)
+            yield result_line(index, card_id, vcf_content, qr, qr_code)
+
+    return Response(generate(), mimetype='application/x-ndjson')
+
+@app.route('/api/qr/<card_id>')
+def card_qr_image(card_id):
+    """저장된 명함의 QR 이미지 (Accept 헤더로 PNG/SVG 선택, ?style=로 페이로드 형식 선택, ETag로 브라우저 캐시)"""
+    record = RESULT_STORE.get(card_id)
+    if record is None:
+        return expired_items_response([card_id])
+    try:
+        qr = build_qr_payload(record['data'], requested_qr_style(request.args.get('style')))
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    qr_format = negotiate_format(request.accept_mimetypes)
+    etag = f"{payload_hash(qr.payload, qr.error_correction)[:32]}-{qr_format}"
+    if etag in request.if_none_match:
+        return Response(status=304)
+    response = Response(render(MATRIX_CACHE.get(qr.payload, qr.error_correction), qr_format), mimetype=MIME_TYPES[qr_format])
+    response.set_etag(etag)
+    response.vary.add('Accept')
+    return response
+
+def iter_vcf_files(items, version: str = VCARD_VERSION):
+    """다운로드 항목마다 (파일명, VCF 내용)을 생성"""
+    serializer = vcard.VCardSerializer(version)
+    for item in items:
+        vcf_content = serializer.serialize(item['data'])
+        name = item['data'].get('name_ko') or item['data'].get('name', 'contact')
+        safe_name = re.sub(r'[^\w\s-]', '', name).strip().replace(' ', '_')
+        yield f"{safe_name}.vcf", vcf_content
+
 @app.route('/api/download-batch', methods=['POST'])
 def download_batch():
-    """VCF 파일 일괄 다운로드 API (이전과 동일)"""
+    """VCF 파일 일괄 다운로드 API
+
+    {"ids": [...], "edits": {id: {필드: 값}}}로 저장된 결과를 참조하거나,
+    기존 방식대로 {"items": [...]}에 전체 데이터를 보낸다.
+    ?format=zip(기본, 연락처별 .vcf) | vcf(하나의 .vcf) | csv-google | csv-outlook | jsonl
+    ?version=3.0 | 4.0 (vCard 버전, 기본 VCARD_VERSION)
+    """
     try:
-        items_to_download = request.get_json().get('items', [])
+        export_format = request.args.get('format', 'zip')
+        if export_format != 'zip' and export_format not in EXPORT_FORMATS:
+            return jsonify({'success': False, 'error': f'지원하지 않는 형식입니다: {export_format}'}), 400
+        vcard_version = request.args.get('version', VCARD_VERSION)
+        if vcard_version not in vcard.LAYOUTS:
+            return jsonify({'success': False, 'error': f'지원하지 않는 vCard 버전입니다: {vcard_version}'}), 400
+
+        items_to_download, missing = resolve_requested_items(request.get_json())
+        if missing:
+            return expired_items_response(missing)
         if not items_to_download:
             return jsonify({'success': False, 'error': '다운로드할 항목이 없습니다.'})
+        remember_layouts(items_to_download)  # 내려받은 결과는 확정된 것으로 본다
+
+        if export_format in EXPORT_FORMATS:
+            mimetype, extension = EXPORT_FORMATS[export_format]
+            filename = f"contacts_{datetime.now().strftime('%Y%m%d')}.{extension}"
+            return Response(
+                stream_export(export_format, items_to_download, vcard.VCardSerializer(vcard_version).serialize),
+                mimetype=mimetype,
+                headers={'Content-Disposition': f'attachment; filename="{filename}"'}
+            )
 
         if len(items_to_download) == 1:
             item = items_to_download[0]
-            vcf_content = generate_vcf_content(item['data'])
+            vcf_content = vcard.serialize(item['data'], vcard_version)
             name = item['data'].get('name_ko') or item['data'].get('name', 'contact')
             safe_name = re.sub(r'[^\w\s-]', '', name).strip().replace(' ', '_')
             
@@ -966,21 +1952,150 @@ def download_batch():
             
             return send_file(buffer, as_attachment=True, download_name=f"{safe_name}.vcf", mimetype='text/vcard')
 
-        memory_file = io.BytesIO()
-        with zipfile.ZipFile(memory_file, 'w', zipfile.ZIP_DEFLATED) as zf:
-            for item in items_to_download:
-                vcf_content = generate_vcf_content(item['data'])
-                name = item['data'].get('name_ko') or item['data'].get('name', 'contact')
-                safe_name = re.sub(r'[^\w\s-]', '', name).strip().replace(' ', '_')
-                zf.writestr(f"{safe_name}.vcf", vcf_content)
-        
-        memory_file.seek(0)
+        # VCF가 생성되는 대로 ZIP 항목을 청크 전송 (항목 수와 무관하게 메모리 사용량 일정)
         zip_filename = f"contacts_{datetime.now().strftime('%Y%m%d')}.zip"
-        return send_file(memory_file, as_attachment=True, download_name=zip_filename, mimetype='application/zip')
+        return Response(
+            stream_zip(iter_vcf_files(items_to_download, vcard_version)),
+            mimetype='application/zip',
+            headers={'Content-Disposition': f'attachment; filename="{zip_filename}"'}
+        )
         
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)})
 
+@app.route('/api/contacts/search')
+def search_contacts():
+    """저장된 연락처 검색 (?q=검색어&page=1&page_size=20)
+
+    결과는 결과 저장소에도 다시 넣어 id 기반 다운로드/QR 요청에 바로 쓸 수 있게 한다.
+    """
+    result = CONTACT_DB.search(
+        request.args.get('q', ''),
+        page=request.args.get('page', 1, type=int),
+        page_size=request.args.get('page_size', 20, type=int),
+    )
+    for item in result['items']:
+        RESULT_STORE.put(item['id'], item)
+    return jsonify({'success': True, **result})
+
+@app.route('/api/contacts/autocomplete')
+def autocomplete_contacts():
+    """입력 중 자동완성 (?q=ㅎㄱㄷ / 홍기 / 삼양&limit=10) - 초성/자모 접두어 색인 사용"""
+    items = CONTACT_DB.autocomplete(request.args.get('q', ''), limit=request.args.get('limit', 10, type=int))
+    for item in items:
+        RESULT_STORE.put(item['id'], item)
+    return jsonify({'success': True, 'items': items})
+
+def dedupe_index() -> DedupeIndex:
+    """중복 클러스터 색인 (처음 사용할 때 저장된 모든 연락처로 구성)"""
+    if not DEDUPE.loaded:
+        start = time.time()
+        DEDUPE.load(CONTACT_DB.iter_records())
+        print(f"🔗 중복 클러스터 색인 구성: {DEDUPE.stats()['contacts']}건, {time.time() - start:.1f}초")
+    return DEDUPE
+
+@app.route('/api/contacts/duplicates')
+def list_duplicate_contacts():
+    """중복으로 보이는 연락처 클러스터 목록 (?page=1&page_size=20), 최근 추가된 클러스터부터"""
+    page = max(1, request.args.get('page', 1, type=int))
+    page_size = max(1, min(request.args.get('page_size', 20, type=int), 100))
+    clusters = dedupe_index().clusters()
+    selected = clusters[(page - 1) * page_size:page * page_size]
+    records = CONTACT_DB.get_many(card_id for cluster in selected for card_id in cluster)
+    result = []
+    for cluster in selected:
+        items = [records[card_id] for card_id in cluster if card_id in records]
+        for item in items:
+            RESULT_STORE.put(item['id'], item)
+        if len(items) > 1:
+            result.append({'id': items[0]['id'], 'items': items})
+    return jsonify({
+        'success': True, 'clusters': result, 'total': len(clusters),
+        'page': page, 'page_size': page_size, 'has_more': page * page_size < len(clusters),
+    })
+
+@app.route('/api/contacts/duplicates/merge', methods=['POST'])
+def merge_duplicate_contacts():
+    """중복 연락처 병합 {"ids": [...], "keep": 남길 id(생략 시 첫 id), "edits": {필드: 값}}
+
+    남길 연락처의 값을 우선하고 빈 필드는 나머지 연락처 값으로 채운 뒤 나머지는 삭제한다.
+    """
+    payload = request.get_json() or {}
+    card_ids = list(dict.fromkeys(payload.get('ids') or []))
+    keep_id = payload.get('keep') or (card_ids[0] if card_ids else None)
+    if len(card_ids) < 2 or keep_id not in card_ids:
+        return jsonify({'success': False, 'error': '병합할 연락처를 2개 이상 선택하고 남길 연락처를 지정하세요.'}), 400
+
+    records = CONTACT_DB.get_many(card_ids)
+    missing = [card_id for card_id in card_ids if card_id not in records]
+    if missing:
+        return jsonify({'success': False, 'error': '존재하지 않는 연락처가 있습니다.', 'missing': missing}), 404
+
+    keep = records[keep_id]
+    others = [card_id for card_id in card_ids if card_id != keep_id]
+    data = merge_records([keep, *(records[card_id] for card_id in others)])
+    data.update({key: str(value) for key, value in (payload.get('edits') or {}).items()})
+    stored = RESULT_STORE.get(keep_id) or {}
+    # OCR 줄은 결과 저장소에만 있으므로 옮겨 둠 (병합 후 수정/다운로드도 줄 분류기/레이아웃 템플릿 학습에 사용)
+    merged = {'id': keep_id, 'source': keep['source'], 'image_hash': keep['image_hash'], 'image_phash': keep.get('image_phash'),
+              'data': data, 'lines': stored.get('lines')}
+
+    CONTACT_DB.delete_many(others)
+    dedupe_index().remove(others)
+    RESULT_STORE.discard(others)
+    persist_contacts([merged])
+    print(f"🔗 연락처 병합: {len(card_ids)}건 → {keep_id}")
+    return jsonify({'success': True, 'item': {key: value for key, value in merged.items() if key != 'lines'}, 'removed': others})
+
+def contact_sheet_entry(item: dict) -> dict:
+    """QR 시트 한 칸에 들어갈 내용 (QR 페이로드와 오류 정정 레벨, 이름, 회사)"""
+    data = item['data']
+    name = data.get('name_ko') or data.get('name') or ''
+    if data.get('name_en') and data.get('name_en') != name:
+        name = f"{name} {data['name_en']}".strip()
+    company = data.get('company_ko') or data.get('company') or data.get('company_en') or ''
+    qr = build_qr_payload(data, QR_PAYLOAD_STYLE)
+    return {'payload': qr.payload, 'error_correction': qr.error_correction, 'name': name, 'company': company}
+
+@app.route('/api/export/contact-sheet', methods=['POST'])
+def export_contact_sheet():
+    """인쇄용 QR 연락처 시트 (?format=pdf: A4 PDF, ?format=png: A4 PNG 페이지 ZIP)
+
+    download-batch와 같은 본문을 받는다. 페이지는 워커 풀에서 병렬로 렌더링하고
+    완성된 순서가 아니라 페이지 순서대로 스트리밍한다.
+    """
+    try:
+        items, missing = resolve_requested_items(request.get_json())
+        if missing:
+            return expired_items_response(missing)
+        if not items:
+            return jsonify({'success': False, 'error': '내보낼 항목이 없습니다.'})
+        remember_layouts(items)
+
+        sheet_format = request.args.get('format', 'pdf')
+        if sheet_format not in ('pdf', 'png'):
+            return jsonify({'success': False, 'error': f'지원하지 않는 형식입니다: {sheet_format}'}), 400
+
+        pages = contact_sheet.chunk(contact_sheet_entry(item) for item in items)
+        stamp = datetime.now().strftime('%Y%m%d')
+        if sheet_format == 'png':
+            rendered = contact_sheet.ordered_parallel(get_worker_pool(), contact_sheet.render_png_page, pages, MAX_WORKERS)
+            return Response(
+                stream_zip(((f"qr_sheet_{number:03d}.png", png) for number, png in enumerate(rendered, 1)), compresslevel=1),
+                mimetype='application/zip',
+                headers={'Content-Disposition': f'attachment; filename="qr_sheet_{stamp}.zip"'}
+            )
+
+        rendered = contact_sheet.ordered_parallel(get_worker_pool(), contact_sheet.render_pdf_page, pages, MAX_WORKERS)
+        return Response(
+            contact_sheet.stream_pdf(rendered),
+            mimetype='application/pdf',
+            headers={'Content-Disposition': f'attachment; filename="qr_sheet_{stamp}.pdf"'}
+        )
+
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)})
+
 @app.route('/api/health')
 def health_check():
     """헬스 체크 + GPU 상태 확인"""
@@ -991,7 +2106,22 @@ def health_check():
         'timestamp': datetime.now().isoformat(),
         'gpu_available': gpu_available,
         'max_workers': MAX_WORKERS,
-        'features': ['parallel_processing', 'gpu_acceleration', 'async_ocr']
+        'single_flight': {'image': IMAGE_FLIGHT.stats(), 'llm': LLM_FLIGHT.stats()},
+        'admission': ADMISSION.stats(),
+        'wasted_work_avoided': WASTED_WORK.stats(),
+        'result_store': RESULT_STORE.stats(),
+        'contact_db': CONTACT_DB.stats(),
+        'dedupe': DEDUPE.stats(),
+        'image_hashes': IMAGE_HASHES.stats(),
+        'card_crop': CROP_STATS.stats(),
+        'quality_gate': QUALITY_STATS.stats(),
+        'ocr_refine': REFINE_STATS.stats(),
+        'qr_matrix_cache': MATRIX_CACHE.stats(),
+        'qr_payload_style': QR_PAYLOAD_STYLE,
+        'extract_mode': EXTRACT_MODE,
+        'line_classifier': LINE_MODEL.stats(),
+        'layout_templates': TEMPLATE_INDEX.stats(),
+        'features': ['parallel_processing', 'gpu_acceleration', 'async_ocr', 'single_flight', 'admission_control', 'deadlines', 'result_store', 'qr_cache', 'contact_sheet', 'compact_qr', 'contact_search', 'hangul_autocomplete', 'dedupe', 'near_duplicate_images', 'card_crop', 'multi_card_split', 'side_pairing', 'quality_gate', 'ocr_refine', 'line_labels', 'line_classifier', 'layout_templates']
     })
 
 if __name__ == '__main__':
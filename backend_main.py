@@ -4,21 +4,29 @@ import re
 import time
 import base64
 import requests
-import qrcode
 from datetime import datetime
-import io
 from werkzeug.utils import secure_filename
 import tempfile
-import zipfile
+import uuid
 import ollama
 import dotenv
 from typing import List
 
-from fastapi import FastAPI, File, UploadFile, HTTPException, Form
-from fastapi.responses import JSONResponse, Response
+from fastapi import FastAPI, File, UploadFile, HTTPException, Form, Query, Request
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 import uvicorn
 
+from zipstream import stream_zip
+from contact_export import EXPORT_FORMATS, stream_export
+import vcard
+import qr_payload
+from qr_payload import build_qr_payload
+from result_store import ResultStore
+from admission import AdmissionController, AdmissionRejected
+from qr_render import qr_base64
+import ocr_layout
+
 dotenv.load_dotenv()
 
 app = FastAPI()
@@ -43,6 +51,30 @@ app.add_middleware(
 # --- 환경 변수 로드 ---
 NAVER_OCR_SECRET_KEY = os.environ.get('NAVER_OCR_SECRET_KEY')
 NAVER_OCR_INVOKE_URL = os.environ.get('NAVER_OCR_INVOKE_URL')
+VCARD_VERSION = os.environ.get('VCARD_VERSION', vcard.DEFAULT_VERSION)  # 생성하는 vCard 버전 (3.0 / 4.0)
+QR_PAYLOAD_STYLE = os.environ.get('QR_PAYLOAD_STYLE', qr_payload.DEFAULT_STYLE)  # QR 페이로드 형식 (vcard / vcard-min / mecard)
+
+# 처리된 명함 결과 보관 (다운로드/수정 요청은 card id + 수정 필드만 전송)
+RESULT_STORE = ResultStore(
+    ttl_seconds=float(os.environ.get('RESULT_TTL_SECONDS', 6 * 60 * 60)),
+    max_items=int(os.environ.get('RESULT_STORE_MAX_ITEMS', 10000)),
+)
+
+
+# 수락 제어: 예상 대기시간이 SLO를 넘거나 메모리 내 이미지가 상한을 넘으면 429 (app.py와 같은 기준)
+# 엔드포인트가 OCR/LLM을 순서대로 호출하므로 단계별 동시 처리 수는 1
+ADMISSION = AdmissionController(
+    slo_seconds=float(os.environ.get('ADMISSION_SLO_SECONDS', 60)),
+    max_inflight_bytes=int(os.environ.get('MAX_INFLIGHT_IMAGE_BYTES', 256 * 1024 * 1024)),
+    concurrency={'ocr': 1, 'llm': 1},
+    initial_latency={'ocr': 2.0, 'llm': 8.0},
+)
+
+@app.exception_handler(AdmissionRejected)
+async def handle_admission_rejected(request: Request, e: AdmissionRejected):
+    """수락 거절 응답 (429/413 + Retry-After)"""
+    headers = {'Retry-After': str(e.retry_after)} if e.retry_after else None
+    return JSONResponse(status_code=e.status_code, content={'success': False, 'detail': str(e), 'retry_after': e.retry_after}, headers=headers)
 
 
 # ==========================================================================
@@ -66,9 +98,7 @@ def ocr_agent(image_path: str) -> list[dict]:
             response.raise_for_status()
         
         result_json = response.json()
-        full_text = " ".join([field.get('inferText', '') for image_result in result_json.get('images', []) for field in image_result.get('fields', [])])
-        sentences = [s.strip() for s in full_text.strip().replace('\n', ' ').split('.') if s.strip()]
-        return [{'id': idx + 1, 'text': sentence} for idx, sentence in enumerate(sentences)]
+        return ocr_layout.assemble(result_json)
     except Exception as e:
         print(f"[OCR Error] {e}")
         raise HTTPException(status_code=500, detail=f"OCR processing failed: {e}")
@@ -100,61 +130,58 @@ def two_sided_extract_agent(front_text: str, back_text: str, model_name: str = '
         raise HTTPException(status_code=500, detail=f"Two-sided LLM processing failed: {e}")
 
 def generate_vcf_content(data: dict) -> str:
-    """양면 지원 VCF 생성 함수"""
-    # ... (기존 app.py의 generate_vcf_content 함수 내용과 동일)
-    vcf_lines = ["BEGIN:VCARD", "VERSION:3.0"]
-    name_ko = data.get('name_ko') or data.get('name', '')
-    name_en = data.get('name_en', '')
-    if name_ko or name_en:
-        fn = f"{name_ko} {name_en}".strip()
-        n = f"{name_ko};{name_en};;;"
-        vcf_lines.append(f"FN;CHARSET=UTF-8:{fn}")
-        vcf_lines.append(f"N;CHARSET=UTF-8:{n}")
-    # ... other fields ...
-    vcf_lines.append("END:VCARD")
-    return '\n'.join(vcf_lines)
-
-
-def generate_qr_code(vcf_content):
-    """QR 코드 생성 함수"""
-    # ... (기존 app.py의 generate_qr_code 함수 내용과 동일)
-    qr = qrcode.QRCode(version=1, error_correction=qrcode.constants.ERROR_CORRECT_L, box_size=10, border=4)
-    qr.add_data(vcf_content)
-    qr.make(fit=True)
-    img = qr.make_image(fill_color="black", back_color="white")
-    buf = io.BytesIO()
-    img.save(buf, format='PNG')
-    return base64.b64encode(buf.getvalue()).decode()
+    """양면 지원 VCF 생성 함수 (app.py와 같은 vcard 직렬화기 사용)"""
+    return vcard.serialize(data, VCARD_VERSION)
+
+
+def generate_qr_code(qr):
+    """QR 코드 생성 함수 (app.py와 같은 매트릭스 캐시/직접 PNG 렌더링 사용)"""
+    return qr_base64(qr.payload, 'png', qr.error_correction)
+
+def new_card_id(idx: int) -> str:
+    """결과 저장소 키로 쓰이는 명함 id (요청 간 충돌 방지용 난수 포함)"""
+    return f"card-{int(time.time() * 1000)}-{idx}-{uuid.uuid4().hex[:8]}"
+
+def expired_items_error(missing: list):
+    """저장소에서 만료된 항목 (410) - 프런트엔드는 전체 데이터로 다시 요청"""
+    return JSONResponse(status_code=410, content={'success': False, 'detail': '만료되었거나 존재하지 않는 항목이 있습니다.', 'missing': missing})
 
 # ==========================================================================
 # FastAPI Endpoints
 # ==========================================================================
 
 @app.post("/api/process-batch")
-async def process_batch(images: List[UploadFile] = File(...)):
-    """다중 명함 일괄 처리 API"""
+async def process_batch(request: Request, images: List[UploadFile] = File(...)):
+    """다중 명함 일괄 처리 API (서버가 혼잡하면 429 + Retry-After)"""
     if not images:
         raise HTTPException(status_code=400, detail="이미지 파일이 필요합니다.")
 
     results = []
-    with tempfile.TemporaryDirectory() as temp_dir:
+    ticket = ADMISSION.admit(len(images), int(request.headers.get('content-length') or 0))
+    with ticket, tempfile.TemporaryDirectory() as temp_dir:
         for idx, file in enumerate(images):
             try:
                 temp_path = os.path.join(temp_dir, secure_filename(file.filename))
                 with open(temp_path, "wb") as buffer:
                     buffer.write(await file.read())
 
+                stage_start = time.time()
                 ocr_list = ocr_agent(temp_path)
+                ticket.complete('ocr', time.time() - stage_start)
                 if not ocr_list: continue
 
-                full_text = ' '.join([item['text'] for item in ocr_list])
+                full_text = ocr_layout.plain_text(ocr_list)
+                stage_start = time.time()
                 contact_info = extract_structured_info_with_retry(full_text)
+                ticket.complete('llm', time.time() - stage_start)
                 
                 with open(temp_path, "rb") as img_file:
                     thumbnail = base64.b64encode(img_file.read()).decode('utf-8')
 
+                card_id = new_card_id(idx)
+                RESULT_STORE.put(card_id, {'id': card_id, 'source': file.filename, 'data': dict(contact_info)})
                 results.append({
-                    'id': f"card-{int(time.time() * 1000)}-{idx}",
+                    'id': card_id,
                     'source': file.filename,
                     'data': contact_info,
                     'thumbnail': thumbnail
@@ -166,61 +193,99 @@ async def process_batch(images: List[UploadFile] = File(...)):
     return JSONResponse(content={'success': True, 'results': results})
 
 @app.post("/api/process-two-sided")
-async def process_two_sided(frontImage: UploadFile = File(...), backImage: UploadFile = File(...)):
-    """양면 명함 처리 API"""
-    with tempfile.TemporaryDirectory() as temp_dir:
+async def process_two_sided(request: Request, frontImage: UploadFile = File(...), backImage: UploadFile = File(...)):
+    """양면 명함 처리 API (서버가 혼잡하면 429 + Retry-After)"""
+    # 양면은 OCR 2회로 계산 (LLM 1회는 과대 추정되지만 보수적으로 처리)
+    ticket = ADMISSION.admit(2, int(request.headers.get('content-length') or 0))
+    with ticket, tempfile.TemporaryDirectory() as temp_dir:
         front_path = os.path.join(temp_dir, secure_filename(frontImage.filename))
         back_path = os.path.join(temp_dir, secure_filename(backImage.filename))
         
         with open(front_path, "wb") as f: f.write(await frontImage.read())
         with open(back_path, "wb") as f: f.write(await backImage.read())
 
-        front_text = ' '.join(item['text'] for item in ocr_agent(front_path))
-        back_text = ' '.join(item['text'] for item in ocr_agent(back_path))
+        stage_start = time.time()
+        front_text = ocr_layout.plain_text(ocr_agent(front_path))
+        back_text = ocr_layout.plain_text(ocr_agent(back_path))
+        ticket.complete('ocr', (time.time() - stage_start) / 2)
+        ticket.complete('ocr')
         
         if not front_text or not back_text:
             raise HTTPException(status_code=400, detail="한쪽 또는 양쪽 면의 OCR 처리에 실패했습니다.")
 
+        stage_start = time.time()
         contact_info = two_sided_extract_agent(front_text, back_text)
+        ticket.complete('llm', time.time() - stage_start)
     
-    return JSONResponse(content={'success': True, 'contactInfo': contact_info})
+    card_id = new_card_id(0)
+    RESULT_STORE.put(card_id, {'id': card_id, 'source': frontImage.filename, 'data': dict(contact_info)})
+    return JSONResponse(content={'success': True, 'id': card_id, 'contactInfo': contact_info})
 
 @app.post("/api/generate-vcf-qr")
 async def generate_vcf_qr(payload: dict):
-    """단일 VCF 및 QR 생성 API"""
-    contact_data = payload.get('contactData', {})
+    """단일 VCF 및 QR 생성 API ({"id", "edits"} 또는 {"contactData"})"""
+    if payload.get('id'):
+        record = RESULT_STORE.apply_edits(payload['id'], payload.get('edits'))
+        if record is None:
+            return expired_items_error([payload['id']])
+        contact_data = record['data']
+    else:
+        contact_data = payload.get('contactData', {})
     if not contact_data:
         raise HTTPException(status_code=400, detail="Contact data is required.")
     vcf_content = generate_vcf_content(contact_data)
-    qr_base64 = generate_qr_code(vcf_content)
-    return JSONResponse(content={'success': True, 'vcfContent': vcf_content, 'qrCode': qr_base64})
+    try:
+        qr = build_qr_payload(contact_data, payload.get('qrStyle') or QR_PAYLOAD_STYLE, vcf_content)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    qr_base64 = generate_qr_code(qr)
+    return JSONResponse(content={'success': True, 'vcfContent': vcf_content, 'qrCode': qr_base64, **qr.info()})
 
 @app.post("/api/download-batch")
-async def download_batch(payload: dict):
-    """VCF 파일 일괄 다운로드 (압축) API"""
-    items_to_download = payload.get('items', [])
+async def download_batch(payload: dict, export_format: str = Query('zip', alias='format'), vcard_version: str = Query(VCARD_VERSION, alias='version')):
+    """VCF 파일 일괄 다운로드 API ({"ids", "edits"} 또는 기존 {"items"})
+
+    ?format=zip(기본, 연락처별 .vcf) | vcf(하나의 .vcf) | csv-google | csv-outlook | jsonl
+    ?version=3.0 | 4.0 (vCard 버전, 기본 VCARD_VERSION)
+    """
+    if export_format != 'zip' and export_format not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"지원하지 않는 형식입니다: {export_format}")
+    if vcard_version not in vcard.LAYOUTS:
+        raise HTTPException(status_code=400, detail=f"지원하지 않는 vCard 버전입니다: {vcard_version}")
+    serializer = vcard.VCardSerializer(vcard_version)
+    if payload.get('ids'):
+        items_to_download, missing = RESULT_STORE.resolve(payload['ids'], payload.get('edits'))
+        if missing:
+            return expired_items_error(missing)
+    else:
+        items_to_download = payload.get('items', [])
     if not items_to_download:
         raise HTTPException(status_code=400, detail="다운로드할 항목이 없습니다.")
 
+    if export_format in EXPORT_FORMATS:
+        media_type, extension = EXPORT_FORMATS[export_format]
+        headers = {'Content-Disposition': f'attachment; filename="contacts_{datetime.now().strftime("%Y%m%d")}.{extension}"'}
+        return StreamingResponse(stream_export(export_format, items_to_download, serializer.serialize), media_type=media_type, headers=headers)
+
     if len(items_to_download) == 1:
         item = items_to_download[0]
-        vcf_content = generate_vcf_content(item['data'])
+        vcf_content = serializer.serialize(item['data'])
         name = item['data'].get('name_ko') or item['data'].get('name', 'contact')
         safe_name = re.sub(r'[^\w\s-]', '', name).strip().replace(' ', '_')
         headers = {'Content-Disposition': f'attachment; filename="{safe_name}.vcf"'}
         return Response(content=vcf_content, media_type='text/vcard', headers=headers)
 
-    memory_file = io.BytesIO()
-    with zipfile.ZipFile(memory_file, 'w', zipfile.ZIP_DEFLATED) as zf:
+    def vcf_files():
         for item in items_to_download:
-            vcf_content = generate_vcf_content(item['data'])
+            vcf_content = serializer.serialize(item['data'])
             name = item['data'].get('name_ko') or item['data'].get('name', 'contact')
             safe_name = re.sub(r'[^\w\s-]', '', name).strip().replace(' ', '_')
-            zf.writestr(f"{safe_name}.vcf", vcf_content)
-    memory_file.seek(0)
+            yield f"{safe_name}.vcf", vcf_content
+
+    # ZIP을 메모리에 만들어 복사하지 않고 항목이 생성되는 대로 스트리밍
     zip_filename = f"contacts_{datetime.now().strftime('%Y%m%d')}.zip"
     headers = {'Content-Disposition': f'attachment; filename="{zip_filename}"'}
-    return Response(content=memory_file.getvalue(), media_type='application/zip', headers=headers)
+    return StreamingResponse(stream_zip(vcf_files()), media_type='application/zip', headers=headers)
 
 
 @app.get("/api/health")
@@ -231,7 +296,8 @@ def health_check():
         'version': '2.2-backend',
         'timestamp': datetime.now().isoformat(),
         'ocr_ready': bool(NAVER_OCR_SECRET_KEY and NAVER_OCR_INVOKE_URL),
-        'ollama_ready': True # Placeholder, add real check if needed
+        'ollama_ready': True, # Placeholder, add real check if needed
+        'admission': ADMISSION.stats(),
     }
 
 if __name__ == '__main__':
@@ -0,0 +1,75 @@
+"""
+초성/자모 자동완성 벤치마크: 파이썬 선형 검색 vs ContactStore.autocomplete (contact_keys 범위 검색)
+
+실행: python benchmarks/bench_autocomplete.py [연락처 수]
+"""
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import hangul_index
+from contact_db import ContactStore
+
+FAMILY = '김이박최정강조윤장임한오서신권황안송류홍'
+GIVEN = '민서준지현우예은도윤하진수영성호경태희길동'
+COMPANIES = ['주식회사 삼양패키징', '대명테크', '예시상사', '한빛소프트', '그린에너지', '미래물산', '(주)영진정밀', '동방기계']
+TITLES = ['사원', '대리', '과장', '차장', '영업총괄 이사', '대표이사']
+
+QUERIES = ['ㅎㄱㄷ', 'ㅎ', '홍기', '홍길동', '길도', 'ㅅㅇㅍ', '주식회사 삼', '삼양패', '영업', 'ㄷㅍㅇㅅ', '없는이름']
+
+
+def linear_autocomplete(names, query, limit=10):
+    """비교 기준: 매 질의마다 모든 이름을 자모/초성으로 변환하여 접두어 비교"""
+    key = hangul_index.query_key(query)[1:]
+    convert = hangul_index.chosung if hangul_index.is_chosung_query(query) else hangul_index.jamo
+    found = []
+    for name in names:
+        if convert(name).startswith(key):
+            found.append(name)
+            if len(found) == limit:
+                break
+    return found
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 300_000
+    rng = random.Random(7)
+    with tempfile.TemporaryDirectory() as temp_dir:
+        store = ContactStore(os.path.join(temp_dir, 'contacts.db'))
+        names = []
+        start = time.perf_counter()
+        for offset in range(0, count, 10_000):
+            batch = []
+            for i in range(offset, min(count, offset + 10_000)):
+                name = rng.choice(FAMILY) + rng.choice(GIVEN) + rng.choice(GIVEN)
+                names.append(name)
+                batch.append({'id': f'card-{i}', 'data': {
+                    'name_ko': name, 'company_ko': rng.choice(COMPANIES), 'title_ko': rng.choice(TITLES),
+                }})
+            store.save_many(batch)
+        elapsed = time.perf_counter() - start
+        keys = store._connect().execute("SELECT COUNT(*) FROM contact_keys").fetchone()[0]
+        print(f"{count} contacts indexed in {elapsed:.1f}s ({count / elapsed:.0f}/s), {keys} keys ({keys / count:.1f}/contact)\n")
+
+        print(f"{'query':<14} {'linear ms':>10} {'index p50 ms':>13} {'index p95 ms':>13} {'hits':>5}")
+        for query in QUERIES:
+            start = time.perf_counter()
+            linear_autocomplete(names, query)
+            linear_ms = (time.perf_counter() - start) * 1000
+
+            samples = []
+            for _ in range(50):
+                start = time.perf_counter()
+                items = store.autocomplete(query, limit=10)
+                samples.append((time.perf_counter() - start) * 1000)
+            samples.sort()
+            print(f"{query:<14} {linear_ms:>10.1f} {statistics.median(samples):>13.3f} {samples[int(len(samples) * 0.95)]:>13.3f} {len(items):>5}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,125 @@
+"""
+OCR 전 명함 영역 자르기 벤치마크: 전송 바이트/픽셀, 검출 시간, (OCR 설정 시) OCR 지연시간과 텍스트 길이
+
+1) test_sample 이미지 (이미 명함만 찍힌 이미지는 fills-frame/저신뢰도로 원본 유지되어야 함)
+2) 합성 책상 사진: 잡음 배경 위에 회전된 명함, 글자가 적힌 다른 종이가 함께 찍힌 경우 포함
+3) 테이블에 명함 n장을 펼쳐 찍은 합성 사진의 여러 장 분리 (검출 수, 소요시간)
+4) NAVER_OCR_SECRET_KEY/NAVER_OCR_INVOKE_URL이 설정되어 있으면 원본과 자른 이미지를 각각 OCR하여
+   지연시간과 인식 텍스트 글자 수(LLM 프롬프트 크기)를 비교
+
+실행: python benchmarks/bench_card_crop.py
+"""
+import io
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from PIL import Image, ImageDraw
+
+from card_crop import crop_card, split_card_images
+
+SAMPLE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'test_sample')
+
+
+def desk_photo(rng, card_name: str, clutter: bool, angle: float, width=1600, height=1200) -> bytes:
+    """잡음 배경 위에 명함을 회전시켜 붙인 합성 사진"""
+    noise = rng.normal(0, 8, (height // 8, width // 8)).astype(np.float32)
+    background = Image.fromarray(np.clip(120 + noise, 0, 255).astype(np.uint8)).resize((width, height), Image.BICUBIC)
+    photo = Image.merge('RGB', [background.point(lambda v, k=k: v + k) for k in (30, 10, -20)])
+    if clutter:
+        paper = Image.new('RGB', (500, 650), 'white')
+        draw = ImageDraw.Draw(paper)
+        for line in range(30):
+            draw.text((20, 20 + line * 20), 'Lorem ipsum dolor sit amet 12345 invoice', fill='black')
+        photo.paste(paper.rotate(25, expand=True), (1050, 500), Image.new('L', paper.size, 255).rotate(25, expand=True))
+    card = Image.open(os.path.join(SAMPLE_DIR, card_name)).convert('RGB').resize((700, 380))
+    photo.paste(card.rotate(angle, expand=True), (300, 300), Image.new('L', card.size, 255).rotate(angle, expand=True))
+    buffer = io.BytesIO()
+    photo.save(buffer, 'JPEG', quality=88)
+    return buffer.getvalue()
+
+
+def table_photo(rng, count: int, width=3000, height=2000) -> bytes:
+    """테이블 위에 test_sample 명함 count장을 4열로 조금씩 돌려 놓은 합성 사진"""
+    noise = rng.normal(0, 8, (height // 8, width // 8)).astype(np.float32)
+    background = Image.fromarray(np.clip(120 + noise, 0, 255).astype(np.uint8)).resize((width, height), Image.BICUBIC)
+    photo = Image.merge('RGB', [background.point(lambda v, k=k: v + k) for k in (30, 10, -20)])
+    names = sorted(os.listdir(SAMPLE_DIR))
+    for index in range(count):
+        card = Image.open(os.path.join(SAMPLE_DIR, names[index % len(names)])).convert('RGB').resize((540, 300))
+        angle = rng.uniform(-12, 12)
+        position = (150 + index % 4 * 700, 250 + index // 4 * 800)
+        photo.paste(card.rotate(angle, expand=True), position, Image.new('L', card.size, 255).rotate(angle, expand=True))
+    buffer = io.BytesIO()
+    photo.save(buffer, 'JPEG', quality=88)
+    return buffer.getvalue()
+
+
+def samples():
+    for name in sorted(os.listdir(SAMPLE_DIR)):
+        with open(os.path.join(SAMPLE_DIR, name), 'rb') as f:
+            yield name, f.read()
+    rng = np.random.default_rng(1)
+    for card_name in ('real.jpeg', 'back_en.jpg'):
+        for clutter in (False, True):
+            for angle in (0, -12):
+                label = f"desk {card_name} {angle}deg{' +paper' if clutter else ''}"
+                yield label, desk_photo(rng, card_name, clutter, angle)
+
+
+def pixels(data: bytes) -> int:
+    with Image.open(io.BytesIO(data)) as image:
+        return image.width * image.height
+
+
+def ocr(data: bytes):
+    """(OCR 초, 인식 텍스트 글자 수)"""
+    from app import ocr_agent
+    with tempfile.NamedTemporaryFile(suffix='.jpg') as f:
+        f.write(data)
+        f.flush()
+        start = time.perf_counter()
+        texts = ocr_agent(f.name)
+        return time.perf_counter() - start, sum(len(item['text']) for item in texts)
+
+
+def main():
+    with_ocr = bool(os.environ.get('NAVER_OCR_SECRET_KEY') and os.environ.get('NAVER_OCR_INVOKE_URL'))
+    total_before = total_after = 0
+    print(f"{'image':<34} {'result':<16} {'conf':>5} {'KB':>12} {'Mpx':>11} {'ms':>5}")
+    for name, data in samples():
+        timings = []
+        for _ in range(5):
+            start = time.perf_counter()
+            cropped, confidence, reason, _ = crop_card(data)
+            timings.append((time.perf_counter() - start) * 1000)
+        after = cropped or data
+        total_before += len(data)
+        total_after += len(after)
+        print(f"{name:<34} {reason:<16} {confidence:>5.2f} "
+              f"{len(data) // 1024:>5}→{len(after) // 1024:<5} {pixels(data) / 1e6:>5.2f}→{pixels(after) / 1e6:<5.2f} "
+              f"{statistics.median(timings):>5.0f}")
+        if with_ocr and cropped:
+            (seconds_before, chars_before), (seconds_after, chars_after) = ocr(data), ocr(cropped)
+            print(f"{'':<34} OCR {seconds_before:.2f}s→{seconds_after:.2f}s, text {chars_before}→{chars_after} chars")
+    print(f"\ntotal bytes sent to OCR: {total_before // 1024}KB → {total_after // 1024}KB "
+          f"({1 - total_after / total_before:.0%} less)")
+
+    rng = np.random.default_rng(5)
+    print(f"\n{'cards on table':<16} {'split':>5} {'ms':>5}")
+    for count in (1, 2, 4, 6, 8):
+        data = table_photo(rng, count)
+        start = time.perf_counter()
+        cards = split_card_images(data)
+        print(f"{count:<16} {len(cards):>5} {(time.perf_counter() - start) * 1000:>5.0f}")
+    if not with_ocr:
+        print("OCR 지연시간/텍스트 비교는 NAVER_OCR_SECRET_KEY, NAVER_OCR_INVOKE_URL 설정 시 측정")
+
+
+if __name__ == '__main__':
+    main()
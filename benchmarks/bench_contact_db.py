@@ -0,0 +1,85 @@
+"""
+연락처 검색 벤치마크: 파이썬 선형 검색(back_up/pipeline_card_2.py 방식) vs ContactStore(FTS5)
+
+실행: python benchmarks/bench_contact_db.py [연락처 수]
+임시 디렉터리에 DB를 만들고 끝나면 삭제한다.
+"""
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from contact_db import ContactStore
+
+FAMILY = '김이박최정강조윤장임한오서신권황안송류홍'
+GIVEN = '민서준지현우예은도윤하진수영성호경태희'
+COMPANIES = ['삼양패키징', '대명테크', '예시상사', '한빛소프트', '그린에너지', '미래물산', 'Example Corp.', 'Larana Studio']
+TITLES = [('사원', 'Staff'), ('대리', 'Assistant Manager'), ('과장', 'Manager'), ('이사', 'Director'), ('대표', 'CEO')]
+CITIES = ['서울특별시 강남구 테헤란로', '경기도 화성시 향남읍', '대전광역시 대덕구 대덕대로', '부산광역시 해운대구 센텀로']
+
+QUERIES = ['송준희', '삼양패키징', '대덕대로', 'Director', 'samyang', '준희', '김 과장', 'zzzz없는검색어']
+
+
+def synthetic_record(i, rng):
+    name = rng.choice(FAMILY) + rng.choice(GIVEN) + rng.choice(GIVEN)
+    company = rng.choice(COMPANIES) + (f' {i % 500}지점' if i % 3 == 0 else '')
+    title_ko, title_en = rng.choice(TITLES)
+    return {'id': f'card-{i}', 'image_hash': f'{i:064x}', 'source': f'{i}.jpg', 'data': {
+        'name_ko': name, 'name_en': f'Person {i}', 'title_ko': title_ko, 'title_en': title_en,
+        'company_ko': company, 'phone': f'010-{i // 10000 % 10000:04d}-{i % 10000:04d}',
+        'email': f'user{i}@{"samyang.com" if i % 7 == 0 else "example.co.kr"}',
+        'address_ko': f'{rng.choice(CITIES)} {i % 2000}',
+    }}
+
+
+def linear_search(records, keyword):
+    """기존 방식: 매 질의마다 모든 레코드를 문자열로 만들어 포함 여부 확인"""
+    return [item for item in records if keyword.lower() in str(item['data'].values()).lower()]
+
+
+def percentile(samples, fraction):
+    return sorted(samples)[min(len(samples) - 1, int(len(samples) * fraction))]
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    rng = random.Random(42)
+    with tempfile.TemporaryDirectory() as temp_dir:
+        store = ContactStore(os.path.join(temp_dir, 'contacts.db'))
+        records = []
+        start = time.perf_counter()
+        for offset in range(0, count, 10_000):
+            batch = [synthetic_record(i, rng) for i in range(offset, min(count, offset + 10_000))]
+            store.save_many(batch)
+            records.extend(batch)
+        store.save({'id': 'card-real', 'data': {'name': '송준희', 'company': '주식회사 삼양패키징', 'email': 'junhee.song@samyang.com',
+                                                'address': '대전광역시 대덕구 대덕대로 1417번길 47'}})
+        elapsed = time.perf_counter() - start
+        size = os.path.getsize(os.path.join(temp_dir, 'contacts.db')) / 1e6
+        print(f"{count} contacts inserted in {elapsed:.1f}s ({count / elapsed:.0f}/s), {size:.0f} MB, tokenizer={store.stats()['tokenizer']}\n")
+
+        print(f"{'query':<18} {'linear ms':>10} {'fts p50 ms':>11} {'fts p95 ms':>11} {'page 1 hits':>12}")
+        for query in QUERIES:
+            start = time.perf_counter()
+            linear_search(records, query.split()[0])
+            linear_ms = (time.perf_counter() - start) * 1000
+
+            samples = []
+            for _ in range(20):
+                start = time.perf_counter()
+                result = store.search(query, page=1, page_size=20)
+                samples.append((time.perf_counter() - start) * 1000)
+            print(f"{query:<18} {linear_ms:>10.0f} {statistics.median(samples):>11.2f} {percentile(samples, 0.95):>11.2f} "
+                  f"{len(result['items']):>12}")
+
+        start = time.perf_counter()
+        deep = store.search('삼양패키징', page=500, page_size=20)
+        print(f"\npage 500 of '삼양패키징': {(time.perf_counter() - start) * 1000:.1f} ms, {len(deep['items'])} hits")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,115 @@
+"""
+중복 연락처 탐지 벤치마크: blocking key 후보 비교 수, 처리 속도, 정밀도/재현율
+
+원본 연락처와 그 재스캔본(이름 한 글자 오인식, 전화번호 표기/국가번호, 이메일 대소문자,
+법인 표기 차이)을 섞어 DedupeIndex에 넣고, 알려진 정답 쌍과 비교한다.
+일부 연락처는 회사 대표번호를 공유하므로 너무 큰 block이 제외되는지도 확인된다.
+
+실행: python benchmarks/bench_dedupe.py [연락처 수]
+"""
+import os
+import random
+import resource
+import statistics
+import sys
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dedupe import DedupeIndex
+
+FAMILY = '김이박최정강조윤장임한오서신권황안송류홍전고문양손배백허유남심노하곽성차주우구민진지엄채원천방공현함변염여추도소석선설마길연위표명기반왕금옥육인맹제모탁국어은편용예경봉사부가복태목형피두감호제'
+GIVEN = '민서준지현우예은도윤하진수영성호경태희동훈재석상철승혁정아연유나주원채다빈규환'
+WORDS = ['삼양', '대명', '한빛', '그린', '미래', '영진', '동방', '태성', '세종', '한결', '우리', '누리', '새롬', '청운', '백두']
+SUFFIXES = ['패키징', '테크', '상사', '소프트', '에너지', '물산', '정밀', '기계', '건설', '제약', '푸드', '로지스']
+LEGAL = ['', '(주)', '주식회사 ', '㈜']
+DUPLICATE_RATE = 0.1
+
+
+def make_contact(rng, companies):
+    company, main_phone, domain = companies[int(len(companies) * rng.random() ** 3)]  # 큰 회사일수록 명함이 많음
+    name = rng.choice(FAMILY) + rng.choice(GIVEN) + rng.choice(GIVEN)
+    if rng.random() < 0.3:
+        phone = main_phone  # 대표번호만 적힌 명함
+    else:
+        phone = f"010-{rng.randrange(10000):04d}-{rng.randrange(10000):04d}"
+    return {
+        'name': name,
+        'company': company,
+        'phone': phone,
+        'email': f"user{rng.randrange(10 ** 9)}@{domain}",
+    }
+
+
+def rescan(rng, data):
+    """같은 명함을 다시 스캔한 것처럼 변형"""
+    data = dict(data)
+    change = rng.randrange(4)
+    if change == 0:
+        name = data['name']
+        index = rng.randrange(1, len(name))
+        data['name'] = name[:index] + rng.choice(GIVEN) + name[index + 1:]
+    elif change == 1 and data['phone'].startswith('010'):
+        data['phone'] = '+82 ' + data['phone'][1:].replace('-', ' ')
+    elif change == 2:
+        data['email'] = data['email'].upper()
+    data['company'] = rng.choice(LEGAL) + data['company'].lstrip('(주)㈜').replace('주식회사 ', '')
+    return data
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    rng = random.Random(11)
+    companies = []
+    for i in range(count // 20):
+        name = rng.choice(WORDS) + rng.choice(SUFFIXES) + (str(i) if i >= len(WORDS) * len(SUFFIXES) else '')
+        companies.append((rng.choice(LEGAL) + name, f"02-{rng.randrange(1000, 10000)}-{rng.randrange(10000):04d}", f"c{i}.co.kr"))
+
+    originals, records, truth = [], [], []
+    for i in range(count):
+        card_id = f'card-{i}'
+        if originals and rng.random() < DUPLICATE_RATE:
+            origin_id, data = rng.choice(originals)
+            records.append({'id': card_id, 'data': rescan(rng, data)})
+            truth.append(origin_id)
+        else:
+            data = make_contact(rng, companies)
+            originals.append((card_id, data))
+            records.append({'id': card_id, 'data': data})
+            truth.append(card_id)
+
+    warm, incremental = records[:-1000], records[-1000:]
+    index = DedupeIndex()
+    start = time.perf_counter()
+    index.load(warm)
+    elapsed = time.perf_counter() - start
+
+    samples = []
+    for record in incremental:
+        start = time.perf_counter()
+        index.add_many([record])
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+
+    stats = index.stats()
+    all_pairs = count * (count - 1) // 2
+    print(f"{count} contacts ({DUPLICATE_RATE:.0%} rescans) loaded in {elapsed:.1f}s ({len(warm) / elapsed:.0f}/s)")
+    print(f"comparisons: {stats['comparisons']} ({stats['comparisons'] / count:.1f}/contact) vs {all_pairs:.3g} all pairs")
+    print(f"oversized blocks skipped: {stats['oversized_blocks']}")
+    print(f"incremental add: p50 {statistics.median(samples):.3f} ms, p95 {samples[int(len(samples) * 0.95)]:.3f} ms")
+    print(f"max RSS: {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.0f} MB")
+
+    # 쌍 단위 정밀도/재현율: 같은 클러스터의 쌍 vs 같은 원본에서 나온 쌍
+    truth_of = dict(zip((record['id'] for record in records), truth))
+    found_pairs = correct_pairs = 0
+    for cluster in index.clusters():
+        found_pairs += len(cluster) * (len(cluster) - 1) // 2
+        correct_pairs += sum(n * (n - 1) // 2 for n in Counter(truth_of[card_id] for card_id in cluster).values())
+    true_pairs = sum(n * (n - 1) // 2 for n in Counter(truth).values())
+    print(f"pairs: found {found_pairs}, true {true_pairs}, "
+          f"precision {correct_pairs / max(1, found_pairs):.3f}, recall {correct_pairs / max(1, true_pairs):.3f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,46 @@
+"""
+연락처 export 처리량 벤치마크: ZIP(연락처별 .vcf) vs 하나의 .vcf / CSV / JSON Lines
+
+실행: python benchmarks/bench_export.py [연락처 수]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import iter_vcf_files
+from contact_export import EXPORT_FORMATS, stream_export
+from vcard import VCardSerializer
+from zipstream import stream_zip
+
+
+def synthetic_items(count):
+    """양면 명함 형태의 가짜 연락처"""
+    for i in range(count):
+        yield {'id': f'card-{i}', 'data': {
+            'name_ko': f'홍길{i % 100:02d}', 'name_en': f'Gildong Hong {i}',
+            'title_ko': '책임연구원', 'title_en': 'Senior Researcher',
+            'company_ko': '주식회사 예시', 'company_en': 'Example Corp.',
+            'phone': f'010-{i // 10000 % 10000:04d}-{i % 10000:04d}', 'email': f'user{i}@example.co.kr',
+            'address_ko': '서울특별시 강남구 테헤란로 123', 'address_en': '123 Teheran-ro, Gangnam-gu, Seoul',
+        }}
+
+
+def measure(label, chunks, count):
+    start = time.perf_counter()
+    total = sum(len(chunk) for chunk in chunks)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<14} {count / elapsed:>10.0f} contacts/sec  {total / elapsed / 1e6:>7.1f} MB/s  ({total / 1e6:.1f} MB)")
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    print(f"{count} contacts\n")
+    measure('zip', stream_zip(iter_vcf_files(synthetic_items(count))), count)
+    for export_format in EXPORT_FORMATS:
+        measure(export_format, stream_export(export_format, synthetic_items(count), VCardSerializer().serialize), count)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+"""
+OCR 전 사진 품질 검사 벤치마크: 변형별 판정과 검사 시간
+
+test_sample 이미지와 합성 책상 사진을 흐리게(가우시안, 512px 기준 반경 1/2/4),
+어둡게/밝게, 대비를 낮추거나, 모서리만 확대한 변형으로 만들어 assess 결과를 표로 출력한다.
+원본/약간 어두운 사진(dim)은 통과하고 blur4/dark/flat/corner는 거절되어야 한다.
+
+실행: python benchmarks/bench_image_quality.py
+"""
+import io
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+from PIL import Image, ImageEnhance, ImageFilter
+
+from bench_card_crop import SAMPLE_DIR, desk_photo
+from image_quality import assess
+
+MUST_PASS = ('original', 'dim')
+MUST_REJECT = ('blur4', 'dark', 'flat', 'corner')
+
+
+def jpeg(image) -> bytes:
+    buffer = io.BytesIO()
+    image.convert('RGB').save(buffer, 'JPEG', quality=88)
+    return buffer.getvalue()
+
+
+def variants(image):
+    width, height = image.size
+    scale = max(width, height) / 512
+    yield 'original', image
+    for radius in (1, 2, 4):
+        yield f'blur{radius}', image.filter(ImageFilter.GaussianBlur(scale * radius))
+    yield 'dark', ImageEnhance.Brightness(image).enhance(0.2)
+    yield 'dim', ImageEnhance.Brightness(image).enhance(0.45)
+    yield 'bright', ImageEnhance.Brightness(image).enhance(2.5)
+    yield 'flat', ImageEnhance.Contrast(image).enhance(0.2)
+    yield 'corner', image.crop((0, 0, width // 4, height // 4)).resize((width, height))
+
+
+def main():
+    images = {name: Image.open(os.path.join(SAMPLE_DIR, name)).convert('RGB') for name in sorted(os.listdir(SAMPLE_DIR))}
+    images['desk photo'] = Image.open(io.BytesIO(desk_photo(np.random.default_rng(1), 'real.jpeg', True, -12)))
+    names = [name for name, _ in variants(images['card.png'])]
+    print(f"{'image':<14} " + ' '.join(f'{name:>12}' for name in names))
+    timings, mistakes = [], []
+    for image_name, image in images.items():
+        verdicts = []
+        for variant, variant_image in variants(image):
+            data = jpeg(variant_image)
+            start = time.perf_counter()
+            report = assess(data)
+            timings.append((time.perf_counter() - start) * 1000)
+            verdicts.append(report.problems[0] if report.problems else 'ok')
+            if (variant in MUST_PASS and not report.ok) or (variant in MUST_REJECT and report.ok):
+                mistakes.append(f"{image_name} {variant}: {report.scores}")
+        print(f"{image_name:<14} " + ' '.join(f'{verdict:>12}' for verdict in verdicts))
+    print(f"\nassess: p50 {statistics.median(timings):.1f} ms, max {max(timings):.1f} ms")
+    print(f"mistakes: {len(mistakes)}")
+    for mistake in mistakes:
+        print('  ' + mistake)
+
+
+if __name__ == '__main__':
+    main()
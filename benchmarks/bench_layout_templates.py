@@ -0,0 +1,105 @@
+"""
+레이아웃 템플릿 벤치마크: 행사에서 같은 디자인 명함이 반복될 때 LLM 없이 처리되는 비율과 정확도
+
+회사마다 고정 디자인(줄 배치, 대표번호/팩스, 주소, URL)을 정하고, 직원 명함을 배율/위치/기울기를
+조금씩 바꿔 찍은 합성 CLOVA 응답으로 만든다. 명함이 들어오는 순서대로
+1) 템플릿 조회 (LLM 대신 쓸 수 있으면 'template', 아니면 'llm')
+2) LLM을 거친 명함은 정답으로 확정(confirm)되었다고 보고 템플릿에 반영
+- 다른 회사 템플릿에 잘못 맞는 경우를 보기 위해 같은 주소 건물에 있는 회사들을 섞는다
+
+실행: python benchmarks/bench_layout_templates.py [회사 수] [회사당 명함 수]
+"""
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_ocr_layout import FAMILY, GIVEN, TITLES, compact
+from layout_templates import MIN_CONFIDENCE, TemplateIndex
+from line_labels import assemble
+from ocr_layout import assemble as assemble_lines
+
+ADDRESSES = ['서울특별시 강남구 테헤란로 123, 4층', '경기도 성남시 분당구 판교역로 235 H스퀘어 N동 7층']
+CHECKED = ('name', 'title', 'company', 'phone', 'email', 'address')
+
+
+def make_design(rng, index):
+    return {
+        'company': f"{rng.choice(['대명', '삼양', '한빛', '미래', '세종'])}{rng.choice(['테크', '상사', '소프트', '물산'])} {index}호",
+        'domain': f"corp{index}.co.kr",
+        'tel': f"02-{rng.randrange(100, 1000)}-{rng.randrange(10000):04d}",
+        'address': rng.choice(ADDRESSES),  # 같은 건물의 다른 회사
+        'columns': rng.random() < 0.5,
+        'name_size': rng.choice((28, 36, 44)),
+    }
+
+
+def make_card(rng, design, person):
+    (family_ko, family_en), (given_ko, given_en) = rng.choice(FAMILY), rng.choice(GIVEN)
+    truth = {
+        'name': family_ko + given_ko, 'title': rng.choice(TITLES), 'company': design['company'],
+        'phone': f"010-{rng.randrange(10000):04d}-{rng.randrange(10000):04d}",
+        'email': f"{given_en.lower()}{person}@{design['domain']}", 'address': design['address'],
+    }
+    rows = [(0, truth['company'], 28), (0, truth['name'], design['name_size']), (0, truth['title'], 24),
+            (1, f"M. {truth['phone']}", 24), (1, f"T. {design['tel']}", 24), (1, f"E. {truth['email']}", 24),
+            (1, f"www.{design['domain']}", 24), (1, truth['address'], 24)]
+    scale, dx, dy, angle = rng.uniform(0.7, 1.4), rng.uniform(0, 200), rng.uniform(0, 150), rng.uniform(-0.01, 0.01)
+    fields, y = [], 40
+    for index, (column, text, size) in enumerate(rows):
+        x = 40 + (420 if design['columns'] and column else 0)
+        if design['columns'] and index == 3:  # 2단 디자인: 연락처는 오른쪽 위부터
+            y = 40
+        for word in text.split():
+            width = size * 0.5 * len(word) + size * 0.3 * sum('가' <= c <= '힣' for c in word)
+            x0, y0 = dx + scale * x, dy + scale * (y + angle * x)
+            fields.append({'inferText': word, 'lineBreak': False, 'boundingPoly': {'vertices': [
+                {'x': x0, 'y': y0}, {'x': x0 + scale * width, 'y': y0},
+                {'x': x0 + scale * width, 'y': y0 + scale * size}, {'x': x0, 'y': y0 + scale * size}]}})
+            x += width + 10
+        fields[-1]['lineBreak'] = True
+        y += size + 18
+    return assemble_lines({'images': [{'fields': fields}]}), truth
+
+
+def main():
+    companies = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    per_company = int(sys.argv[2]) if len(sys.argv) > 2 else 30
+    rng = random.Random(9)
+    designs = [make_design(rng, index) for index in range(companies)]
+    stream = [(design, person) for design in designs for person in range(per_company)]
+    rng.shuffle(stream)
+
+    index = TemplateIndex()
+    via_template = correct = wrong_company = 0
+    lookup_ms, confirm_ms = [], []
+    for design, person in stream:
+        lines, truth = make_card(rng, design, person)
+        start = time.perf_counter()
+        confidence, _, labels = index.lookup(lines)
+        lookup_ms.append((time.perf_counter() - start) * 1000)
+        if confidence >= MIN_CONFIDENCE:
+            via_template += 1
+            result = assemble(lines, labels)
+            correct += all(compact(result[name]) == compact(truth[name]) for name in CHECKED)
+            wrong_company += result['company'] != truth['company']
+            continue
+        start = time.perf_counter()
+        index.confirm(lines, truth)  # LLM 결과를 사용자가 확정했다고 가정
+        confirm_ms.append((time.perf_counter() - start) * 1000)
+
+    total = len(stream)
+    print(f"{companies} companies x {per_company} cards, shuffled arrival")
+    print(f"LLM calls: {total - via_template} / {total} ({via_template / total:.0%} extracted by template)")
+    print(f"template extractions with all fields correct: {correct} / {via_template} ({correct / max(1, via_template):.1%}), "
+          f"wrong company: {wrong_company}")
+    print(f"templates: {index.stats()['templates']}, lookup p50 {statistics.median(lookup_ms):.2f} ms, "
+          f"max {max(lookup_ms):.2f} ms, confirm p50 {statistics.median(confirm_ms):.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+"""
+사용자 수정 학습 줄 분류기 벤치마크: 학습량에 따른 정확도, LLM 생략 비율, 예측/학습 시간
+
+bench_ocr_layout의 합성 명함을 수정이 끝난 명함으로 보고 차례로 학습(learn)시키면서,
+따로 만든 평가용 명함에 대해 측정한다.
+- 줄 정확도: 예측 라벨 == 최종 값으로 만든 라벨
+- LLM 생략: 모든 줄의 확률이 임계값 이상이라 분류기만으로 처리되는 명함 비율
+- 필드 정확도: 생략된 명함에서 조립한 값이 정답과 같은 비율 (틀리면 LLM 없이 잘못 저장됨)
+
+실행: python benchmarks/bench_line_classifier.py [학습 명함 수]
+"""
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_ocr_layout import compact, make_card
+from line_classifier import REPLAY_SIZE, LineClassifier, training_labels
+from line_labels import assemble
+from ocr_layout import assemble as assemble_lines
+
+MIN_CONFIDENCE = 0.9
+CHECKED = ('name', 'title', 'company', 'phone', 'email', 'address')
+
+
+def cards(rng, count):
+    return [(assemble_lines(result_json), truth) for result_json, truth in (make_card(rng) for _ in range(count))]
+
+
+def evaluate(model, test):
+    correct = total = skipped = fields_ok = 0
+    for lines, truth in test:
+        expected = training_labels(lines, truth)
+        predicted = model.predict(lines)
+        correct += sum(label == want for (label, _), want in zip(predicted, expected))
+        total += len(lines)
+        labels = model.label(lines, MIN_CONFIDENCE)
+        if labels is not None:
+            skipped += 1
+            result = assemble(lines, labels)
+            fields_ok += all(compact(result[name]) == compact(truth[name]) for name in CHECKED)
+    return correct / total, skipped / len(test), fields_ok / max(1, skipped)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 400
+    rng = random.Random(3)
+    train, test = cards(rng, count), cards(rng, 200)
+    with tempfile.TemporaryDirectory() as directory:
+        model = LineClassifier(directory)
+        learn_ms = []
+        print(f"{'cards':>6} {'line acc':>9} {'LLM skipped':>12} {'skipped fields ok':>18}")
+        for index, (lines, truth) in enumerate(train, 1):
+            start = time.perf_counter()
+            model.learn(lines, truth)
+            learn_ms.append((time.perf_counter() - start) * 1000)
+            if index in (10, 30, 50, 100, 200, 400, 800) or index == count:
+                accuracy, skipped, fields_ok = evaluate(model, test)
+                print(f"{index:>6} {accuracy:>9.1%} {skipped:>12.0%} {fields_ok:>18.0%}")
+
+        lines = test[0][0]
+        start = time.perf_counter()
+        for _ in range(200):
+            model.predict(lines)
+        per_line = (time.perf_counter() - start) / 200 / len(lines) * 1e6
+        versions = sorted(os.listdir(directory))
+        reloaded = LineClassifier(directory)
+        print(f"\npredict: {per_line:.0f} µs/line, learn: p50 {statistics.median(learn_ms):.0f} ms/card "
+              f"(replay {min(count, REPLAY_SIZE)} examples)")
+        print(f"saved versions: {', '.join(versions)} → reloaded v{reloaded.version}, "
+              f"same predictions: {reloaded.predict(lines) == model.predict(lines)}")
+
+
+if __name__ == '__main__':
+    main()
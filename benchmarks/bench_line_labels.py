@@ -0,0 +1,102 @@
+"""
+줄 라벨링 추출 모드 벤치마크: JSON 값 출력 vs 줄 → 필드 라벨 출력
+
+bench_ocr_layout의 합성 CLOVA 응답을 줄 목록으로 조립해 사용한다.
+1) 오프라인: 정답 값이 들어 있는 줄에 정답 라벨을 붙여 서버 조립(line_labels.assemble)이 값을
+   정확히 복원하는지, 두 출력 형식의 크기(추정 토큰 수)가 얼마인지 비교
+2) --llm: 같은 명함을 extract_structured_info_with_gpu(JSON)와 extract_by_labels(라벨)로 각각 추출하여
+   생성 토큰 수(Ollama eval_count), 지연시간, 필드 정확도 비교 (Ollama 실행 필요)
+
+실행: python benchmarks/bench_line_labels.py [명함 수] [--llm]
+"""
+import json
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_ocr_layout import compact, estimated_tokens, make_card
+from line_labels import FIELDS, assemble
+from ocr_layout import assemble as assemble_lines
+
+CHECKED = ('name', 'title', 'company', 'phone', 'email', 'address')
+
+
+def oracle_labels(ocr_list, truth) -> dict:
+    """정답 값이 들어 있는 줄 → 라벨 (한 줄에 여러 값이면 줄 안의 위치 순서)"""
+    labels = {}
+    for line in ocr_list:
+        found = sorted((line['text'].find(truth[name]), name) for name in FIELDS if truth[name] in line['text'])
+        if found:
+            labels[str(line['id'])] = [name for _, name in found] if len(found) > 1 else found[0][1]
+    return labels
+
+
+def counting(function, *args, **kwargs):
+    """(결과, 생성 토큰 수, 초) - ollama.chat 응답의 eval_count 합"""
+    import ollama
+    counts = []
+    chat = ollama.chat
+
+    def counting_chat(*chat_args, **chat_kwargs):
+        response = chat(*chat_args, **chat_kwargs)
+        counts.append(response.get('eval_count', 0))
+        return response
+
+    ollama.chat = counting_chat
+    start = time.perf_counter()
+    try:
+        return function(*args, **kwargs), sum(counts), time.perf_counter() - start
+    finally:
+        ollama.chat = chat
+
+
+def main():
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    with_llm = '--llm' in sys.argv
+    count = int(args[0]) if args else 300
+    rng = random.Random(11)
+    cards = [(assemble_lines(result_json), truth) for result_json, truth in (make_card(rng) for _ in range(count))]
+
+    json_tokens, label_tokens, correct = [], [], {name: 0 for name in CHECKED}
+    for ocr_list, truth in cards:
+        labels = oracle_labels(ocr_list, truth)
+        json_tokens.append(estimated_tokens(json.dumps({name: truth[name] for name in CHECKED}, ensure_ascii=False)))
+        label_tokens.append(estimated_tokens(json.dumps(labels)))
+        result = assemble(ocr_list, {int(key): value if isinstance(value, list) else [value] for key, value in labels.items()})
+        for name in CHECKED:
+            correct[name] += compact(result[name]) == compact(truth[name])
+    print(f"{count} synthetic cards, oracle labels\n")
+    print(f"output ≈tokens: json {statistics.mean(json_tokens):.0f}, labels {statistics.mean(label_tokens):.0f} "
+          f"({1 - statistics.mean(label_tokens) / statistics.mean(json_tokens):.0%} fewer)")
+    print("server assembly from labels: " + ', '.join(f"{name} {correct[name] / count:.0%}" for name in CHECKED))
+
+    if not with_llm:
+        print("\n실제 생성 토큰 수/지연시간/정확도 비교는 --llm (Ollama 실행 필요)으로 측정")
+        return
+
+    from app import extract_by_labels, extract_structured_info_with_gpu
+    from ocr_layout import plain_text
+    print(f"\n{'mode':<8} {'eval tokens':>11} {'p50 s':>7} {'p95 s':>7}  " + ' '.join(f'{name:>8}' for name in CHECKED))
+    for mode in ('json', 'labels'):
+        tokens, seconds, matched = [], [], {name: 0 for name in CHECKED}
+        for ocr_list, truth in cards:
+            if mode == 'json':
+                result, generated, elapsed = counting(extract_structured_info_with_gpu, plain_text(ocr_list))
+            else:
+                result, generated, elapsed = counting(extract_by_labels, [ocr_list])
+            tokens.append(generated)
+            seconds.append(elapsed)
+            for name in CHECKED:
+                matched[name] += compact((result or {}).get(name, '')) == compact(truth[name])
+        seconds.sort()
+        print(f"{mode:<8} {statistics.mean(tokens):>11.0f} {statistics.median(seconds):>7.2f} {seconds[int(len(seconds) * 0.95) - 1]:>7.2f}  "
+              + ' '.join(f'{matched[name] / count:>8.0%}' for name in CHECKED))
+
+
+if __name__ == '__main__':
+    main()
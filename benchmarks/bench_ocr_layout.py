@@ -0,0 +1,169 @@
+"""
+OCR 텍스트 조립 벤치마크: 예전 방식('.'으로 자르기) vs 좌표 기반 줄 조립
+
+합성 CLOVA 응답 (필드별 boundingPoly/lineBreak)을 만든다.
+- Tel/Fax를 한 줄에 두 칸으로 배치, 일부는 왼쪽 칸(이름/직책)과 오른쪽 칸(연락처)으로 나뉜 명함
+- 약간 기울어진 명함, 전각 문자(＠, ０-９)로 인식된 명함
+- CLOVA 필드 순서는 칸 단위 (왼쪽 칸을 먼저 모두 읽음)
+
+측정
+- 프롬프트 크기: 글자 수, 추정 토큰 수 (--llm이면 Ollama prompt_eval_count)
+- 필드 보존율: 정답 이름/회사/전화/이메일/URL/주소가 LLM 입력에 그대로 (한 줄 안에) 남아 있는 비율
+- --llm: 실제 추출 결과가 정답과 일치하는 비율 (Ollama 실행 필요)
+
+실행: python benchmarks/bench_ocr_layout.py [명함 수] [--llm]
+"""
+import os
+import random
+import re
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ocr_layout import assemble, plain_text
+
+FAMILY = [('김', 'Kim'), ('이', 'Lee'), ('박', 'Park'), ('최', 'Choi'), ('정', 'Jung')]
+GIVEN = [('민준', 'Minjun'), ('서연', 'Seoyeon'), ('지훈', 'Jihoon'), ('하은', 'Haeun'), ('길동', 'Gildong')]
+COMPANIES = [('(주)대명테크', 'daemyung.co.kr'), ('삼양패키징 주식회사', 'sypack.com'), ('한빛소프트', 'hanbit.io')]
+TITLES = ['대표이사', '과장', '선임연구원', '영업팀 팀장']
+ADDRESSES = ['서울특별시 강남구 테헤란로 123, 4층', '경기도 성남시 분당구 판교역로 235 H스퀘어 N동 7층']
+FIELDS = ('name', 'company', 'title', 'phone', 'email', 'url', 'address')
+TOKEN_PIECE = re.compile(r'[가-힣]|[A-Za-z]{1,4}|\d{1,3}|[^\sA-Za-z\d가-힣]')
+
+
+def make_card(rng):
+    """(CLOVA 응답, 정답 dict)"""
+    (family_ko, family_en), (given_ko, given_en) = rng.choice(FAMILY), rng.choice(GIVEN)
+    company, domain = rng.choice(COMPANIES)
+    truth = {
+        'name': family_ko + given_ko,
+        'company': company,
+        'title': rng.choice(TITLES),
+        'phone': f"010-{rng.randrange(10000):04d}-{rng.randrange(10000):04d}",
+        'email': f"{given_en.lower()}.{family_en.lower()}@{domain}",
+        'url': f"www.{domain}",
+        'address': rng.choice(ADDRESSES),
+    }
+    tel = f"02.{rng.randrange(100, 1000)}.{rng.randrange(10000):04d}"
+    columns = rng.random() < 0.5
+    # (칸, 행, 텍스트): 칸 0 = 왼쪽, 1 = 오른쪽
+    left = [truth['company'], f"{truth['name']} {truth['title']}"]
+    right = [f"M. {truth['phone']}", f"T. {tel}  F. {tel[:-1]}9", f"E. {truth['email']}", truth['url'], truth['address']]
+    if columns:
+        layout = [(0, row, text) for row, text in enumerate(left)] + [(1, row, text) for row, text in enumerate(right)]
+    else:
+        layout = [(0, row, text) for row, text in enumerate(left + right)]
+    full_width = rng.random() < 0.15
+    angle = rng.uniform(-0.03, 0.03)
+    fields = []
+    for column, row, text in layout:
+        x = 40 + column * 420
+        y = 40 + row * 46
+        for chunk_index, chunk in enumerate(text.split('  ')):
+            words = chunk.split()
+            x_chunk = x + chunk_index * 260
+            for index, word in enumerate(words):
+                width = 14 * len(word) + (8 * sum('가' <= c <= '힣' for c in word))
+                shown = word.translate({code - 0xFEE0: code for code in range(0xFF01, 0xFF5F)}) if full_width and '@' in word else word
+                y_word = y + angle * x_chunk
+                fields.append({
+                    'inferText': shown,
+                    'boundingPoly': {'vertices': [{'x': x_chunk, 'y': y_word}, {'x': x_chunk + width, 'y': y_word},
+                                                  {'x': x_chunk + width, 'y': y_word + 28}, {'x': x_chunk, 'y': y_word + 28}]},
+                    'lineBreak': index == len(words) - 1 and chunk_index == len(text.split('  ')) - 1,
+                })
+                x_chunk += width + 10
+    return {'images': [{'fields': fields}]}, truth
+
+
+def legacy_text(result_json) -> str:
+    """예전 ocr_agent + ' '.join 결과"""
+    full_text = ""
+    for image_result in result_json.get('images', []):
+        for field in image_result.get('fields', []):
+            full_text += field.get('inferText', '') + " "
+    sentences = [s.strip() for s in full_text.strip().replace('\n', ' ').split('.') if s.strip()]
+    return ' '.join(sentences)
+
+
+def preserved(text: str, truth: dict) -> dict:
+    lines = text.split('\n')
+    return {field: any(truth[field] in line for line in lines) for field in FIELDS}
+
+
+def estimated_tokens(text: str) -> int:
+    return len(TOKEN_PIECE.findall(text))
+
+
+def llm_extract(text: str):
+    """(추출 결과, 프롬프트 토큰 수)"""
+    import ollama
+    from app import extract_structured_info_with_gpu
+    counts = []
+    chat = ollama.chat
+
+    def counting_chat(*args, **kwargs):
+        response = chat(*args, **kwargs)
+        counts.append(response.get('prompt_eval_count', 0))
+        return response
+
+    ollama.chat = counting_chat
+    try:
+        return extract_structured_info_with_gpu(text), sum(counts)
+    finally:
+        ollama.chat = chat
+
+
+def compact(value: str) -> str:
+    return re.sub(r'[\s.\-()]', '', str(value)).lower()
+
+
+def main():
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    with_llm = '--llm' in sys.argv
+    count = int(args[0]) if args else 300
+    rng = random.Random(11)
+    cards = [make_card(rng) for _ in range(count)]
+
+    results = {}
+    for label in ('legacy', 'layout'):
+        sizes, tokens, kept, timings = [], [], {field: 0 for field in FIELDS}, []
+        matched = {field: 0 for field in ('name', 'company', 'phone', 'email')}
+        prompt_tokens = []
+        for result_json, truth in cards:
+            start = time.perf_counter()
+            text = legacy_text(result_json) if label == 'legacy' else plain_text(assemble(result_json))
+            timings.append((time.perf_counter() - start) * 1000)
+            sizes.append(len(text))
+            tokens.append(estimated_tokens(text))
+            for field, ok in preserved(text, truth).items():
+                kept[field] += ok
+            if with_llm:
+                info, prompt_count = llm_extract(text)
+                prompt_tokens.append(prompt_count)
+                for field in matched:
+                    matched[field] += compact(info.get(field, '')) == compact(truth[field])
+        results[label] = (sizes, tokens, kept, timings, matched, prompt_tokens)
+
+    print(f"{count} synthetic CLOVA responses\n")
+    print(f"{'':<8} {'chars':>6} {'≈tokens':>8} {'ms':>6}  " + ' '.join(f'{field:>8}' for field in FIELDS))
+    for label, (sizes, tokens, kept, timings, _, _) in results.items():
+        print(f"{label:<8} {statistics.mean(sizes):>6.0f} {statistics.mean(tokens):>8.0f} {statistics.median(timings):>6.2f}  "
+              + ' '.join(f'{kept[field] / count:>8.0%}' for field in FIELDS))
+    print("(필드 열: 정답 값이 LLM 입력의 한 줄 안에 그대로 남아 있는 비율)")
+    without_dots = statistics.mean(estimated_tokens(plain_text(assemble(result_json)).replace('.', ' ')) for result_json, _ in cards)
+    print(f"layout에서 '.'을 빼면 ≈{without_dots:.0f} tokens: 늘어난 토큰은 예전 방식이 버려 이메일/URL을 깨뜨린 '.'")
+    example = cards[0][0]
+    print(f"\nlegacy:\n{legacy_text(example)}\n\nlayout:\n{plain_text(assemble(example))}")
+    if with_llm:
+        print(f"\n{'':<8} {'prompt tokens':>13}  " + ' '.join(f'{field:>8}' for field in ('name', 'company', 'phone', 'email')))
+        for label, (_, _, _, _, matched, prompt_tokens) in results.items():
+            print(f"{label:<8} {statistics.mean(prompt_tokens):>13.0f}  " + ' '.join(f'{matched[field] / count:>8.0%}' for field in matched))
+    else:
+        print("\n실제 추출 성공률/프롬프트 토큰 수는 --llm (Ollama 실행 필요)으로 측정")
+
+
+if __name__ == '__main__':
+    main()
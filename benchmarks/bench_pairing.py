@@ -0,0 +1,77 @@
+"""
+한글/영문면 자동 짝짓기 벤치마크: 짝 정밀도/재현율과 매칭 시간
+
+회사별 대표번호/팩스를 공유하는 직원들의 양면 명함 OCR 텍스트를 만들고 섞는다.
+일부는 한 면만 올리거나(짝 없음), 휴대폰/이메일 없이 대표번호만 적힌 명함이다(짝 근거 없음).
+영문면은 +82 국가번호 표기를 사용한다.
+
+실행: python benchmarks/bench_pairing.py [명함 사람 수]
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from card_pairing import pair_sides
+
+FAMILY = [('김', 'Kim'), ('이', 'Lee'), ('박', 'Park'), ('최', 'Choi'), ('정', 'Jung'), ('강', 'Kang'), ('조', 'Cho')]
+GIVEN = [('민준', 'Minjun'), ('서연', 'Seoyeon'), ('지훈', 'Jihoon'), ('하은', 'Haeun'), ('도윤', 'Doyoon'), ('수빈', 'Subin')]
+COMPANIES = [('대명테크', 'DAE MYUNG tech'), ('삼양패키징', 'Samyang Packaging'), ('한빛소프트', 'Hanbit Soft'), ('미래상사', 'Mirae Trading')]
+ONE_SIDED_RATE = 0.15
+NO_PERSONAL_CONTACT_RATE = 0.1
+
+
+def international(number: str) -> str:
+    return '+82-' + number[1:]
+
+
+def make_cards(rng, people: int):
+    """[(OCR 텍스트, 사람 번호, 면)] - 섞기 전"""
+    offices = [(ko, en, f"02-{rng.randrange(1000, 10000)}-{rng.randrange(10000):04d}", f"02-{rng.randrange(1000, 10000)}-{rng.randrange(10000):04d}")
+               for ko, en in COMPANIES]
+    cards = []
+    for person in range(people):
+        (family_ko, family_en), (given_ko, given_en) = rng.choice(FAMILY), rng.choice(GIVEN)
+        company_ko, company_en, tel, fax = rng.choice(offices)
+        personal = rng.random() >= NO_PERSONAL_CONTACT_RATE
+        mobile = f"010-{rng.randrange(10000):04d}-{rng.randrange(10000):04d}"
+        email = f"{given_en.lower()}.{family_en.lower()}{person}@{company_en.split()[0].lower()}.co.kr"
+        front = f"{company_ko} {family_ko}{given_ko} 과장 T. {tel} F. {fax}"
+        back = f"{company_en} {given_en} {family_en} Manager Tel {international(tel)} Fax {international(fax)}"
+        if personal:
+            front += f" M. {mobile} {email}"
+            back += f" Mobile {international(mobile)} E-mail {email}"
+        if rng.random() < ONE_SIDED_RATE:
+            cards.append((rng.choice((front, back)), person, 'single'))
+        else:
+            cards.append((front, person, 'ko'))
+            cards.append((back, person, 'en'))
+    return cards
+
+
+def main():
+    people = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    rng = random.Random(7)
+    cards = make_cards(rng, people)
+    rng.shuffle(cards)
+    texts = [text for text, _, _ in cards]
+
+    start = time.perf_counter()
+    pairs, singles = pair_sides(texts)
+    elapsed = time.perf_counter() - start
+
+    correct = sum(cards[front][1] == cards[back][1] for front, back in pairs)
+    by_person = {}
+    for text, person, side in cards:
+        by_person.setdefault(person, []).append(side)
+    pairable = sum(sides == ['ko', 'en'] or sides == ['en', 'ko'] for sides in by_person.values())
+    print(f"{len(cards)} images from {people} people, {pairable} two-sided")
+    print(f"pairs: {len(pairs)} found, {correct} correct → precision {correct / max(1, len(pairs)):.3f}, "
+          f"recall {correct / max(1, pairable):.3f} (cards without mobile/email cannot be paired)")
+    print(f"single-sided fallback: {len(singles)} images, matching time {elapsed * 1000:.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
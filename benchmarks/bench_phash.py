@@ -0,0 +1,92 @@
+"""
+pHash 근접 중복 벤치마크
+
+1) test_sample 이미지 변형(재인코딩/크기/자르기/밝기/회전/같은 디자인의 동료 명함)별 해밍 거리
+2) pHash 계산 시간 (JPEG draft 축소 디코드)
+3) multi-index hash 검색 vs 선형 비교 (무작위 해시 n개, 임계값 이내 검색)
+
+실행: python benchmarks/bench_phash.py [색인 크기]
+"""
+import io
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PIL import Image, ImageDraw, ImageEnhance
+
+from perceptual_hash import DEFAULT_MAX_DISTANCE, MultiIndexHash, hamming, phash
+
+SAMPLE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'test_sample')
+
+
+def jpeg(image, quality=85) -> bytes:
+    buffer = io.BytesIO()
+    image.convert('RGB').save(buffer, 'JPEG', quality=quality)
+    return buffer.getvalue()
+
+
+def variants(base):
+    width, height = base.size
+    colleague = base.copy()
+    draw = ImageDraw.Draw(colleague)
+    draw.rectangle((30, 75, 95, 98), fill='white')
+    draw.text((32, 78), 'Park Jisu', fill='black')
+    yield 'jpeg q30', jpeg(base, 30), True
+    yield 'half size', jpeg(base.resize((width // 2, height // 2))), True
+    yield '2x size', jpeg(base.resize((width * 2, height * 2))), True
+    yield 'crop 3%', jpeg(base.crop((6, 4, width - 6, height - 4))), True
+    yield 'brightness +20%', jpeg(ImageEnhance.Brightness(base).enhance(1.2)), True
+    yield 'rotate 2deg', jpeg(base.rotate(2, fillcolor='white')), True
+    yield 'colleague (name only)', jpeg(colleague), False
+    for name in ('card_2.png', 'front_kr.jpg', 'back_en.jpg', 'real.jpeg', 'rotation.jpg'):
+        with open(os.path.join(SAMPLE_DIR, name), 'rb') as f:
+            yield name, f.read(), False
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    base = Image.open(os.path.join(SAMPLE_DIR, 'card.png')).convert('RGB')
+    reference = phash(jpeg(base, 95))
+    print(f"card.png 변형별 거리 (임계값 {DEFAULT_MAX_DISTANCE})")
+    for name, data, same_card in variants(base):
+        distance = hamming(reference, phash(data))
+        verdict = 'match' if distance <= DEFAULT_MAX_DISTANCE else '-'
+        print(f"  {name:<24} {distance:>3}  {verdict:<6} {'(same card)' if same_card else ''}")
+
+    with open(os.path.join(SAMPLE_DIR, 'real.jpeg'), 'rb') as f:
+        photo = f.read()
+    samples = []
+    for _ in range(50):
+        start = time.perf_counter()
+        phash(photo)
+        samples.append((time.perf_counter() - start) * 1000)
+    print(f"\nphash(real.jpeg {len(photo) // 1024}KB): p50 {statistics.median(samples):.2f} ms")
+
+    rng = random.Random(3)
+    hashes = [rng.getrandbits(64) for _ in range(count)]
+    table = MultiIndexHash(DEFAULT_MAX_DISTANCE)
+    start = time.perf_counter()
+    for index, value in enumerate(hashes):
+        table.add(value, index)
+    build = time.perf_counter() - start
+
+    queries = [hashes[rng.randrange(count)] ^ (1 << rng.randrange(64)) for _ in range(20)]
+    index_ms, linear_ms = [], []
+    for query in queries:
+        start = time.perf_counter()
+        found = table.search(query)
+        index_ms.append((time.perf_counter() - start) * 1000)
+        start = time.perf_counter()
+        linear = [index for index, value in enumerate(hashes) if (query ^ value).bit_count() <= DEFAULT_MAX_DISTANCE]
+        linear_ms.append((time.perf_counter() - start) * 1000)
+        assert sorted(index for _, index in found) == sorted(linear)
+    print(f"\n{count} hashes: multi-index build {build:.1f}s, "
+          f"search p50 {statistics.median(index_ms):.3f} ms vs linear {statistics.median(linear_ms):.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+"""
+QR 렌더링 벤치마크: 기존 PIL 경로 vs qr_render (캐시 미스/캐시 히트, PNG/SVG)
+
+실행: python benchmarks/bench_qr.py [반복 횟수]
+"""
+import base64
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import qrcode
+
+import qr_render
+
+SAMPLE_VCF = "\n".join([
+    "BEGIN:VCARD",
+    "VERSION:3.0",
+    "FN;CHARSET=UTF-8:홍길동 Gildong Hong",
+    "N;CHARSET=UTF-8:홍길동;Gildong Hong;;;",
+    "TITLE;CHARSET=UTF-8:책임연구원 / Senior Researcher",
+    "ORG;CHARSET=UTF-8:주식회사 예시 / Example Corp.",
+    "TEL;TYPE=WORK,VOICE:010-1234-5678",
+    "EMAIL;TYPE=WORK:hong.gd@example.co.kr",
+    "ADR;TYPE=WORK;CHARSET=UTF-8:;;서울특별시 강남구 테헤란로 123;;;;",
+    "END:VCARD",
+])
+
+
+def legacy_generate_qr_code(vcf_content):
+    """변경 전 app.generate_qr_code 구현"""
+    qr = qrcode.QRCode(version=1, error_correction=qrcode.constants.ERROR_CORRECT_L, box_size=10, border=4)
+    qr.add_data(vcf_content)
+    qr.make(fit=True)
+    qr_image = qr.make_image(fill_color="black", back_color="white")
+    img_buffer = io.BytesIO()
+    qr_image.save(img_buffer, format='PNG')
+    return base64.b64encode(img_buffer.getvalue()).decode()
+
+
+def measure(label, fn, iterations):
+    start = time.perf_counter()
+    for i in range(iterations):
+        fn(i)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<32} {iterations / elapsed:>10.1f} renders/sec  ({elapsed * 1000 / iterations:.2f} ms/render)")
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    print(f"payload {len(SAMPLE_VCF.encode('utf-8'))} bytes, {iterations} iterations\n")
+
+    measure("legacy (PIL PNG)", lambda i: legacy_generate_qr_code(SAMPLE_VCF + f"\nNOTE:{i}"), iterations)
+    measure("qr_render PNG, cache miss", lambda i: qr_render.qr_base64(SAMPLE_VCF + f"\nNOTE:{i}"), iterations)
+    measure("qr_render SVG, cache miss", lambda i: qr_render.qr_base64(SAMPLE_VCF + f"\nNOTE:svg{i}", 'svg'), iterations)
+    measure("qr_render PNG, cache hit", lambda i: qr_render.qr_base64(SAMPLE_VCF), iterations)
+    measure("qr_render SVG, cache hit", lambda i: qr_render.qr_base64(SAMPLE_VCF, 'svg'), iterations)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+"""
+QR 페이로드 형식 비교: 다운로드용 VCF(기존 QR 내용) vs 최소 vCard vs MECARD
+
+샘플 명함(test_sample/)의 내용으로 페이로드 크기, 선택된 오류 정정 레벨/버전, 렌더링 시간을 측정하고
+zxing-cpp가 설치되어 있으면 렌더링한 PNG를 다시 디코딩하여 원문과 일치하는지 확인한다.
+
+실행: python benchmarks/bench_qr_payload.py [반복 횟수]
+"""
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PIL import Image
+
+import qr_render
+from qr_payload import PAYLOAD_STYLES, build_qr_payload
+
+try:
+    import zxingcpp
+except ImportError:
+    zxingcpp = None
+
+SAMPLE_CARDS = {
+    'front_kr.jpg + back_en.jpg': {
+        'name_ko': '고진환', 'name_en': 'Jin Hwan Koe', 'title_ko': '영업총괄 이사', 'title_en': 'Sales Director',
+        'company_ko': '대명테크', 'company_en': 'DAE MYUNG tech', 'phone': '010-6315-6622', 'email': 'kohjigo@naver.com',
+        'address_ko': '경기도 화성시 향남읍 관리 250', 'address_en': '250, Gwan-ri, Hyangnam-eup, Hwaseong-si, Gyeonggi-do, Korea',
+    },
+    'real.jpeg': {
+        'name': '송준희', 'title': '사원 / 대전1공장', 'company': '주식회사 삼양패키징', 'phone': '010-4936-2465',
+        'email': 'junhee.song@samyang.com', 'address': '대전광역시 대덕구 대덕대로 1417번길 47 (우)34301',
+    },
+    'card.png': {
+        'name': '김나연', 'title': 'Product Manager', 'company': 'larana', 'phone': '+123-456-7890',
+        'email': 'hello@reallygreatsite.com', 'address': '123 Anywhere St., Any City, ST 12345',
+    },
+}
+
+
+def render_once(payload, error_correction):
+    """캐시 없이 매트릭스 계산 + PNG 렌더링"""
+    return qr_render.render_png(qr_render.build_matrix(payload, error_correction))
+
+
+def decodes(png, payload):
+    if zxingcpp is None:
+        return 'n/a'
+    results = zxingcpp.read_barcodes(Image.open(io.BytesIO(png)))
+    return 'ok' if results and results[0].text == payload else 'FAIL'
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    print(f"{iterations} renders per payload, decoder: {'zxing-cpp' if zxingcpp else 'not installed'}\n")
+    print(f"{'card':<28} {'payload':<10} {'bytes':>6} {'EC':>3} {'ver':>4} {'modules':>8} {'ms/render':>10} {'scan':>5}")
+
+    for card_name, data in SAMPLE_CARDS.items():
+        for style in PAYLOAD_STYLES:
+            qr = build_qr_payload(data, style)
+            payload, error_correction = qr.payload, qr.error_correction
+            start = time.perf_counter()
+            for _ in range(iterations):
+                png = render_once(payload, error_correction)
+            elapsed = (time.perf_counter() - start) * 1000 / iterations
+            size = qr_render.build_matrix(payload, error_correction, border=0).shape[0]
+            version = (size - 17) // 4
+            print(f"{card_name:<28} {style:<10} {len(payload.encode('utf-8')):>6} {error_correction:>3} {version:>4} "
+                  f"{size:>8} {elapsed:>10.2f} {decodes(png, payload):>5}")
+        print()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+"""
+요청 간 single-flight 시나리오: 같은 명함을 동시에 올린 요청들이 OCR/LLM을 한 번만 실행하는지,
+먼저 올린 요청이 취소되어도 합류한 요청이 결과를 받는지 확인
+
+CLOVA/Ollama 대신 OCR_SECONDS만큼 걸리는 가짜 OCR 단계(업로드 파일을 실제로 읽음)와 가짜 LLM을 쓰고,
+워커 풀은 스레드 풀로 바꿔 Flask 테스트 클라이언트로 /api/process-batch를 호출한다.
+1) 요청 N개가 같은 이미지를 동시에 업로드 → OCR/LLM 실행 횟수, 전체 소요시간
+2) 요청 A가 업로드한 뒤 취소되고(A의 업로드 임시 폴더 삭제), 합류한 요청 B는 계속 기다림 → B가 결과를 받아야 함
+
+실행: python benchmarks/bench_single_flight.py [동시 요청 수]
+"""
+import io
+import os
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('CONTACT_DB_PATH', os.path.join(tempfile.mkdtemp(), 'contacts.db'))
+
+import app
+
+OCR_SECONDS = 1.0
+SAMPLE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'test_sample', 'card.png')
+QUERY = '/api/process-batch?reuse=off&quality=off&split=off'
+
+calls = {'ocr': 0, 'llm': 0, 'missing_file': 0}
+
+
+def fake_ocr_stage(file_path, deadline_at=None):
+    calls['ocr'] += 1
+    time.sleep(OCR_SECONDS)
+    if not os.path.exists(file_path):
+        calls['missing_file'] += 1
+        return None
+    with open(file_path, 'rb') as f:
+        size = len(f.read())
+    return [{'id': 1, 'text': '홍길동', 'box': None, 'confidence': 1.0},
+            {'id': 2, 'text': f"010-1234-{size % 10000:04d}", 'box': None, 'confidence': 1.0}]
+
+
+def fake_llm(text, model_name=None, timeout=None):
+    calls['llm'] += 1
+    return {'name': '홍길동', 'title': '', 'company': '', 'phone': '010-1234-5678', 'email': '', 'address': ''}
+
+
+def upload(client, data, request_id, timeout):
+    return client.post(QUERY, data={'images': [(io.BytesIO(data), 'card.png')]}, content_type='multipart/form-data',
+                       headers={'X-Request-Id': request_id, 'X-Request-Timeout': str(timeout)}).get_json()
+
+
+def main():
+    concurrent = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    app.CARD_CROP = 'off'
+    app.ocr_stage = fake_ocr_stage
+    app.extract_structured_info_with_gpu = fake_llm
+    pool = ThreadPoolExecutor(8)
+    app.get_worker_pool = lambda: pool
+    client = app.app.test_client()
+    with open(SAMPLE, 'rb') as f:
+        image = f.read()
+
+    # 1) 같은 이미지를 동시에 올린 요청들
+    data = image + b'\x01'
+    start = time.perf_counter()
+    with ThreadPoolExecutor(concurrent) as requests_pool:
+        responses = list(requests_pool.map(lambda number: upload(client, data, f"same-{number}", 30), range(concurrent)))
+    elapsed = time.perf_counter() - start
+    served = sum(len(response['results']) for response in responses)
+    print(f"{concurrent} concurrent uploads of one card: OCR {calls['ocr']}x, LLM {calls['llm']}x, "
+          f"{served}/{concurrent} served, {elapsed:.2f}s (one OCR {OCR_SECONDS:.1f}s)")
+
+    # 2) 먼저 올린 요청 A가 취소되고, 같은 이미지로 합류한 B는 계속 기다림
+    calls.update(ocr=0, llm=0, missing_file=0)
+    data = image + b'\x02'
+    results = {}
+    first = threading.Thread(target=lambda: results.setdefault('a', upload(client, data, 'owner', 30)))
+    first.start()
+    time.sleep(0.2)
+    second = threading.Thread(target=lambda: results.setdefault('b', upload(client, data, 'joiner', 30)))
+    second.start()
+    time.sleep(0.2)
+    client.post('/api/cancel/owner')
+    first.join()
+    second.join()
+    print(f"owner cancelled: owner {len(results['a']['results'])} result(s), partial={results['a']['partial']}; "
+          f"joiner {len(results['b']['results'])} result(s); OCR {calls['ocr']}x, upload missing at OCR: {calls['missing_file']}")
+    assert results['a']['partial'] and not results['a']['results']
+    assert len(results['b']['results']) == 1, 'joined request lost the card when the owner left'
+    assert calls['ocr'] == 1 and calls['missing_file'] == 0
+    print('ok')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+"""
+vCard 직렬화 마이크로 벤치마크: 기존 generate_vcf_content vs vcard.VCardSerializer (단일 코어)
+
+실행: python benchmarks/bench_vcard.py [연락처 수]
+"""
+import os
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from vcard import VCardSerializer
+
+
+def legacy_generate_vcf_content(data: dict) -> str:
+    """변경 전 app.generate_vcf_content 구현 (이스케이프/줄 접기 없음, 연락처마다 REV 계산)"""
+    vcf_lines = ["BEGIN:VCARD", "VERSION:3.0"]
+    name_ko = data.get('name_ko') or data.get('name', '')
+    name_en = data.get('name_en', '')
+    if name_ko and name_en:
+        vcf_lines.append(f"FN;CHARSET=UTF-8:{name_ko} {name_en}")
+        vcf_lines.append(f"N;CHARSET=UTF-8:{name_ko};{name_en};;;")
+    elif name_ko:
+        vcf_lines.append(f"FN;CHARSET=UTF-8:{name_ko}")
+        vcf_lines.append(f"N;CHARSET=UTF-8:{name_ko};;;;")
+    elif name_en:
+        vcf_lines.append(f"FN;CHARSET=UTF-8:{name_en}")
+        vcf_lines.append(f"N;CHARSET=UTF-8:{name_en};;;;")
+    title_ko = data.get('title_ko') or data.get('title', '')
+    title_en = data.get('title_en', '')
+    if title_ko or title_en:
+        vcf_lines.append(f"TITLE;CHARSET=UTF-8:{title_ko}{' / ' if title_ko and title_en else ''}{title_en}")
+    company_ko = data.get('company_ko') or data.get('company', '')
+    company_en = data.get('company_en', '')
+    if company_ko or company_en:
+        vcf_lines.append(f"ORG;CHARSET=UTF-8:{company_ko}{' / ' if company_ko and company_en else ''}{company_en}")
+    if data.get('phone'):
+        vcf_lines.append(f"TEL;TYPE=WORK,VOICE:{data['phone']}")
+    if data.get('email'):
+        vcf_lines.append(f"EMAIL;TYPE=WORK:{data['email']}")
+    address = data.get('address_ko', '') or data.get('address', '')
+    if address:
+        vcf_lines.append(f"ADR;TYPE=WORK;CHARSET=UTF-8:;;{address};;;;")
+    vcf_lines.append(f"REV:{datetime.now().strftime('%Y%m%dT%H%M%SZ')}")
+    vcf_lines.append("END:VCARD")
+    return '\n'.join(vcf_lines)
+
+
+def synthetic_contacts(count):
+    return [{
+        'name_ko': f'홍길{i % 100:02d}', 'name_en': f'Gildong Hong {i}',
+        'title_ko': '책임연구원', 'title_en': 'Senior Researcher',
+        'company_ko': '주식회사 예시', 'company_en': 'Example Corp., Ltd.',
+        'phone': f'010-{i // 10000 % 10000:04d}-{i % 10000:04d}', 'email': f'user{i}@example.co.kr',
+        'address_ko': '서울특별시 강남구 테헤란로 123, 예시빌딩 10층',
+    } for i in range(count)]
+
+
+def measure(label, fn, contacts):
+    start = time.perf_counter()
+    total = sum(len(card) for card in fn(contacts))
+    elapsed = time.perf_counter() - start
+    print(f"{label:<28} {len(contacts) / elapsed:>10.0f} contacts/sec  ({total / len(contacts):.0f} chars/contact)")
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    contacts = synthetic_contacts(count)
+    print(f"{count} contacts\n")
+    measure("legacy generate_vcf_content", lambda items: map(legacy_generate_vcf_content, items), contacts)
+    measure("VCardSerializer 3.0", VCardSerializer('3.0').serialize_many, contacts)
+    measure("VCardSerializer 4.0", VCardSerializer('4.0').serialize_many, contacts)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,436 @@
+"""
+OCR 전 명함 영역 검출 + 원근 보정 + 자르기 (CPU, numpy/Pillow)
+
+책상 위에서 찍은 사진은 대부분이 배경이라 OCR로 보내는 바이트와 인식되는 잡문자(다른 종이,
+키보드 등)가 늘어나고, 그 텍스트가 그대로 LLM 프롬프트에 들어간다.
+
+1) 축소본의 밝기 기울기로 윤곽 검출 → 가장 큰 연결 영역 (명함 테두리 + 안쪽 글자)
+2) 영역의 극점(x+y, x-y 최소/최대)으로 네 꼭짓점 추정
+3) 변 위의 윤곽 비율 x 영역이 사각형 안에 들어가는 비율로 신뢰도 계산 (가로세로비/꼭짓점 각도 검사 포함)
+   큰 연결 영역 몇 개를 각각 평가하여 가장 명함다운 것을 선택
+4) 신뢰도가 낮거나 명함이 이미 화면을 거의 채우면 원본을 그대로 사용 (fallback)
+5) 원본 해상도에서 표준 명함 비율로 원근 변환하여 JPEG로 저장
+
+테이블에 여러 장을 펼쳐 놓고 찍은 사진은 더 큰 축소본에서 같은 후보 평가를 하여
+서로 겹치지 않는 명함들을 각각 잘라낸다 (split_cards).
+"""
+import io
+import os
+import threading
+from dataclasses import dataclass
+
+import numpy as np
+from PIL import Image, ImageFilter, ImageOps
+
+WORKING_SIZE = 400  # 검출용 축소본의 긴 변
+EDGE_THRESHOLD = 3.0  # 흐린 축소본의 밝기 기울기 (명함과 배경 밝기 차이가 작은 경우 포함)
+MIN_CONFIDENCE = 0.6
+MAX_FILL_FRACTION = 0.85  # 명함이 화면의 이보다 많이 차지하면 자를 필요 없음
+MIN_AREA_FRACTION = 0.05
+CANDIDATE_COMPONENTS = 3
+MAX_CARDS = 12  # 한 사진에서 분리할 최대 명함 수
+SPLIT_WORKING_SIZE = 800  # 여러 장이 작게 찍히므로 더 큰 축소본에서 검출
+SPLIT_CANDIDATES = 3 * MAX_CARDS  # 명함 안의 글자 덩어리도 후보가 되므로 넉넉히
+SPLIT_MIN_AREA_FRACTION = 0.01
+REFINE_RADIUS = 3  # 꼭짓점 보정 탐색 범위 (축소본 픽셀)
+CARD_ASPECTS = (1.8, 1.75, 1.586)  # 한국 90x50, 미국 3.5x2, ISO 85.6x54
+ASPECT_RANGE = (1.45, 2.2)  # A4 종이(1.41)는 제외
+MAX_OUTPUT_SIDE = 2048  # OCR에 충분한 해상도
+JPEG_QUALITY = 90
+
+
+@dataclass
+class CropResult:
+    """검출 결과 (path: OCR에 보낼 파일 - 검출 실패 시 원본)"""
+    path: str
+    cropped: bool
+    confidence: float
+    reason: str
+    bytes_before: int
+    bytes_after: int
+    corners: list = None
+
+
+def _largest_components(mask: np.ndarray, count: int) -> list:
+    """8-연결 기준 큰 연결 영역 count개, 큰 순 (행 단위 run + union-find)"""
+    height = mask.shape[0]
+    padded = np.zeros((height, mask.shape[1] + 2), dtype=np.int8)
+    padded[:, 1:-1] = mask
+    changes = np.diff(padded, axis=1)
+    runs = []  # (y, 시작, 끝(포함하지 않음))
+    row_runs = []
+    for y in range(height):
+        starts = np.flatnonzero(changes[y] == 1)
+        ends = np.flatnonzero(changes[y] == -1)
+        row_runs.append(range(len(runs), len(runs) + len(starts)))
+        runs.extend(zip([y] * len(starts), starts.tolist(), ends.tolist()))
+    if not runs:
+        return []
+
+    parent = list(range(len(runs)))
+
+    def find(x):
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    for y in range(1, height):
+        previous = row_runs[y - 1]
+        for index in row_runs[y]:
+            _, start, end = runs[index]
+            for other in previous:
+                _, other_start, other_end = runs[other]
+                if other_start <= end and other_end >= start:  # 대각선 이웃 포함
+                    parent[find(index)] = find(other)
+
+    areas = {}
+    for index, (_, start, end) in enumerate(runs):
+        root = find(index)
+        areas[root] = areas.get(root, 0) + end - start
+    largest = sorted(areas, key=areas.get, reverse=True)[:count]
+    components = {root: np.zeros_like(mask) for root in largest}
+    for index, (y, start, end) in enumerate(runs):
+        component = components.get(find(index))
+        if component is not None:
+            component[y, start:end] = True
+    return [components[root] for root in largest]
+
+
+def _edge_mask(image: Image.Image) -> np.ndarray:
+    """흐림 후 밝기 기울기가 배경 잡음보다 큰 픽셀 (명함 윤곽 + 글자)"""
+    gray = np.asarray(image.convert('L').filter(ImageFilter.GaussianBlur(1)), dtype=np.float32)
+    gradient_x = np.zeros_like(gray)
+    gradient_y = np.zeros_like(gray)
+    gradient_x[:, 1:-1] = gray[:, 2:] - gray[:, :-2]
+    gradient_y[1:-1] = gray[2:] - gray[:-2]
+    magnitude = np.hypot(gradient_x, gradient_y)
+    edges = magnitude > max(EDGE_THRESHOLD, 3 * float(np.median(magnitude)))
+    edges[:2] = edges[-2:] = False  # 사진 테두리 자체는 윤곽이 아님
+    edges[:, :2] = edges[:, -2:] = False
+    return edges
+
+
+def _dilate(mask: np.ndarray, size: int) -> np.ndarray:
+    return np.asarray(Image.fromarray(mask.astype(np.uint8) * 255).filter(ImageFilter.MaxFilter(size))) > 127
+
+
+def _corners(component: np.ndarray) -> np.ndarray:
+    """영역 극점으로 찾은 꼭짓점 (왼쪽 위, 오른쪽 위, 오른쪽 아래, 왼쪽 아래)"""
+    ys, xs = np.nonzero(component)
+    sums, differences = xs + ys, xs - ys
+    indices = [np.argmin(sums), np.argmax(differences), np.argmax(sums), np.argmin(differences)]
+    return np.array([[xs[i], ys[i]] for i in indices], dtype=np.float64)
+
+
+def _polygon_area(corners: np.ndarray) -> float:
+    x, y = corners[:, 0], corners[:, 1]
+    return 0.5 * abs(np.dot(x, np.roll(y, -1)) - np.dot(y, np.roll(x, -1)))
+
+
+def _polygon_mask(corners: np.ndarray, shape) -> np.ndarray:
+    """볼록 사각형 내부 마스크 (각 변의 같은 쪽에 있는 점)"""
+    ys, xs = np.mgrid[0:shape[0], 0:shape[1]]
+    inside = np.ones(shape, dtype=bool)
+    for index in range(4):
+        (x0, y0), (x1, y1) = corners[index], corners[(index + 1) % 4]
+        inside &= (x1 - x0) * (ys - y0) - (y1 - y0) * (xs - x0) >= -0.5  # 시계 방향(화면 좌표) 꼭짓점 기준
+    return inside
+
+
+def _side_support(start: np.ndarray, end: np.ndarray, edges: np.ndarray) -> float:
+    """선분 위 점 중 윤곽 픽셀 위에 있는 비율"""
+    height, width = edges.shape
+    steps = max(2, int(np.linalg.norm(end - start)))
+    points = start + (end - start) * np.linspace(0, 1, steps)[:, None]
+    xs = np.clip(points[:, 0].round().astype(int), 0, width - 1)
+    ys = np.clip(points[:, 1].round().astype(int), 0, height - 1)
+    return float(edges[ys, xs].mean())
+
+
+def _refine_corners(corners: np.ndarray, edges: np.ndarray) -> np.ndarray:
+    """꼭짓점을 주변 몇 픽셀 안에서 옮겨 양옆 변이 윤곽과 가장 잘 겹치는 위치로 보정
+
+    극점은 테두리에 붙은 잡음 덩어리나 기울어진 변의 계단 모양 때문에 실제 꼭짓점에서 몇 픽셀 벗어난다.
+    """
+    corners = corners.copy()
+    offsets = [np.array([dx, dy]) for dy in range(-REFINE_RADIUS, REFINE_RADIUS + 1)
+               for dx in range(-REFINE_RADIUS, REFINE_RADIUS + 1)]
+    for _ in range(2):
+        for index in range(4):
+            previous, following = corners[index - 1], corners[(index + 1) % 4]
+            corners[index] = max(
+                (corners[index] + offset for offset in offsets),
+                key=lambda point: _side_support(previous, point, edges) + _side_support(point, following, edges),
+            )
+    return corners
+
+
+def _boundary_support(corners: np.ndarray, edges: np.ndarray) -> float:
+    """네 변 중 가장 약한 변에서 근처에 윤곽 픽셀이 있는 점의 비율
+
+    평균이 아닌 최솟값을 쓰는 이유: 밑줄/왼쪽 정렬된 글자 덩어리는 두세 변만 윤곽이 있고
+    나머지 변(줄 끝이 들쭉날쭉한 쪽)은 비어 있다.
+    """
+    return min(_side_support(corners[index], corners[(index + 1) % 4], edges) for index in range(4))
+
+
+def _corner_angles(corners: np.ndarray) -> list:
+    angles = []
+    for index in range(4):
+        previous, point, following = corners[index - 1], corners[index], corners[(index + 1) % 4]
+        a, b = previous - point, following - point
+        cosine = np.dot(a, b) / max(1e-9, np.linalg.norm(a) * np.linalg.norm(b))
+        angles.append(float(np.degrees(np.arccos(np.clip(cosine, -1, 1)))))
+    return angles
+
+
+def _edge_lengths(corners: np.ndarray):
+    top = np.linalg.norm(corners[1] - corners[0])
+    right = np.linalg.norm(corners[2] - corners[1])
+    bottom = np.linalg.norm(corners[2] - corners[3])
+    left = np.linalg.norm(corners[3] - corners[0])
+    return (top + bottom) / 2, (left + right) / 2
+
+
+def _score(component: np.ndarray, boundary: np.ndarray, min_area: float = MIN_AREA_FRACTION):
+    """연결 영역 하나를 명함으로 볼 때의 (꼭짓점, 신뢰도, 사유) - boundary는 굵게 만든 윤곽"""
+    corners = _corners(component)
+    quad_area = _polygon_area(corners)
+    if quad_area < boundary.size * min_area:
+        return None, 0.0, 'too-small'
+    if quad_area > boundary.size * MAX_FILL_FRACTION:
+        return None, 1.0, 'fills-frame'
+
+    width, height = _edge_lengths(corners)
+    aspect = max(width, height) / max(1.0, min(width, height))
+    angles = _corner_angles(corners)
+    if not ASPECT_RANGE[0] <= aspect <= ASPECT_RANGE[1] or not all(60 <= angle <= 120 for angle in angles):
+        return None, 0.0, 'not-rectangular'
+
+    # 이후 계산은 영역 주변만 잘라서 (여러 장 검출 시 후보가 많음)
+    margin = REFINE_RADIUS + 5
+    left, top = np.maximum(corners.min(axis=0).astype(int) - margin, 0)
+    right, bottom = corners.max(axis=0).astype(int) + margin + 1
+    window = (slice(top, bottom), slice(left, right))
+    offset = np.array([left, top], dtype=np.float64)
+    local = _refine_corners(corners - offset, boundary[window])
+    support = _boundary_support(local, boundary[window])  # 글자 영역만 잡혔으면 변 위에 윤곽이 없음
+    inside = _dilate(_polygon_mask(local, boundary[window].shape), 9)
+    compactness = (component[window] & inside).sum() / max(1, component.sum())  # 영역이 사각형 밖으로 삐져나간 정도
+    return local + offset, float(support * compactness), 'detected'
+
+
+def _candidates(image: Image.Image, count: int, min_area: float) -> list:
+    """축소본의 큰 연결 영역 count개를 각각 명함 후보로 평가한 (꼭짓점, 신뢰도, 사유) 목록, 큰 영역 순"""
+    edges = _dilate(_edge_mask(image), 3)  # 끊어진 윤곽 잇기
+    boundary = _dilate(edges, 5)
+    return [_score(component, boundary, min_area) for component in _largest_components(edges, count)]
+
+
+def _inside(corners: np.ndarray, point: np.ndarray) -> bool:
+    return all(
+        (x1 - x0) * (point[1] - y0) - (y1 - y0) * (point[0] - x0) >= 0
+        for (x0, y0), (x1, y1) in zip(corners, np.roll(corners, -1, axis=0))
+    )
+
+
+def detect(image: Image.Image):
+    """축소본에서 명함 검출: (꼭짓점(축소본 좌표) 또는 None, 신뢰도, 사유)
+
+    큰 연결 영역 몇 개를 각각 명함 후보로 평가하여 신뢰도가 가장 높은 것을 고른다.
+    (옆에 놓인 종이/키보드가 가장 큰 영역이어도 명함을 찾을 수 있도록)
+    """
+    candidates = _candidates(image, CANDIDATE_COMPONENTS, MIN_AREA_FRACTION)
+    if not candidates:
+        return None, 0.0, 'no-card'
+    if candidates[0][2] == 'fills-frame':
+        return None, 1.0, 'fills-frame'
+    corners, confidence, reason = max(candidates, key=lambda candidate: candidate[1] if candidate[0] is not None else -1)
+    if corners is None:
+        return None, 0.0, reason
+    if confidence < MIN_CONFIDENCE:
+        return None, confidence, 'low-confidence'
+    return corners, confidence, reason
+
+
+def detect_cards(image: Image.Image) -> list:
+    """축소본에서 여러 장의 명함 검출: 서로 겹치지 않는 [(꼭짓점, 신뢰도)], 위 줄부터 왼쪽→오른쪽 순
+
+    명함 안의 글자 덩어리도 후보가 되므로, 신뢰도가 높은 후보부터 받아들이고
+    이미 받아들인 명함 안에 중심이 있는 (또는 그 명함을 품는) 후보는 버린다.
+    명함끼리 맞닿거나 겹쳐 있으면 하나의 영역이 되어 검출되지 않는다.
+    """
+    found = []
+    candidates = _candidates(image, SPLIT_CANDIDATES, SPLIT_MIN_AREA_FRACTION)
+    for corners, confidence, _ in sorted(candidates, key=lambda candidate: candidate[1], reverse=True):
+        if corners is None or confidence < MIN_CONFIDENCE:
+            continue
+        center = corners.mean(axis=0)
+        if any(_inside(other, center) or _inside(corners, other.mean(axis=0)) for other, _ in found):
+            continue
+        found.append((corners, confidence))
+        if len(found) == MAX_CARDS:
+            break
+    if found:
+        row_height = float(np.median([min(_edge_lengths(corners)) for corners, _ in found]))
+        found.sort(key=lambda card: (round(card[0][:, 1].mean() / row_height), card[0][:, 0].mean()))
+    return found
+
+
+def _perspective_coefficients(source: np.ndarray, width: int, height: int) -> list:
+    """출력 사각형 (0,0)-(width,height) → 원본 꼭짓점 변환 계수 (PIL PERSPECTIVE용)"""
+    target = [(0, 0), (width, 0), (width, height), (0, height)]
+    matrix, vector = [], []
+    for (x, y), (u, v) in zip(target, source):
+        matrix.append([x, y, 1, 0, 0, 0, -u * x, -u * y])
+        matrix.append([0, 0, 0, x, y, 1, -v * x, -v * y])
+        vector.extend([u, v])
+    return np.linalg.solve(np.array(matrix, dtype=np.float64), np.array(vector, dtype=np.float64)).tolist()
+
+
+def _output_size(corners: np.ndarray):
+    """측정한 변 길이에 가장 가까운 표준 명함 비율로 맞춘 출력 크기"""
+    width, height = _edge_lengths(corners)
+    landscape = width >= height
+    long_side, short_side = (width, height) if landscape else (height, width)
+    aspect = min(CARD_ASPECTS, key=lambda ratio: abs(ratio - long_side / short_side))
+    scale = min(1.0, MAX_OUTPUT_SIDE / long_side)
+    long_side = int(round(long_side * scale))
+    short_side = int(round(long_side / aspect))
+    return (long_side, short_side) if landscape else (short_side, long_side)
+
+
+def _open(data: bytes) -> Image.Image:
+    """EXIF 방향을 반영한 원본 이미지"""
+    with Image.open(io.BytesIO(data)) as original:
+        image = ImageOps.exif_transpose(original)
+        image.load()
+    return image
+
+
+def _thumbnail(image: Image.Image, size: int) -> Image.Image:
+    small = image.copy()
+    small.thumbnail((size, size))
+    return small
+
+
+def _warp(image: Image.Image, corners: np.ndarray) -> bytes:
+    """원본 좌표 꼭짓점 → 표준 명함 비율로 원근 보정한 JPEG 바이트"""
+    width, height = _output_size(corners)
+    warped = image.convert('RGB').transform(
+        (width, height), Image.PERSPECTIVE, _perspective_coefficients(corners, width, height), Image.BICUBIC,
+    )
+    buffer = io.BytesIO()
+    warped.save(buffer, 'JPEG', quality=JPEG_QUALITY)
+    return buffer.getvalue()
+
+
+def crop_card(data: bytes):
+    """이미지 바이트 → (잘라낸 JPEG 바이트 또는 None, 신뢰도, 사유, 원본 좌표 꼭짓점)"""
+    image = _open(data)
+    small = _thumbnail(image, WORKING_SIZE)
+    corners, confidence, reason = detect(small)
+    if corners is None:
+        return None, confidence, reason, None
+    corners = corners * (image.width / small.width)
+    return _warp(image, corners), confidence, reason, corners.round().astype(int).tolist()
+
+
+def split_card_images(data: bytes) -> list:
+    """한 사진에 여러 장이 찍혀 있으면 명함별 [(JPEG 바이트, 신뢰도, 원본 좌표 꼭짓점)], 한 장 이하면 []"""
+    image = _open(data)
+    small = _thumbnail(image, SPLIT_WORKING_SIZE)
+    cards = detect_cards(small)
+    if len(cards) < 2:
+        return []
+    scale = image.width / small.width
+    return [
+        (_warp(image, corners * scale), confidence, (corners * scale).round().astype(int).tolist())
+        for corners, confidence in cards
+    ]
+
+
+def crop_for_ocr(path: str) -> CropResult:
+    """파일을 검출/보정하여 '<이름>_card.jpg'로 저장 (검출하지 못하면 원본 경로 반환)"""
+    with open(path, 'rb') as f:
+        data = f.read()
+    try:
+        cropped, confidence, reason, corners = crop_card(data)
+    except Exception as e:  # 손상/미지원 이미지는 OCR 서비스의 판단에 맡김
+        return CropResult(path, False, 0.0, f'error: {e}', len(data), len(data))
+    if cropped is None:
+        return CropResult(path, False, confidence, reason, len(data), len(data))
+    cropped_path = os.path.splitext(path)[0] + '_card.jpg'
+    with open(cropped_path, 'wb') as f:
+        f.write(cropped)
+    return CropResult(cropped_path, True, confidence, reason, len(data), len(cropped), corners)
+
+
+def split_cards(path: str) -> list:
+    """여러 장이 찍힌 사진을 '<이름>_card<번호>.jpg' 파일들로 분리 (한 장 이하이거나 읽을 수 없으면 [])"""
+    with open(path, 'rb') as f:
+        data = f.read()
+    try:
+        cards = split_card_images(data)
+    except Exception:  # 손상/미지원 이미지는 한 장으로 보고 기존 경로에서 처리
+        return []
+    results = []
+    for number, (cropped, confidence, corners) in enumerate(cards, 1):
+        cropped_path = f"{os.path.splitext(path)[0]}_card{number}.jpg"
+        with open(cropped_path, 'wb') as f:
+            f.write(cropped)
+        results.append(CropResult(cropped_path, True, confidence, 'split', len(data), len(cropped), corners))
+    return results
+
+
+class CropStats:
+    """자르기 전후 비교 통계: 전송 바이트, OCR 지연시간, OCR 텍스트 길이(LLM 프롬프트 크기)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reasons = {}
+        self.bytes_before = 0
+        self.bytes_after = 0
+        self.split_photos = 0
+        self.split_cards = 0
+        self._ocr = {True: [0, 0.0, 0], False: [0, 0.0, 0]}  # 자름 여부 → [건수, OCR 초, 텍스트 글자 수]
+
+    def record(self, result: CropResult):
+        with self._lock:
+            self.reasons[result.reason] = self.reasons.get(result.reason, 0) + 1
+            self.bytes_before += result.bytes_before
+            self.bytes_after += result.bytes_after
+
+    def record_split(self, cards: int):
+        """여러 장 사진 하나를 cards장으로 분리"""
+        with self._lock:
+            self.split_photos += 1
+            self.split_cards += cards
+
+    def record_ocr(self, cropped: bool, seconds: float, text_length: int):
+        with self._lock:
+            entry = self._ocr[cropped]
+            entry[0] += 1
+            entry[1] += seconds
+            entry[2] += text_length
+
+    def stats(self) -> dict:
+        """헬스 체크용 통계"""
+        with self._lock:
+            ocr = {
+                'cropped' if cropped else 'full_frame': {
+                    'cards': count,
+                    'avg_ocr_seconds': round(seconds / count, 3) if count else None,
+                    'avg_text_chars': round(chars / count, 1) if count else None,
+                }
+                for cropped, (count, seconds, chars) in self._ocr.items()
+            }
+            return {
+                'reasons': dict(self.reasons),
+                'bytes_before': self.bytes_before,
+                'bytes_after': self.bytes_after,
+                'split_photos': self.split_photos,
+                'split_cards': self.split_cards,
+                'ocr': ocr,
+            }
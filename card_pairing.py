@@ -0,0 +1,156 @@
+"""
+한 번에 올린 앞면(한글)/뒷면(영문) 명함 이미지 자동 짝짓기
+
+OCR 텍스트만으로 짝을 찾는다.
+1) 문자 비율로 면 판정: 글자 중 한글이 HANGUL_SIDE_RATIO 이상이면 한글면, 아니면 영문면
+2) 같은 사람의 양면에는 같은 휴대폰 번호/이메일이 적혀 있다 (+82 표기는 0으로 정규화)
+   회사 대표번호/팩스는 같은 회사 동료 명함끼리도 같으므로 점수에만 더하고 짝의 근거로는 쓰지 않음
+3) 한글면 x 영문면 이분 그래프에서 공유 연락처 점수 합이 최대인 매칭 (헝가리안 알고리즘)
+   같은 번호/이메일을 여러 장이 공유하는 경우(같은 사람의 명함을 여러 번 찍음 등)에도 1:1로 나눈다.
+
+같은 면끼리는 짝짓지 않는다 (같은 명함을 두 번 찍은 것은 중복이지 양면이 아님).
+"""
+import re
+
+import numpy as np
+
+from dedupe import normalize_phone_number
+
+HANGUL_SIDE_RATIO = 0.05  # 영문면에도 한글 회사명 한두 글자는 있을 수 있음
+EMAIL_WEIGHT = 3.0
+MOBILE_WEIGHT = 2.0
+LANDLINE_WEIGHT = 0.5
+
+_EMAIL = re.compile(r'[\w.+-]+@[\w-]+(?:\.[\w-]+)+')
+_PHONE = re.compile(r'(?<![\w])(?:\+?82[\s.-]*\(?0?\)?[\s.-]*|0)\d{1,2}[\s.)-]*\d{3,4}[\s.-]*\d{4}(?!\d)')
+_HANGUL = re.compile(r'[가-힣ㄱ-ㅎㅏ-ㅣ]')
+_LATIN = re.compile(r'[A-Za-z]')
+
+
+def side_of(text: str) -> str:
+    """'ko'(한글면) / 'en'(영문면) / None(글자가 없음)"""
+    hangul = len(_HANGUL.findall(text))
+    latin = len(_LATIN.findall(text))
+    if not hangul and not latin:
+        return None
+    return 'ko' if hangul / (hangul + latin) >= HANGUL_SIDE_RATIO else 'en'
+
+
+def contact_tokens(text: str) -> dict:
+    """OCR 텍스트의 연락처 토큰 → 가중치 ('e' + 이메일, 'm' + 휴대폰, 'l' + 유선/팩스 숫자열)"""
+    tokens = {}
+    for email in _EMAIL.findall(text):
+        tokens['e' + email.lower().strip('.')] = EMAIL_WEIGHT
+    for phone in _PHONE.findall(text):
+        digits = re.sub(r'[^\d]', '', normalize_phone_number(re.sub(r'\(0\)', '', phone)))
+        if digits.startswith('82'):
+            digits = '0' + digits[2:]
+        if len(digits) < 9:
+            continue
+        if digits.startswith('01'):
+            tokens['m' + digits] = MOBILE_WEIGHT
+        else:
+            tokens.setdefault('l' + digits, LANDLINE_WEIGHT)
+    return tokens
+
+
+def pair_score(a: dict, b: dict) -> float:
+    """두 면의 공유 토큰 점수 (이메일/휴대폰을 하나도 공유하지 않으면 0)"""
+    shared = a.keys() & b.keys()
+    if not any(token[0] in 'em' for token in shared):
+        return 0.0
+    return sum(a[token] for token in shared)
+
+
+def max_weight_matching(weights: np.ndarray) -> list:
+    """직사각 가중치 행렬의 최대 가중치 매칭 [(행, 열)], 가중치 0인 짝은 제외 (헝가리안, O(n^2 m))"""
+    rows, columns = weights.shape
+    transposed = rows > columns
+    cost = -(weights.T if transposed else weights)  # 행 수 <= 열 수, 최소 비용 문제로
+    n, m = cost.shape
+    u = np.zeros(n + 1)
+    v = np.zeros(m + 1)
+    assigned = np.zeros(m + 1, dtype=int)  # 열 → 배정된 행 (1부터, 0은 없음)
+    for row in range(1, n + 1):
+        assigned[0] = row
+        column = 0
+        minimum = np.full(m + 1, np.inf)
+        previous = np.zeros(m + 1, dtype=int)
+        used = np.zeros(m + 1, dtype=bool)
+        while assigned[column]:
+            used[column] = True
+            current = assigned[column]
+            reduced = cost[current - 1] - u[current] - v[1:]
+            free = ~used[1:]
+            better = free & (reduced < minimum[1:])
+            minimum[1:][better] = reduced[better]
+            previous[1:][better] = column
+            candidates = np.where(free, minimum[1:], np.inf)
+            following = int(np.argmin(candidates)) + 1
+            delta = candidates[following - 1]
+            u[assigned[used]] += delta
+            v[used] -= delta
+            minimum[1:][free] -= delta
+            column = following
+        while column:
+            previous_column = previous[column]
+            assigned[column] = assigned[previous_column]
+            column = previous_column
+    pairs = []
+    for column in range(1, m + 1):
+        row = assigned[column]
+        if row and cost[row - 1, column - 1] < 0:
+            pairs.append((column - 1, row - 1) if transposed else (row - 1, column - 1))
+    return sorted(pairs)
+
+
+def pair_sides(texts: list) -> tuple:
+    """OCR 텍스트 목록 → ([(한글면 번호, 영문면 번호)], [짝이 없는 번호])
+
+    이메일/휴대폰 토큰 색인으로 후보 간선만 만들고, 연결 요소별로 매칭한다 (대부분 1:1이라 작음).
+    """
+    sides = [side_of(text) for text in texts]
+    tokens = [contact_tokens(text) for text in texts]
+    backs_by_token = {}
+    for index, side in enumerate(sides):
+        if side == 'en':
+            for token in tokens[index]:
+                if token[0] in 'em':
+                    backs_by_token.setdefault(token, []).append(index)
+
+    edges = {}
+    for front, side in enumerate(sides):
+        if side != 'ko':
+            continue
+        for token in tokens[front]:
+            for back in backs_by_token.get(token, ()):
+                if (front, back) not in edges:
+                    edges[front, back] = pair_score(tokens[front], tokens[back])
+
+    # 간선으로 이어진 한글/영문면 묶음 (union-find)
+    parent = {}
+
+    def find(x):
+        parent.setdefault(x, x)
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    for front, back in edges:
+        parent[find(front)] = find(back)
+    groups = {}
+    for front, back in edges:
+        groups.setdefault(find(front), []).append((front, back))
+
+    pairs = []
+    for group in groups.values():
+        fronts = sorted({front for front, _ in group})
+        backs = sorted({back for _, back in group})
+        weights = np.zeros((len(fronts), len(backs)))
+        for front, back in group:
+            weights[fronts.index(front), backs.index(back)] = edges[front, back]
+        pairs.extend((fronts[row], backs[column]) for row, column in max_weight_matching(weights))
+    pairs.sort()
+    paired = {index for pair in pairs for index in pair}
+    return pairs, [index for index in range(len(texts)) if index not in paired]
@@ -0,0 +1,282 @@
+"""
+추출된 연락처를 영구 보관하는 SQLite 저장소 (WAL) + FTS5 검색
+
+- contacts: 명함 id, 원본 이미지 해시, 추출 데이터(JSON), 검색용 컬럼
+- contacts_fts: 검색용 컬럼(이름/회사/직책/주소/이메일/전화)에 대한 external content FTS5 인덱스
+  (트리거로 contacts와 동기화)
+
+한글은 띄어쓰기 단위 토큰화로는 부분 검색이 안 되므로 trigram 토크나이저를 사용한다.
+trigram은 3글자 이상만 인덱스로 찾을 수 있어, 더 짧은 검색어는 LIKE 조건으로 처리한다.
+trigram을 지원하지 않는 SQLite(3.34 미만)에서는 unicode61 + 접두어 검색을 사용한다.
+
+- contact_keys: 초성/자모 자동완성 키 (hangul_index.index_keys, 저장 시 계산) → 범위 검색
+"""
+import json
+import sqlite3
+import threading
+import time
+
+import hangul_index
+
+MAX_PAGE_SIZE = 100
+MAX_SUGGESTIONS = 20
+SCHEMA_VERSION = 2  # 1: contact_keys 추가, 2: image_phash 추가
+SEARCH_COLUMNS = ('name', 'company', 'title', 'address', 'email', 'phone')
+
+
+def _joined(data: dict, *keys) -> str:
+    return ' '.join(value for value in dict.fromkeys(str(data.get(key) or '') for key in keys) if value)
+
+
+def search_fields(data: dict) -> dict:
+    """추출 데이터 → 검색용 컬럼 값 (단면/양면 필드 모두 포함)"""
+    return {
+        'name': _joined(data, 'name_ko', 'name', 'name_en'),
+        'company': _joined(data, 'company_ko', 'company', 'company_en'),
+        'title': _joined(data, 'title_ko', 'title', 'title_en'),
+        'address': _joined(data, 'address_ko', 'address', 'address_en'),
+        'email': _joined(data, 'email'),
+        'phone': _joined(data, 'phone'),
+    }
+
+
+def _fts_phrase(term: str) -> str:
+    """사용자 입력을 FTS5 문자열 리터럴로 (연산자로 해석되지 않도록)"""
+    return '"' + term.replace('"', '""') + '"'
+
+
+class ContactStore:
+    """스레드마다 별도 연결을 쓰는 SQLite 연락처 저장소"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        self.trigram = self._supports_trigram()
+        self._init_schema()
+
+    @staticmethod
+    def _supports_trigram() -> bool:
+        try:
+            sqlite3.connect(':memory:').execute("CREATE VIRTUAL TABLE t USING fts5(a, tokenize='trigram')")
+            return True
+        except sqlite3.OperationalError:
+            return False
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _init_schema(self):
+        tokenizer = 'trigram' if self.trigram else 'unicode61'
+        columns = ', '.join(SEARCH_COLUMNS)
+        new_columns = ', '.join(f'new.{column}' for column in SEARCH_COLUMNS)
+        old_columns = ', '.join(f'old.{column}' for column in SEARCH_COLUMNS)
+        with self._connect() as conn:
+            conn.executescript(f"""
+                CREATE TABLE IF NOT EXISTS contacts (
+                    rowid INTEGER PRIMARY KEY,
+                    id TEXT NOT NULL UNIQUE,
+                    image_hash TEXT,
+                    image_phash TEXT,
+                    source TEXT,
+                    data TEXT NOT NULL,
+                    {', '.join(f'{column} TEXT' for column in SEARCH_COLUMNS)},
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS contacts_image_hash ON contacts(image_hash);
+
+                CREATE VIRTUAL TABLE IF NOT EXISTS contacts_fts USING fts5(
+                    {columns}, content='contacts', content_rowid='rowid', tokenize='{tokenizer}'
+                );
+                CREATE TRIGGER IF NOT EXISTS contacts_ai AFTER INSERT ON contacts BEGIN
+                    INSERT INTO contacts_fts(rowid, {columns}) VALUES (new.rowid, {new_columns});
+                END;
+                CREATE TRIGGER IF NOT EXISTS contacts_ad AFTER DELETE ON contacts BEGIN
+                    INSERT INTO contacts_fts(contacts_fts, rowid, {columns}) VALUES ('delete', old.rowid, {old_columns});
+                END;
+                CREATE TRIGGER IF NOT EXISTS contacts_au AFTER UPDATE ON contacts BEGIN
+                    INSERT INTO contacts_fts(contacts_fts, rowid, {columns}) VALUES ('delete', old.rowid, {old_columns});
+                    INSERT INTO contacts_fts(rowid, {columns}) VALUES (new.rowid, {new_columns});
+                END;
+
+                CREATE TABLE IF NOT EXISTS contact_keys (
+                    key TEXT NOT NULL,
+                    contact_rowid INTEGER NOT NULL,
+                    PRIMARY KEY (key, contact_rowid)
+                ) WITHOUT ROWID;
+                CREATE INDEX IF NOT EXISTS contact_keys_rowid ON contact_keys(contact_rowid);
+                CREATE TRIGGER IF NOT EXISTS contacts_keys_ad AFTER DELETE ON contacts BEGIN
+                    DELETE FROM contact_keys WHERE contact_rowid = old.rowid;
+                END;
+            """)
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            if version < 1:
+                # 이전 버전 DB: 이미 저장된 연락처의 자동완성 키 생성
+                rows = conn.execute("SELECT rowid, data FROM contacts").fetchall()
+                self._replace_keys(conn, ((row['rowid'], json.loads(row['data'])) for row in rows))
+            if version < 2 and 'image_phash' not in {row['name'] for row in conn.execute("PRAGMA table_info(contacts)")}:
+                conn.execute("ALTER TABLE contacts ADD COLUMN image_phash TEXT")
+            if version < SCHEMA_VERSION:
+                conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    @staticmethod
+    def _replace_keys(conn, rowid_data):
+        """(rowid, 데이터) 목록의 자동완성 키를 새로 계산하여 교체"""
+        for rowid, data in rowid_data:
+            conn.execute("DELETE FROM contact_keys WHERE contact_rowid = ?", (rowid,))
+            conn.executemany(
+                "INSERT OR IGNORE INTO contact_keys (key, contact_rowid) VALUES (?, ?)",
+                ((key, rowid) for key in hangul_index.index_keys(data)),
+            )
+
+    def _rows(self, records):
+        now = time.time()
+        for record in records:
+            fields = search_fields(record['data'])
+            yield (
+                record['id'], record.get('image_hash'), record.get('image_phash'), record.get('source'),
+                json.dumps(record['data'], ensure_ascii=False),
+                *(fields[column] for column in SEARCH_COLUMNS), now, now,
+            )
+
+    def save_many(self, records):
+        """연락처 저장/갱신 (record: id, data, source?, image_hash?, image_phash?) - 한 트랜잭션"""
+        placeholders = ', '.join('?' * (7 + len(SEARCH_COLUMNS)))
+        updates = ', '.join(f'{column}=excluded.{column}' for column in ('source', 'data', *SEARCH_COLUMNS, 'updated_at'))
+        records = list(records)
+        with self._connect() as conn:
+            conn.executemany(
+                f"INSERT INTO contacts (id, image_hash, image_phash, source, data, {', '.join(SEARCH_COLUMNS)}, created_at, updated_at) "
+                f"VALUES ({placeholders}) "
+                f"ON CONFLICT(id) DO UPDATE SET {updates}, image_hash=COALESCE(excluded.image_hash, contacts.image_hash), "
+                f"image_phash=COALESCE(excluded.image_phash, contacts.image_phash)",
+                self._rows(records),
+            )
+            self._replace_keys(conn, (
+                (conn.execute("SELECT rowid FROM contacts WHERE id = ?", (record['id'],)).fetchone()[0], record['data'])
+                for record in records
+            ))
+
+    def save(self, record: dict):
+        self.save_many([record])
+
+    def get(self, card_id: str):
+        row = self._connect().execute("SELECT * FROM contacts WHERE id = ?", (card_id,)).fetchone()
+        return self._record(row) if row else None
+
+    def get_many(self, card_ids) -> dict:
+        """id 목록 → {id: 연락처} (없는 id는 빠짐)"""
+        card_ids = list(card_ids)
+        found = {}
+        for start in range(0, len(card_ids), 500):
+            chunk = card_ids[start:start + 500]
+            rows = self._connect().execute(
+                f"SELECT * FROM contacts WHERE id IN ({', '.join('?' * len(chunk))})", chunk
+            ).fetchall()
+            found.update((row['id'], self._record(row)) for row in rows)
+        return found
+
+    def iter_records(self, batch_size: int = 1000):
+        """저장된 모든 연락처 (저장 순, batch_size개씩 읽음)"""
+        last_rowid = 0
+        while True:
+            rows = self._connect().execute(
+                "SELECT * FROM contacts WHERE rowid > ? ORDER BY rowid LIMIT ?", (last_rowid, batch_size)
+            ).fetchall()
+            if not rows:
+                return
+            for row in rows:
+                yield self._record(row)
+            last_rowid = rows[-1]['rowid']
+
+    def iter_image_phashes(self):
+        """(명함 id, 16진 pHash) - pHash가 저장된 모든 연락처"""
+        cursor = self._connect().execute("SELECT id, image_phash FROM contacts WHERE image_phash IS NOT NULL")
+        for row in cursor:
+            yield row['id'], row['image_phash']
+
+    def delete_many(self, card_ids):
+        """연락처 삭제 (FTS/자동완성 키는 트리거로 함께 삭제)"""
+        with self._connect() as conn:
+            conn.executemany("DELETE FROM contacts WHERE id = ?", ((card_id,) for card_id in card_ids))
+
+    def find_by_image_hash(self, image_hash: str):
+        """같은 원본 이미지에서 추출된 가장 최근 연락처 (없으면 None)"""
+        row = self._connect().execute(
+            "SELECT * FROM contacts WHERE image_hash = ? ORDER BY updated_at DESC LIMIT 1", (image_hash,)
+        ).fetchone()
+        return self._record(row) if row else None
+
+    @staticmethod
+    def _record(row) -> dict:
+        return {
+            'id': row['id'], 'source': row['source'], 'image_hash': row['image_hash'], 'image_phash': row['image_phash'],
+            'data': json.loads(row['data']), 'created_at': row['created_at'], 'updated_at': row['updated_at'],
+        }
+
+    def search(self, query: str = '', page: int = 1, page_size: int = 20) -> dict:
+        """검색어(공백으로 구분된 단어 모두 포함) 페이지 검색, 최근 저장 순
+
+        bm25 정렬은 일치하는 모든 행을 점수화해야 하므로 흔한 검색어(회사명 등)에서 느리다.
+        FTS5가 rowid 순서로 결과를 내는 점을 이용해 LIMIT에서 바로 멈추도록 rowid 역순으로 정렬하고,
+        전체 개수를 세지 않고 page_size + 1개를 가져와 다음 페이지 유무만 판단한다.
+        """
+        page = max(1, page)
+        page_size = max(1, min(page_size, MAX_PAGE_SIZE))
+        terms = query.split()
+        min_length = 3 if self.trigram else 1
+        indexed = [term for term in terms if len(term) >= min_length]
+        short = [term for term in terms if len(term) < min_length]
+
+        params = []
+        if indexed:
+            if self.trigram:
+                match = ' '.join(_fts_phrase(term) for term in indexed)
+            else:
+                match = ' '.join(_fts_phrase(term) + '*' for term in indexed)
+            sql = "SELECT c.* FROM contacts_fts JOIN contacts c ON c.rowid = contacts_fts.rowid WHERE contacts_fts MATCH ?"
+            params.append(match)
+            order = "contacts_fts.rowid DESC"
+        else:
+            sql = "SELECT c.* FROM contacts c WHERE 1"
+            order = "c.rowid DESC"
+
+        for term in short:
+            pattern = '%' + term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+            sql += " AND (" + ' OR '.join(f"c.{column} LIKE ? ESCAPE '\\'" for column in SEARCH_COLUMNS) + ")"
+            params.extend([pattern] * len(SEARCH_COLUMNS))
+
+        sql += f" ORDER BY {order} LIMIT ? OFFSET ?"
+        params.extend([page_size + 1, (page - 1) * page_size])
+        rows = self._connect().execute(sql, params).fetchall()
+        return {
+            'items': [self._record(row) for row in rows[:page_size]],
+            'page': page,
+            'page_size': page_size,
+            'has_more': len(rows) > page_size,
+        }
+
+    def autocomplete(self, query: str, limit: int = 10) -> list:
+        """초성('ㅎㄱㄷ') 또는 자모 접두어('홍기') 자동완성 - 키 순서로 최대 limit개"""
+        key = hangul_index.query_key(query)
+        if not key:
+            return []
+        limit = max(1, min(limit, MAX_SUGGESTIONS))
+        rows = self._connect().execute(
+            "SELECT c.* FROM (SELECT DISTINCT contact_rowid FROM contact_keys WHERE key >= ? AND key < ? LIMIT ?) k "
+            "JOIN contacts c ON c.rowid = k.contact_rowid",
+            (key, hangul_index.prefix_upper_bound(key), limit),
+        ).fetchall()
+        return [self._record(row) for row in rows]
+
+    def stats(self) -> dict:
+        """헬스 체크용 통계"""
+        count = self._connect().execute("SELECT COUNT(*) FROM contacts").fetchone()[0]
+        return {'contacts': count, 'tokenizer': 'trigram' if self.trigram else 'unicode61'}
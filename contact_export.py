@@ -0,0 +1,122 @@
+"""
+여러 명함을 한 파일로 내보내는 스트리밍 export (multi-vCard / CSV / JSON Lines)
+
+연락처를 하나씩 직렬화하고 약 64KB 단위로 묶어 yield하므로
+연락처 수와 무관하게 메모리 사용량이 일정하다.
+"""
+import csv
+import io
+import json
+
+from vcard import bilingual
+
+CHUNK_BYTES = 64 * 1024
+
+# format 쿼리 파라미터 → (mimetype, 확장자)
+EXPORT_FORMATS = {
+    'vcf': ('text/vcard', 'vcf'),
+    'csv-google': ('text/csv', 'csv'),
+    'csv-outlook': ('text/csv', 'csv'),
+    'jsonl': ('application/x-ndjson', 'jsonl'),
+}
+
+GOOGLE_COLUMNS = [
+    'Name', 'Given Name', 'Family Name', 'Organization 1 - Name', 'Organization 1 - Title',
+    'E-mail 1 - Type', 'E-mail 1 - Value', 'Phone 1 - Type', 'Phone 1 - Value',
+    'Address 1 - Type', 'Address 1 - Formatted',
+]
+OUTLOOK_COLUMNS = [
+    'First Name', 'Last Name', 'Company', 'Job Title', 'E-mail Address', 'Business Phone', 'Business Street',
+]
+
+
+def split_name(data: dict):
+    """(표시 이름, 이름, 성) - 한글 이름은 첫 글자를 성으로, 영문 이름은 마지막 단어를 성으로 봄"""
+    name_ko = data.get('name_ko') or data.get('name', '')
+    name_en = data.get('name_en', '')
+    full_name = f"{name_ko} {name_en}".strip()
+    primary = name_ko.strip() or name_en.strip()
+    if not primary:
+        return full_name, '', ''
+    if ' ' not in primary and 2 <= len(primary) <= 4 and all('가' <= char <= '힣' for char in primary):
+        return full_name, primary[1:], primary[0]
+    given, _, family = primary.rpartition(' ')
+    return full_name, given or family, family if given else ''
+
+
+def google_row(data: dict) -> list:
+    full_name, given, family = split_name(data)
+    email, phone = data.get('email', ''), data.get('phone', '')
+    address = data.get('address_ko', '') or data.get('address', '')
+    return [
+        full_name, given, family, bilingual(data, 'company'), bilingual(data, 'title'),
+        'Work' if email else '', email, 'Work' if phone else '', phone,
+        'Work' if address else '', address,
+    ]
+
+
+def outlook_row(data: dict) -> list:
+    _, given, family = split_name(data)
+    return [
+        given, family, bilingual(data, 'company'), bilingual(data, 'title'),
+        data.get('email', ''), data.get('phone', ''), data.get('address_ko', '') or data.get('address', ''),
+    ]
+
+
+CSV_LAYOUTS = {
+    'csv-google': (GOOGLE_COLUMNS, google_row),
+    'csv-outlook': (OUTLOOK_COLUMNS, outlook_row),
+}
+
+
+def _chunked(pieces):
+    """작은 문자열 조각들을 CHUNK_BYTES 정도로 묶어 UTF-8 바이트로 yield"""
+    buffer, size = [], 0
+    for piece in pieces:
+        buffer.append(piece)
+        size += len(piece)
+        if size >= CHUNK_BYTES:
+            yield ''.join(buffer).encode('utf-8')
+            buffer, size = [], 0
+    if buffer:
+        yield ''.join(buffer).encode('utf-8')
+
+
+def iter_multi_vcf(items, vcf_fn):
+    """모든 연락처를 이어붙인 하나의 .vcf (vcf_fn 결과는 CRLF로 끝남)"""
+    for item in items:
+        yield vcf_fn(item['data'])
+
+
+def iter_csv(items, layout: str):
+    """Google/Outlook 연락처 가져오기 형식 CSV (Excel에서 한글이 깨지지 않도록 BOM 포함)"""
+    columns, row_fn = CSV_LAYOUTS[layout]
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator='\r\n')
+    buffer.write('\ufeff')
+    writer.writerow(columns)
+    for item in items:
+        writer.writerow(row_fn(item['data']))
+        if buffer.tell() >= CHUNK_BYTES:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+def iter_jsonl(items):
+    """한 줄에 연락처 하나 ({"id", ...필드} - 필드에 'id'가 있어도 명함 id가 우선)"""
+    for item in items:
+        yield json.dumps({'id': item.get('id'), **{key: value for key, value in item['data'].items() if key != 'id'}}, ensure_ascii=False)
+        yield '\n'
+
+
+def stream_export(export_format: str, items, vcf_fn):
+    """format에 맞는 바이트 청크 스트림 (items: {"id", "data"} 이터러블)"""
+    if export_format == 'vcf':
+        return _chunked(iter_multi_vcf(items, vcf_fn))
+    if export_format in CSV_LAYOUTS:
+        return _chunked(iter_csv(items, export_format))
+    if export_format == 'jsonl':
+        return _chunked(iter_jsonl(items))
+    raise ValueError(f"지원하지 않는 형식입니다: {export_format}")
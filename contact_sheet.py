@@ -0,0 +1,209 @@
+"""
+인쇄용 QR 연락처 시트 (A4 PDF / PNG 페이지)
+
+페이지 단위로 워커 풀에서 병렬 렌더링하고, 순서대로 하나씩 내보낸다.
+동시에 렌더링 중인 페이지 수(window)만큼만 메모리에 있으므로 연락처 수와 무관하게 메모리 사용량이 일정하다.
+
+PDF는 QR을 벡터 사각형으로 그리고, 한글 텍스트는 비내장 CID 폰트(HYGoThic-Medium, Adobe-Korea1)를 사용한다.
+PNG는 CONTACT_SHEET_FONT 또는 시스템 한글 폰트가 있으면 사용한다.
+"""
+import io
+import os
+import zlib
+from collections import deque
+
+import numpy as np
+
+from qr_render import MATRIX_CACHE
+
+# A4 (포인트 단위, 1pt = 1/72 inch)
+PAGE_WIDTH = 595
+PAGE_HEIGHT = 842
+MARGIN = 36
+COLUMNS = 3
+ROWS = 4
+PER_PAGE = COLUMNS * ROWS
+QR_SIZE = 130
+NAME_FONT_SIZE = 11
+COMPANY_FONT_SIZE = 9
+
+PNG_DPI = 150
+PNG_FONT_CANDIDATES = [
+    '/usr/share/fonts/truetype/nanum/NanumGothic.ttf',
+    '/usr/share/fonts/opentype/noto/NotoSansCJK-Regular.ttc',
+    '/usr/share/fonts/noto-cjk/NotoSansCJK-Regular.ttc',
+    '/System/Library/Fonts/AppleSDGothicNeo.ttc',
+    'C:/Windows/Fonts/malgun.ttf',
+]
+
+
+def chunk(entries, size: int = PER_PAGE):
+    """연락처 이터러블을 페이지 단위 리스트로 분할"""
+    page = []
+    for entry in entries:
+        page.append(entry)
+        if len(page) == size:
+            yield page
+            page = []
+    if page:
+        yield page
+
+
+def ordered_parallel(pool, fn, jobs, window: int):
+    """작업을 pool에서 최대 window개까지 동시에 실행하고 결과를 입력 순서대로 yield"""
+    pending = deque()
+    for job in jobs:
+        pending.append(pool.submit(fn, job))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def _fit_text(text: str, max_width: float, font_size: float) -> str:
+    """대략적인 글자 폭(한글 1em, 그 외 0.5em)으로 칸 너비에 맞게 자름"""
+    width = 0.0
+    for index, char in enumerate(text):
+        width += font_size * (0.5 if ord(char) < 0x80 else 1.0)
+        if width > max_width:
+            return text[:max(0, index - 1)] + '…'
+    return text
+
+
+def _cell_origin(slot: int):
+    """슬롯 번호 → 칸의 왼쪽 위 좌표 (PDF 좌표계, 위쪽이 PAGE_HEIGHT)"""
+    cell_width = (PAGE_WIDTH - 2 * MARGIN) / COLUMNS
+    cell_height = (PAGE_HEIGHT - 2 * MARGIN) / ROWS
+    column, row = slot % COLUMNS, slot // COLUMNS
+    return MARGIN + column * cell_width, PAGE_HEIGHT - MARGIN - row * cell_height, cell_width
+
+
+# --------------------------------------------------------------------------
+# PDF
+# --------------------------------------------------------------------------
+
+def _pdf_text(text: str) -> str:
+    """UniKS-UCS2-H 인코딩용 16진 문자열 (BMP 밖 문자는 제외)"""
+    return '<' + ''.join(char for char in text if ord(char) <= 0xFFFF).encode('utf-16-be').hex() + '>'
+
+
+def render_pdf_page(entries) -> bytes:
+    """한 페이지의 content stream (Flate 압축) - 워커 프로세스에서 실행"""
+    ops = []
+    for slot, entry in enumerate(entries):
+        left, top, cell_width = _cell_origin(slot)
+        x = left + (cell_width - QR_SIZE) / 2
+        y = top - QR_SIZE
+
+        matrix = MATRIX_CACHE.get(entry['payload'], entry['error_correction'])
+        module = QR_SIZE / matrix.shape[0]
+        ops.append(f"q {module:.4f} 0 0 {-module:.4f} {x:.2f} {top:.2f} cm")
+        padded = np.zeros((matrix.shape[0], matrix.shape[1] + 2), dtype=np.int8)
+        padded[:, 1:-1] = matrix
+        edges = np.diff(padded, axis=1)
+        for row in range(matrix.shape[0]):
+            for start, end in zip(np.flatnonzero(edges[row] == 1), np.flatnonzero(edges[row] == -1)):
+                ops.append(f"{start} {row} {end - start} 1 re")
+        ops.append("f Q")
+
+        text_width = cell_width - 8
+        name = _fit_text(entry['name'], text_width, NAME_FONT_SIZE)
+        company = _fit_text(entry['company'], text_width, COMPANY_FONT_SIZE)
+        ops.append(f"BT /F1 {NAME_FONT_SIZE} Tf {left + 4:.2f} {y - 16:.2f} Td {_pdf_text(name)} Tj ET")
+        if company:
+            ops.append(f"BT /F1 {COMPANY_FONT_SIZE} Tf {left + 4:.2f} {y - 30:.2f} Td {_pdf_text(company)} Tj ET")
+
+    return zlib.compress('\n'.join(ops).encode('ascii'), 6)
+
+
+def stream_pdf(pages):
+    """페이지 content stream 이터러블을 PDF 바이트 청크로 스트리밍
+
+    객체 번호: 1 Catalog, 2 Pages(마지막에 기록), 3-5 폰트, 6부터 페이지/콘텐츠 쌍
+    """
+    offsets = {}
+    position = 0
+
+    def emit(number: int, body: bytes) -> bytes:
+        nonlocal position
+        offsets[number] = position
+        data = f"{number} 0 obj\n".encode('ascii') + body + b"\nendobj\n"
+        position += len(data)
+        return data
+
+    header = b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n"
+    position = len(header)
+    yield header
+    yield emit(1, b"<< /Type /Catalog /Pages 2 0 R >>")
+    yield emit(3, b"<< /Type /Font /Subtype /Type0 /BaseFont /HYGoThic-Medium /Encoding /UniKS-UCS2-H /DescendantFonts [4 0 R] >>")
+    yield emit(4, b"<< /Type /Font /Subtype /CIDFontType0 /BaseFont /HYGoThic-Medium "
+                  b"/CIDSystemInfo << /Registry (Adobe) /Ordering (Korea1) /Supplement 1 >> "
+                  b"/FontDescriptor 5 0 R /DW 1000 /W [1 95 500] >>")
+    yield emit(5, b"<< /Type /FontDescriptor /FontName /HYGoThic-Medium /Flags 6 /FontBBox [-6 -145 1003 880] "
+                  b"/ItalicAngle 0 /Ascent 880 /Descent -120 /CapHeight 880 /StemV 93 >>")
+
+    kids = []
+    number = 6
+    for content in pages:
+        page_number, content_number = number, number + 1
+        kids.append(page_number)
+        yield emit(page_number, (
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {PAGE_WIDTH} {PAGE_HEIGHT}] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {content_number} 0 R >>"
+        ).encode('ascii'))
+        yield emit(content_number, f"<< /Length {len(content)} /Filter /FlateDecode >>\nstream\n".encode('ascii') + content + b"\nendstream")
+        number += 2
+
+    yield emit(2, f"<< /Type /Pages /Kids [{' '.join(f'{kid} 0 R' for kid in kids)}] /Count {len(kids)} >>".encode('ascii'))
+
+    xref_position = position
+    lines = [f"xref\n0 {number}\n", "0000000000 65535 f \n"]
+    lines.extend(f"{offsets[n]:010d} 00000 n \n" for n in range(1, number))
+    lines.append(f"trailer\n<< /Size {number} /Root 1 0 R >>\nstartxref\n{xref_position}\n%%EOF\n")
+    yield ''.join(lines).encode('ascii')
+
+
+# --------------------------------------------------------------------------
+# PNG
+# --------------------------------------------------------------------------
+
+def _load_font(size: int):
+    from PIL import ImageFont
+
+    for path in [os.environ.get('CONTACT_SHEET_FONT')] + PNG_FONT_CANDIDATES:
+        if path and os.path.exists(path):
+            return ImageFont.truetype(path, size)
+    return ImageFont.load_default()
+
+
+def render_png_page(entries) -> bytes:
+    """한 페이지를 PNG로 렌더링 - 워커 프로세스에서 실행"""
+    from PIL import Image, ImageDraw
+
+    scale = PNG_DPI / 72
+    page = Image.new('L', (int(PAGE_WIDTH * scale), int(PAGE_HEIGHT * scale)), 255)
+    draw = ImageDraw.Draw(page)
+    name_font = _load_font(int(NAME_FONT_SIZE * scale))
+    company_font = _load_font(int(COMPANY_FONT_SIZE * scale))
+
+    for slot, entry in enumerate(entries):
+        left, top, cell_width = _cell_origin(slot)
+        matrix = MATRIX_CACHE.get(entry['payload'], entry['error_correction'])
+        box = max(1, int(QR_SIZE * scale) // matrix.shape[0])
+        pixels = np.repeat(np.repeat(np.where(matrix, 0, 255).astype(np.uint8), box, axis=0), box, axis=1)
+        qr_image = Image.fromarray(pixels, 'L')
+
+        x = int((left + cell_width / 2) * scale - qr_image.width / 2)
+        y = int((PAGE_HEIGHT - top) * scale)
+        page.paste(qr_image, (x, y))
+
+        text_x = int((left + 4) * scale)
+        text_y = y + qr_image.height + int(4 * scale)
+        text_width = cell_width - 8
+        draw.text((text_x, text_y), _fit_text(entry['name'], text_width, NAME_FONT_SIZE), fill=0, font=name_font)
+        if entry['company']:
+            draw.text((text_x, text_y + int(14 * scale)), _fit_text(entry['company'], text_width, COMPANY_FONT_SIZE), fill=0, font=company_font)
+
+    buffer = io.BytesIO()
+    page.save(buffer, format='PNG', optimize=False)
+    return buffer.getvalue()
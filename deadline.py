@@ -0,0 +1,94 @@
+"""
+요청 단위 마감시간(deadline)과 취소 처리
+
+요청마다 Deadline을 만들어 OCR/LLM 단계에 남은 시간을 timeout으로 넘기고,
+마감이 지나거나 클라이언트가 취소하면 아직 시작하지 않은 명함 작업을 건너뛴다.
+"""
+import threading
+import time
+
+
+class Deadline:
+    """요청 하나의 마감시간 + 취소 플래그"""
+
+    def __init__(self, seconds: float, request_id: str = None):
+        self.request_id = request_id
+        self.expires_at = time.monotonic() + seconds
+        self._cancelled = threading.Event()
+
+    def remaining(self) -> float:
+        """남은 시간(초), 취소되었거나 마감이 지났으면 0"""
+        if self._cancelled.is_set():
+            return 0.0
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def cancel(self):
+        """클라이언트 연결 끊김/취소 요청 시 호출"""
+        self._cancelled.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+
+def latest_remaining(deadlines) -> float:
+    """여러 요청이 같은 작업을 기다릴 때, 가장 늦게 끝나는 요청 기준의 남은 시간"""
+    return max((deadline.remaining() for deadline in deadlines), default=0.0)
+
+
+class DeadlineRegistry:
+    """진행 중인 요청의 Deadline을 request_id로 찾아 취소할 수 있게 보관"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._active: dict[str, Deadline] = {}
+
+    def register(self, deadline: Deadline):
+        if deadline.request_id:
+            with self._lock:
+                self._active[deadline.request_id] = deadline
+
+    def unregister(self, deadline: Deadline):
+        with self._lock:
+            if self._active.get(deadline.request_id) is deadline:
+                del self._active[deadline.request_id]
+
+    def cancel(self, request_id: str) -> bool:
+        """request_id의 요청을 취소 (진행 중이 아니면 False)"""
+        with self._lock:
+            deadline = self._active.get(request_id)
+        if deadline is None:
+            return False
+        deadline.cancel()
+        return True
+
+
+class WastedWorkCounter:
+    """취소로 실행하지 않은 단계 수와 절약된 예상 시간 집계"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.skipped = {}
+        self.saved_seconds = 0.0
+        self.partial_responses = 0
+
+    def record(self, stage: str, estimated_seconds: float):
+        with self._lock:
+            self.skipped[stage] = self.skipped.get(stage, 0) + 1
+            self.saved_seconds += estimated_seconds
+
+    def record_partial(self):
+        with self._lock:
+            self.partial_responses += 1
+
+    def stats(self) -> dict:
+        """헬스 체크용 통계"""
+        with self._lock:
+            return {
+                'skipped': dict(self.skipped),
+                'saved_seconds': round(self.saved_seconds, 3),
+                'partial_responses': self.partial_responses,
+            }
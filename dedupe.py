@@ -0,0 +1,294 @@
+"""
+중복 연락처 탐지 (blocking key + 필드 유사도 + 증분 union-find 클러스터)
+
+같은 사람의 명함을 여러 행사에서 스캔하면 중복이 쌓인다. 모든 쌍을 비교하면 O(n²)이므로
+blocking key를 공유하는 연락처끼리만 비교한다.
+
+- p: 정규화된 전화번호 (숫자만)
+- e: 소문자 이메일
+- n: 정규화된 회사명 + 이름 bigram (이름 한 글자 오인식에도 다른 bigram이 일치)
+
+대표번호처럼 너무 많은 연락처가 공유하는 key는 후보를 폭증시키므로 max_block_size에서
+비교 대상에서 제외한다. 유사도가 threshold 이상인 쌍은 union-find로 합쳐
+새 명함이 들어올 때마다 클러스터를 증분 갱신한다.
+"""
+import re
+import threading
+from difflib import SequenceMatcher
+
+DEFAULT_THRESHOLD = 0.8
+DEFAULT_MAX_BLOCK_SIZE = 200
+NAME_MIN_SIMILARITY = 0.6  # 이름이 이보다 다르면 다른 사람 (같은 회사 대표번호/이메일 공유)
+EMAIL_MIN_SIMILARITY = 0.8  # 이메일이 이보다 다르면 다른 사람 (오인식 한두 글자는 허용)
+NAME_NGRAM = 2
+MAX_NAME_NGRAMS = 6
+
+# 필드 가중치 (양쪽 모두 값이 있는 필드만 점수에 반영)
+WEIGHTS = {'name': 0.45, 'phone': 0.2, 'email': 0.2, 'company': 0.15}
+
+_PHONE_SPLIT = re.compile(r'[,/;|]|\s{2,}')
+_COMPANY_SUFFIX = re.compile(
+    r'주식회사|유한회사|\(주\)|\(유\)|㈜|\bco\.?,?\s*ltd\.?|\binc\.?|\bcorp(oration)?\.?|\blimited\b|\bltd\.?'
+)
+_NON_WORD = re.compile(r'[\W_]+')
+
+
+def normalize_phone_number(phone: str) -> str:
+    """전화번호를 한국 표준 형식으로 정규화합니다. (+82 국가번호는 0으로)"""
+    digits = re.sub(r'[^\d]', '', phone)
+    if digits.startswith('82') and len(digits) in (11, 12):
+        digits = '0' + digits[2:]
+
+    if len(digits) == 9 and digits.startswith('02'):  # 02-xxx-xxxx
+        return f"{digits[:2]}-{digits[2:5]}-{digits[5:]}"
+    if len(digits) == 10:
+        if digits.startswith('02'):  # 02-xxxx-xxxx
+            return f"{digits[:2]}-{digits[2:6]}-{digits[6:]}"
+        return f"{digits[:3]}-{digits[3:6]}-{digits[6:]}"  # 031-xxx-xxxx
+    if len(digits) == 11:  # 010-xxxx-xxxx
+        return f"{digits[:3]}-{digits[3:7]}-{digits[7:]}"
+    return phone  # 원본 반환
+
+
+def phone_numbers(text: str) -> frozenset:
+    """전화번호 필드(여러 번호 가능) → 정규화된 번호의 숫자열 집합"""
+    numbers = set()
+    for part in _PHONE_SPLIT.split(text or ''):
+        digits = re.sub(r'[^\d]', '', normalize_phone_number(part.strip()))
+        if len(digits) >= 9:
+            numbers.add(digits)
+    return frozenset(numbers)
+
+
+def normalize_company(company: str) -> str:
+    """법인 표기((주), 주식회사, Inc. 등)와 공백/기호를 제거한 회사명"""
+    return _NON_WORD.sub('', _COMPANY_SUFFIX.sub('', (company or '').lower()))
+
+
+def _normalize_name(name: str) -> str:
+    return ''.join((name or '').lower().split())
+
+
+def features(data: dict) -> tuple:
+    """비교용 정규화 값 (한글 이름, 영문 이름, 전화번호 집합, 이메일, 회사)"""
+    return (
+        _normalize_name(data.get('name_ko') or data.get('name', '')),
+        _normalize_name(data.get('name_en', '')),
+        phone_numbers(data.get('phone', '')),
+        (data.get('email') or '').strip().lower(),
+        normalize_company(data.get('company_ko') or data.get('company', '') or data.get('company_en', '')),
+    )
+
+
+def blocking_keys(feature: tuple) -> set:
+    """후보 쌍 생성을 위한 blocking key 집합"""
+    name_ko, name_en, phones, email, company = feature
+    keys = {'p' + number for number in phones}
+    if email:
+        keys.add('e' + email)
+    name = name_ko or name_en
+    if company and name:
+        grams = [name[i:i + NAME_NGRAM] for i in range(max(1, len(name) - NAME_NGRAM + 1))]
+        keys.update(f'n{company}|{gram}' for gram in grams[:MAX_NAME_NGRAMS])
+    return keys
+
+
+def _ratio(a: str, b: str) -> float:
+    return 1.0 if a == b else SequenceMatcher(None, a, b).ratio()
+
+
+def _email_similarity(a: str, b: str) -> float:
+    """같은 도메인이면 아이디 부분의 유사도 (도메인이 같아 전체 문자열 유사도가 부풀려지지 않도록)"""
+    if a == b:
+        return 1.0
+    local_a, _, domain_a = a.rpartition('@')
+    local_b, _, domain_b = b.rpartition('@')
+    return _ratio(local_a, local_b) if domain_a == domain_b else 0.0
+
+
+def similarity(a: tuple, b: tuple) -> float:
+    """두 연락처의 가중 필드 유사도 (0~1)"""
+    scores = {}
+    names = [_ratio(x, y) for x, y in ((a[0], b[0]), (a[1], b[1])) if x and y]
+    if names:
+        scores['name'] = max(names)
+        if scores['name'] < NAME_MIN_SIMILARITY:
+            return 0.0
+    if a[2] and b[2]:
+        scores['phone'] = 1.0 if a[2] & b[2] else 0.0
+    if a[3] and b[3]:
+        scores['email'] = _email_similarity(a[3], b[3])
+        if scores['email'] < EMAIL_MIN_SIMILARITY:
+            return 0.0
+    if a[4] and b[4]:
+        scores['company'] = _ratio(a[4], b[4])
+    if not scores:
+        return 0.0
+    weight = sum(WEIGHTS[field] for field in scores)
+    return sum(WEIGHTS[field] * score for field, score in scores.items()) / weight
+
+
+class UnionFind:
+    """정수 원소의 union-find (경로 압축 + 크기 기준 합치기), 루트별 구성원 목록 유지"""
+
+    def __init__(self):
+        self.parent = []
+        self.members = {}  # 루트 → 구성원 (크기 2 이상인 클러스터만)
+
+    def add(self) -> int:
+        self.parent.append(len(self.parent))
+        return len(self.parent) - 1
+
+    def find(self, x: int) -> int:
+        parent = self.parent
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    def union(self, a: int, b: int) -> int:
+        a, b = self.find(a), self.find(b)
+        if a == b:
+            return a
+        members_a = self.members.pop(a, None) or [a]
+        members_b = self.members.pop(b, None) or [b]
+        if len(members_a) < len(members_b):
+            a, b, members_a, members_b = b, a, members_b, members_a
+        self.parent[b] = a
+        members_a.extend(members_b)
+        self.members[a] = members_a
+        return a
+
+
+class DedupeIndex:
+    """명함 id 단위 증분 중복 클러스터 (스레드 안전, 저장소에서 한 번 load 후 add로 갱신)
+
+    union-find는 분리를 지원하지 않으므로 수정된 연락처는 기존 클러스터에 남은 채
+    새 값으로 다시 비교된다 (block은 새 key로 옮긴다). 병합으로 삭제된 연락처는 remove로 목록에서만 제외한다.
+    """
+
+    def __init__(self, threshold: float = DEFAULT_THRESHOLD, max_block_size: int = DEFAULT_MAX_BLOCK_SIZE):
+        self.threshold = threshold
+        self.max_block_size = max_block_size
+        self.loaded = False
+        self._lock = threading.Lock()
+        self._ids = []
+        self._positions = {}
+        self._features = []
+        self._keys = []  # 위치별 현재 속한 block key (수정/삭제 시 예전 block에서 빼기 위해)
+        self._blocks = {}
+        self._oversized = set()
+        self._removed = set()
+        self._sets = UnionFind()
+        self.comparisons = 0
+
+    def load(self, records):
+        """저장소의 모든 연락처로 색인 구성 (이미 구성되었으면 무시)"""
+        with self._lock:
+            if self.loaded:
+                return
+            for record in records:
+                self._add_locked(record['id'], record['data'])
+            self.loaded = True
+
+    def add_many(self, records):
+        """새로 저장된 연락처를 비교하여 클러스터 갱신 (load 전이면 load 때 반영되므로 무시)"""
+        with self._lock:
+            if not self.loaded:
+                return
+            for record in records:
+                self._add_locked(record['id'], record['data'])
+
+    def _add_locked(self, card_id: str, data: dict):
+        position = self._positions.get(card_id)
+        if position is None:
+            position = self._sets.add()
+            self._positions[card_id] = position
+            self._ids.append(card_id)
+            self._features.append(None)
+            self._keys.append(set())
+        self._removed.discard(position)
+        feature = self._features[position] = features(data)
+        keys = set(blocking_keys(feature))
+        self._leave_blocks_locked(position, self._keys[position] - keys)
+        self._keys[position] = keys
+
+        candidates = set()
+        for key in keys:
+            if key in self._oversized:
+                continue
+            block = self._blocks.get(key)
+            if block is None:
+                self._blocks[key] = [position]
+                continue
+            candidates.update(block)
+            if position not in block:
+                block.append(position)
+                if len(block) > self.max_block_size:
+                    self._oversized.add(key)
+                    del self._blocks[key]
+
+        find = self._sets.find
+        for candidate in candidates:
+            if candidate == position or candidate in self._removed or find(candidate) == find(position):
+                continue
+            self.comparisons += 1
+            if similarity(feature, self._features[candidate]) >= self.threshold:
+                self._sets.union(position, candidate)
+
+    def _leave_blocks_locked(self, position: int, keys):
+        """더 이상 해당하지 않는 block에서 제외 (예전 값이 후보를 만들거나 block 크기에 세어지지 않도록)"""
+        for key in keys:
+            block = self._blocks.get(key)
+            if block is not None and position in block:
+                block.remove(position)
+                if not block:
+                    del self._blocks[key]
+
+    def remove(self, card_ids):
+        """병합으로 삭제된 연락처를 클러스터 목록과 block에서 제외"""
+        with self._lock:
+            for card_id in card_ids:
+                position = self._positions.get(card_id)
+                if position is not None:
+                    self._removed.add(position)
+                    self._leave_blocks_locked(position, self._keys[position])
+                    self._keys[position] = set()
+
+    def clusters(self) -> list:
+        """중복 클러스터(명함 id 목록) - 가장 최근에 추가된 구성원이 있는 클러스터부터"""
+        with self._lock:
+            groups = []
+            for members in self._sets.members.values():
+                alive = [position for position in members if position not in self._removed]
+                if len(alive) > 1:
+                    alive.sort(reverse=True)
+                    groups.append(alive)
+            groups.sort(key=lambda group: group[0], reverse=True)
+            return [[self._ids[position] for position in group] for group in groups]
+
+    def stats(self) -> dict:
+        """헬스 체크용 통계"""
+        with self._lock:
+            return {
+                'loaded': self.loaded,
+                'contacts': len(self._ids) - len(self._removed),
+                'clusters': sum(
+                    1 for members in self._sets.members.values()
+                    if sum(position not in self._removed for position in members) > 1
+                ),
+                'comparisons': self.comparisons,
+                'oversized_blocks': len(self._oversized),
+                'threshold': self.threshold,
+            }
+
+
+def merge_records(records) -> dict:
+    """클러스터 병합 데이터: 첫 레코드 값을 우선하고 빈 필드는 최근 수정된 레코드 값으로 채움"""
+    keep, *others = records
+    merged = dict(keep['data'])
+    for record in sorted(others, key=lambda record: record.get('updated_at') or 0, reverse=True):
+        for field, value in record['data'].items():
+            if value and not merged.get(field):
+                merged[field] = value
+    return merged
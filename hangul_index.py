@@ -0,0 +1,111 @@
+"""
+한글 초성/자모 단위 자동완성 키
+
+- 자모 분해: '홍길동' → 'ㅎㅗㅇㄱㅣㄹㄷㅗㅇ' (겹모음/겹받침은 키보드 입력 순서대로 분해)
+  입력 중인 글자('홍기')도 자모 접두어로 일치한다.
+- 초성: '홍길동' → 'ㅎㄱㄷ'
+
+저장 시 이름(모든 음절 위치)과 회사/직책(단어 시작 위치)에서 시작하는 접미어를 두 방식으로 변환해
+접두어 검색용 키로 만든다. 공백은 제거하므로 '주식회사 삼'처럼 여러 단어 입력도 일치한다.
+"""
+import re
+import unicodedata
+
+CHOSUNG = 'ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ'
+JUNGSUNG = 'ㅏㅐㅑㅒㅓㅔㅕㅖㅗㅘㅙㅚㅛㅜㅝㅞㅟㅠㅡㅢㅣ'
+JONGSUNG = ['', 'ㄱ', 'ㄲ', 'ㄳ', 'ㄴ', 'ㄵ', 'ㄶ', 'ㄷ', 'ㄹ', 'ㄺ', 'ㄻ', 'ㄼ', 'ㄽ', 'ㄾ', 'ㄿ', 'ㅀ',
+            'ㅁ', 'ㅂ', 'ㅄ', 'ㅅ', 'ㅆ', 'ㅇ', 'ㅈ', 'ㅊ', 'ㅋ', 'ㅌ', 'ㅍ', 'ㅎ']
+
+# 두 번 눌러 입력하는 겹모음/겹받침
+COMPOUND_JAMO = {
+    'ㅘ': 'ㅗㅏ', 'ㅙ': 'ㅗㅐ', 'ㅚ': 'ㅗㅣ', 'ㅝ': 'ㅜㅓ', 'ㅞ': 'ㅜㅔ', 'ㅟ': 'ㅜㅣ', 'ㅢ': 'ㅡㅣ',
+    'ㄳ': 'ㄱㅅ', 'ㄵ': 'ㄴㅈ', 'ㄶ': 'ㄴㅎ', 'ㄺ': 'ㄹㄱ', 'ㄻ': 'ㄹㅁ', 'ㄼ': 'ㄹㅂ', 'ㄽ': 'ㄹㅅ',
+    'ㄾ': 'ㄹㅌ', 'ㄿ': 'ㄹㅍ', 'ㅀ': 'ㄹㅎ', 'ㅄ': 'ㅂㅅ',
+}
+
+HANGUL_BASE = 0xAC00
+HANGUL_COUNT = 11172
+
+MAX_KEY_LENGTH = 40  # 이보다 긴 접두어로 검색하는 경우는 없으므로 키 크기 제한
+JAMO_PREFIX = 'j'
+CHOSUNG_PREFIX = 'c'
+
+_WORD_SPLIT = re.compile(r'[\s()\[\]/·,.&|-]+')
+
+
+def _build_tables():
+    """음절 → 자모 / 초성 str.translate 테이블 (모듈 로드 시 한 번)"""
+    jamo_table, chosung_table = {}, {}
+    for offset in range(HANGUL_COUNT):
+        cho, rest = divmod(offset, 21 * 28)
+        jung, jong = divmod(rest, 28)
+        syllable = HANGUL_BASE + offset
+        parts = CHOSUNG[cho] + JUNGSUNG[jung] + JONGSUNG[jong]
+        jamo_table[syllable] = ''.join(COMPOUND_JAMO.get(char, char) for char in parts)
+        chosung_table[syllable] = CHOSUNG[cho]
+    for char, keys in COMPOUND_JAMO.items():
+        jamo_table[ord(char)] = keys
+    return jamo_table, chosung_table
+
+
+_JAMO_TABLE, _CHOSUNG_TABLE = _build_tables()
+_CHOSUNG_SET = set(CHOSUNG)
+
+
+def _normalize(text: str) -> str:
+    """NFC(macOS 등에서 온 분해형 한글 결합) + 소문자 + 공백 제거"""
+    return ''.join(unicodedata.normalize('NFC', text).lower().split())
+
+
+def jamo(text: str) -> str:
+    return _normalize(text).translate(_JAMO_TABLE)
+
+
+def chosung(text: str) -> str:
+    return _normalize(text).translate(_CHOSUNG_TABLE)
+
+
+def is_chosung_query(query: str) -> bool:
+    """자음만으로 된 입력이면 초성 검색"""
+    letters = _normalize(query)
+    return bool(letters) and all(char in _CHOSUNG_SET for char in letters)
+
+
+def query_key(query: str) -> str:
+    """검색어 → 접두어 검색 키 (빈 문자열이면 검색하지 않음)"""
+    if not _normalize(query):
+        return ''
+    if is_chosung_query(query):
+        return (CHOSUNG_PREFIX + chosung(query))[:MAX_KEY_LENGTH]
+    return (JAMO_PREFIX + jamo(query))[:MAX_KEY_LENGTH]
+
+
+def _suffixes(text: str, every_syllable: bool):
+    words = [word for word in _WORD_SPLIT.split(text) if word]
+    for index, word in enumerate(words):
+        rest = ''.join(words[index + 1:])
+        starts = range(len(word)) if every_syllable else (0,)
+        for start in starts:
+            yield word[start:] + rest
+
+
+def index_keys(data: dict) -> set:
+    """연락처 → 자동완성 키 집합 (이름은 모든 음절 위치, 회사/직책은 단어 시작 위치)"""
+    fields = (
+        (data.get('name_ko') or data.get('name', ''), True),
+        (data.get('company_ko') or data.get('company', ''), False),
+        (data.get('title_ko') or data.get('title', ''), False),
+    )
+    keys = set()
+    for text, every_syllable in fields:
+        for suffix in _suffixes(str(text or ''), every_syllable):
+            keys.add((JAMO_PREFIX + jamo(suffix))[:MAX_KEY_LENGTH])
+            keys.add((CHOSUNG_PREFIX + chosung(suffix))[:MAX_KEY_LENGTH])
+    keys.discard(JAMO_PREFIX)
+    keys.discard(CHOSUNG_PREFIX)
+    return keys
+
+
+def prefix_upper_bound(key: str) -> str:
+    """key로 시작하는 모든 문자열보다 큰 가장 작은 문자열 (범위 검색 상한)"""
+    return key[:-1] + chr(ord(key[-1]) + 1)
@@ -0,0 +1,123 @@
+"""
+OCR 전 이미지 품질 검사 (흔들림/노출/글자 없음)
+
+흔들리거나 어두운 사진도 CLOVA OCR과 LLM을 한 번씩 다 거친 뒤에야 거의 빈 결과로 돌아오고,
+사용자는 결국 다시 찍는다. 축소 디코드한 흑백 이미지에서 몇 ms 안에 점수를 계산하여
+OCR 전에 바로 다시 찍으라고 알려준다.
+
+- sharpness: 라플라시안 분산 (선명한 글자 윤곽이 있으면 큼)을 대비의 제곱으로 나눈 값 (밝기와 무관하게 비교)
+- contrast: 밝기 1~99 백분위 차이 (글자 픽셀이 적은 흰 명함도 글자와 바탕의 차이가 잡힘)
+- brightness: 평균 밝기 / highlights: 하얗게 날아간 픽셀 비율 - 대비가 낮을 때 원인(어두움/반사) 구분용
+- text_density: 밝기 기울기가 큰 픽셀 비율 (빈 종이, 명함 일부만 찍힌 사진)
+
+검은 바탕에 흰 글자인 명함, 여백이 대부분 흰색인 명함은 대비가 충분하므로 통과한다.
+
+임계값은 test_sample과 흐림/어둡게 만든 변형으로 정했다 (benchmarks/bench_image_quality.py).
+"""
+import io
+import threading
+from dataclasses import dataclass, field
+
+import numpy as np
+from PIL import Image, ImageOps
+
+WORKING_SIZE = 512
+MIN_SHARPNESS = 0.004  # 대비로 정규화한 라플라시안 분산 (선명한 원본은 0.02 이상)
+MIN_CONTRAST = 60
+DARK_BRIGHTNESS = 90  # 대비가 낮으면서 이보다 어두우면 '어두움'
+MAX_HIGHLIGHTS = 0.6  # 대비가 낮으면서 250 이상인 픽셀이 이보다 많으면 '반사/과다 노출'
+MIN_TEXT_DENSITY = 0.01
+TEXT_GRADIENT = 24  # 글자 윤곽으로 볼 밝기 기울기
+
+MESSAGES = {
+    'blurry': '사진이 흔들렸거나 초점이 맞지 않았습니다. 명함에 초점을 맞춰 다시 찍어주세요.',
+    'dark': '사진이 너무 어둡습니다. 밝은 곳에서 다시 찍어주세요.',
+    'low-contrast': '글자와 배경의 대비가 낮습니다. 조명을 바꿔 다시 찍어주세요.',
+    'overexposed': '빛 반사로 사진이 하얗게 날아갔습니다. 각도를 바꿔 다시 찍어주세요.',
+    'no-text': '사진에서 글자를 찾을 수 없습니다. 명함 전체가 나오게 다시 찍어주세요.',
+}
+
+
+@dataclass
+class QualityReport:
+    """품질 검사 결과 (problems가 비어 있으면 통과)"""
+    scores: dict
+    problems: list = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not self.problems
+
+    def errors(self) -> list:
+        """응답용 [{code, message}]"""
+        return [{'code': code, 'message': MESSAGES[code]} for code in self.problems]
+
+
+def _grayscale(data: bytes) -> np.ndarray:
+    """긴 변 WORKING_SIZE 이하 흑백 축소본 (JPEG은 draft로 디코드 단계에서 축소)"""
+    with Image.open(io.BytesIO(data)) as image:
+        image.draft('L', (WORKING_SIZE, WORKING_SIZE))
+        image = ImageOps.exif_transpose(image).convert('L')
+        image.thumbnail((WORKING_SIZE, WORKING_SIZE))
+        return np.asarray(image, dtype=np.float32)
+
+
+def scores(gray: np.ndarray) -> dict:
+    """흑백 축소본의 품질 점수"""
+    low, high = np.percentile(gray, (1, 99))
+    contrast = float(high - low)
+    laplacian = (gray[1:-1, :-2] + gray[1:-1, 2:] + gray[:-2, 1:-1] + gray[2:, 1:-1] - 4 * gray[1:-1, 1:-1])
+    gradient = np.hypot(gray[1:-1, 2:] - gray[1:-1, :-2], gray[2:, 1:-1] - gray[:-2, 1:-1])
+    return {
+        'sharpness': round(float(laplacian.var()) / max(contrast, 1.0) ** 2, 4),
+        'brightness': round(float(gray.mean()), 1),
+        'contrast': round(contrast, 1),
+        'highlights': round(float((gray >= 250).mean()), 3),
+        'text_density': round(float((gradient > TEXT_GRADIENT).mean()), 4),
+    }
+
+
+def assess(data: bytes) -> QualityReport:
+    """이미지 바이트 → 품질 검사 결과 (디코드할 수 없으면 통과시켜 OCR 서비스의 판단에 맡김)"""
+    try:
+        values = scores(_grayscale(data))
+    except Exception:
+        return QualityReport({})
+    if values['contrast'] < MIN_CONTRAST:
+        if values['text_density'] < MIN_TEXT_DENSITY:
+            problem = 'no-text'
+        elif values['brightness'] < DARK_BRIGHTNESS:
+            problem = 'dark'
+        elif values['highlights'] > MAX_HIGHLIGHTS:
+            problem = 'overexposed'
+        else:
+            problem = 'low-contrast'
+    elif values['sharpness'] < MIN_SHARPNESS:
+        problem = 'blurry'
+    elif values['text_density'] < MIN_TEXT_DENSITY:
+        problem = 'no-text'
+    else:
+        return QualityReport(values)
+    return QualityReport(values, [problem])
+
+
+class QualityStats:
+    """품질 검사 통계 (스레드 안전): 검사 수, 사유별 문제 사진 수, 그중 그래도 처리한 수"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checked = 0
+        self.problems = {}
+        self.forced = 0
+
+    def record(self, report: QualityReport, forced: bool = False):
+        with self._lock:
+            self.checked += 1
+            for code in report.problems:
+                self.problems[code] = self.problems.get(code, 0) + 1
+            self.forced += forced and not report.ok
+
+    def stats(self) -> dict:
+        """헬스 체크용 통계"""
+        with self._lock:
+            return {'checked': self.checked, 'problems': dict(self.problems), 'forced': self.forced}
@@ -0,0 +1,229 @@
+"""
+명함 레이아웃 템플릿: 같은 디자인의 명함은 LLM 없이 위치로 추출
+
+행사에서는 같은 회사, 같은 디자인의 명함이 수십 장씩 들어온다.
+확정된 추출 결과(사용자가 수정했거나 내려받은 명함)의 OCR 줄로 템플릿을 만든다.
+- 고정 줄(anchor): 회사명/주소/대표번호처럼 이름/직책/휴대폰/이메일 값이 없는 줄의 텍스트와 위치
+- 필드 자리(slot): 개인 값이 들어 있던 줄의 위치, 글자 높이(글꼴 크기 대신), 필드 라벨
+
+새 명함은 고정 줄 텍스트 색인으로 후보 템플릿을 찾는다. 일치한 고정 줄들로 배율/이동을 맞춘 뒤
+각 자리에 해당하는 줄을 찾아 line_labels로 값을 조립한다.
+신뢰도 = (위치까지 맞는 고정 줄 비율) x (찾은 자리 비율)이고, MIN_CONFIDENCE 미만이면 LLM으로 넘긴다.
+같은 템플릿에 맞는 명함이 다시 확정되면 그 명함에 없던 고정 줄은 개인 정보였던 것으로 보고 뺀다.
+
+템플릿 색인은 JSON 파일 하나에 저장한다 (명함당 수 KB).
+"""
+import json
+import os
+import re
+import threading
+
+from line_classifier import LABEL_OTHER, training_labels
+from singleflight import content_hash
+
+PERSONAL_FIELDS = {'name', 'title', 'phone', 'email'}
+MIN_ANCHORS = 2  # 고정 줄이 이보다 적은 명함은 템플릿으로 만들지 않음
+MIN_CONFIDENCE = 0.8
+ANCHOR_TOLERANCE = 1.0  # 맞춘 뒤 고정 줄 중심 위치 오차 허용 (|dx| + |dy|, 글자 높이 배수)
+SLOT_TOLERANCE = 0.6  # 자리와 줄의 세로 오차 허용 (글자 높이 배수)
+HEIGHT_RATIO = 1.5  # 자리와 줄의 글자 높이 비율 허용 범위
+MAX_CANDIDATES = 3  # 고정 줄이 많이 겹치는 순으로 검사할 템플릿 수
+
+_COMPACT = re.compile(r'[^0-9a-z가-힣@]')
+_EMAIL = re.compile(r'@')
+_DIGITS = re.compile(r'\d')
+
+
+def _key(text: str) -> str:
+    return _COMPACT.sub('', text.lower())
+
+
+def _center(box) -> tuple:
+    return (box[0] + box[2]) / 2, (box[1] + box[3]) / 2
+
+
+def _height(box) -> float:
+    return max(1.0, box[3] - box[1])
+
+
+def build_template(lines: list, data: dict):
+    """확정된 명함의 줄 목록 + 최종 값 → 템플릿 (좌표가 없거나 고정 줄이 부족하면 None)"""
+    if not lines or any(line.get('box') is None for line in lines):
+        return None
+    anchors, slots = [], []
+    for line, label in zip(lines, training_labels(lines, data)):
+        fields = label.split()
+        if PERSONAL_FIELDS & set(fields):
+            slots.append({'fields': fields, 'box': list(line['box'])})
+        elif _key(line['text']):
+            anchors.append({'key': _key(line['text']), 'box': list(line['box']),
+                            'fields': [] if label == LABEL_OTHER else fields})
+    if len(anchors) < MIN_ANCHORS or not slots:
+        return None
+    return {
+        'id': content_hash('\0'.join(sorted(anchor['key'] for anchor in anchors)))[:16],
+        'anchors': anchors,
+        'slots': slots,
+        'confirmed': 1,
+        'matched': 0,
+    }
+
+
+def _fit(pairs: list) -> tuple:
+    """(템플릿 좌표, 새 명함 좌표) 쌍들 → 배율, x 이동, y 이동 (최소제곱, 회전 없음)"""
+    count = len(pairs)
+    mean_tx = sum(t[0] for t, _ in pairs) / count
+    mean_ty = sum(t[1] for t, _ in pairs) / count
+    mean_nx = sum(n[0] for _, n in pairs) / count
+    mean_ny = sum(n[1] for _, n in pairs) / count
+    spread = sum((t[0] - mean_tx) ** 2 + (t[1] - mean_ty) ** 2 for t, _ in pairs)
+    if spread <= 0:
+        return 1.0, mean_nx - mean_tx, mean_ny - mean_ty
+    scale = sum((t[0] - mean_tx) * (n[0] - mean_nx) + (t[1] - mean_ty) * (n[1] - mean_ny) for t, n in pairs) / spread
+    return scale, mean_nx - scale * mean_tx, mean_ny - scale * mean_ty
+
+
+def _plausible(fields: list, text: str) -> bool:
+    """자리에 들어온 줄이 필드 형식에 맞는지 (전화번호 자리에 숫자, 이메일 자리에 @)"""
+    if 'email' in fields and not _EMAIL.search(text):
+        return False
+    if 'phone' in fields and len(_DIGITS.findall(text)) < 8:
+        return False
+    return True
+
+
+def match(template: dict, lines: list):
+    """템플릿과 새 명함 줄 목록 비교 → (신뢰도, {줄 번호: [필드]})"""
+    by_key = {}
+    for line in lines:
+        by_key.setdefault(_key(line['text']), []).append(line)
+    pairs = [(anchor, by_key[anchor['key']][0]) for anchor in template['anchors'] if anchor['key'] in by_key]
+    if len(pairs) < MIN_ANCHORS:
+        return 0.0, {}
+    scale, dx, dy = _fit([(_center(anchor['box']), _center(line['box'])) for anchor, line in pairs])
+    if scale <= 0:
+        return 0.0, {}
+
+    labels, used = {}, set()
+    anchors_ok = 0
+    for anchor, line in pairs:
+        x, y = _center(anchor['box'])
+        nx, ny = _center(line['box'])
+        if abs(scale * x + dx - nx) + abs(scale * y + dy - ny) <= ANCHOR_TOLERANCE * scale * _height(anchor['box']):
+            anchors_ok += 1
+            used.add(line['id'])
+            if anchor['fields']:
+                labels[line['id']] = anchor['fields']
+
+    slots_ok = 0
+    for slot in template['slots']:
+        left, top, right, bottom = (scale * slot['box'][0] + dx, scale * slot['box'][1] + dy,
+                                    scale * slot['box'][2] + dx, scale * slot['box'][3] + dy)
+        height = max(1.0, bottom - top)
+        best = None
+        for line in lines:
+            if line['id'] in used:
+                continue
+            box = line['box']
+            vertical = abs((box[1] + box[3]) / 2 - (top + bottom) / 2)
+            overlaps = box[0] <= right + height and box[2] >= left - height
+            ratio = _height(box) / height
+            if (vertical <= SLOT_TOLERANCE * height and overlaps and 1 / HEIGHT_RATIO <= ratio <= HEIGHT_RATIO
+                    and (best is None or vertical < best[0])):
+                best = (vertical, line)
+        if best and _plausible(slot['fields'], best[1]['text']):
+            slots_ok += 1
+            used.add(best[1]['id'])
+            labels[best[1]['id']] = slot['fields']
+    confidence = anchors_ok / len(template['anchors']) * slots_ok / len(template['slots'])
+    return confidence, labels
+
+
+class TemplateIndex:
+    """레이아웃 템플릿 색인 (스레드 안전, 고정 줄 텍스트 → 템플릿 id, path가 있으면 바뀔 때마다 저장)"""
+
+    def __init__(self, path: str = None):
+        self.path = path
+        self._lock = threading.Lock()
+        self.templates = {}
+        self._anchor_index = {}
+        self.lookups = 0
+        self.matches = 0
+        if path and os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                for template in json.load(f):
+                    self._add_locked(template)
+
+    def _add_locked(self, template: dict):
+        self.templates[template['id']] = template
+        for anchor in template['anchors']:
+            self._anchor_index.setdefault(anchor['key'], set()).add(template['id'])
+
+    def _remove_locked(self, template_id: str):
+        template = self.templates.pop(template_id)
+        for anchor in template['anchors']:
+            self._anchor_index.get(anchor['key'], set()).discard(template_id)
+
+    def _candidates_locked(self, lines: list) -> list:
+        hits = {}
+        for key in {_key(line['text']) for line in lines}:
+            for template_id in self._anchor_index.get(key, ()):
+                hits[template_id] = hits.get(template_id, 0) + 1
+        ranked = sorted((count, template_id) for template_id, count in hits.items() if count >= MIN_ANCHORS)
+        return [self.templates[template_id] for _, template_id in reversed(ranked[-MAX_CANDIDATES:])]
+
+    def _best_locked(self, lines: list):
+        best = (0.0, None, {})
+        for template in self._candidates_locked(lines):
+            confidence, labels = match(template, lines)
+            if confidence > best[0]:
+                best = (confidence, template, labels)
+        return best
+
+    def lookup(self, lines: list):
+        """가장 잘 맞는 템플릿 → (신뢰도, 템플릿 id, {줄 번호: [필드]}) - 좌표가 없거나 후보가 없으면 (0, None, {})"""
+        if not lines or any(line.get('box') is None for line in lines):
+            return 0.0, None, {}
+        with self._lock:
+            self.lookups += 1
+            confidence, template, labels = self._best_locked(lines)
+            if template is None:
+                return 0.0, None, {}
+            if confidence >= MIN_CONFIDENCE:
+                self.matches += 1
+                template['matched'] += 1
+            return confidence, template['id'], labels
+
+    def confirm(self, lines: list, data: dict):
+        """확정된 명함 반영: 맞는 템플릿이 있으면 그 명함에 없던 고정 줄을 빼고, 없으면 새 템플릿 추가 → 템플릿 id"""
+        template = build_template(lines, data)
+        if template is None:
+            return None
+        with self._lock:
+            confidence, existing, _ = self._best_locked(lines)
+            if existing is not None and confidence >= MIN_CONFIDENCE / 2:
+                keys = {anchor['key'] for anchor in template['anchors']}
+                kept = [anchor for anchor in existing['anchors'] if anchor['key'] in keys]
+                if len(kept) >= MIN_ANCHORS:
+                    self._remove_locked(existing['id'])
+                    existing['anchors'] = kept
+                    existing['confirmed'] += 1
+                    self._add_locked(existing)
+                    template = existing
+                else:
+                    self._add_locked(template)
+            else:
+                self._add_locked(template)
+            if self.path:
+                self._save_locked()
+            return template['id']
+
+    def _save_locked(self):
+        with open(self.path + '.tmp', 'w', encoding='utf-8') as f:
+            json.dump(list(self.templates.values()), f, ensure_ascii=False)
+        os.replace(self.path + '.tmp', self.path)
+
+    def stats(self) -> dict:
+        """헬스 체크용 통계"""
+        with self._lock:
+            return {'templates': len(self.templates), 'lookups': self.lookups, 'matches': self.matches}
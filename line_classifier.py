@@ -0,0 +1,225 @@
+"""
+사용자 수정으로 학습하는 OCR 줄 분류기 (LLM 전 단계)
+
+사용자가 편집 폼에서 고친 최종 값과 그 명함의 OCR 줄을 맞춰 (줄, 필드) 예제를 만들고,
+글자 n-gram + 줄 위치 특징의 다항 로지스틱 회귀를 CPU에서 점진적으로 학습한다.
+모든 줄의 예측 확률이 충분히 높으면 LLM을 부르지 않고 line_labels로 값을 조립한다.
+
+- 라벨: 최종 값이 들어 있는 필드 (한 줄에 여러 필드면 줄 안의 순서대로 'name title'), 없으면 'other'
+  라벨 종류는 학습 중 처음 보면 추가된다.
+- 특징: 숫자를 0으로 바꾼 글자 1~3-gram, 글자 종류 비율, 줄 위치(세로/가로 5구간, 첫/마지막 줄)를
+  crc32로 HASH_DIM 차원에 해싱 (프로세스가 달라도 같은 인덱스)
+- 점진 학습: 새 예제 + 최근 예제 일부(REPLAY_SIZE)를 몇 번 SGD로 학습, 학습할 때마다 version 증가
+- 버전 관리: line_model_v{version}.npz로 저장하고 최근 MAX_VERSIONS개만 남김, 시작 시 최신 버전 로드
+"""
+import glob
+import json
+import os
+import random
+import re
+import threading
+import zlib
+
+import numpy as np
+
+LABEL_OTHER = 'other'
+FIELDS = ('name', 'title', 'company', 'phone', 'email', 'address')
+HASH_DIM = 1 << 18
+LEARNING_RATE = 0.5
+EPOCHS = 3
+REPLAY_SIZE = 500  # 새 예제와 함께 다시 학습하는 최근 예제 수 (새 명함만 학습하면 이전 분포를 잊음)
+MAX_REPLAY = 20000
+MAX_VERSIONS = 5
+MIN_TRAINING_CARDS = 30  # 이만큼 학습하기 전에는 분류기를 쓰지 않음
+
+_COMPACT = re.compile(r'[^0-9a-z가-힣@]')
+_DIGIT = re.compile(r'\d')
+_HANGUL = re.compile(r'[가-힣]')
+_LATIN = re.compile(r'[A-Za-z]')
+
+
+def _compact(text: str) -> str:
+    return _COMPACT.sub('', text.lower())
+
+
+def line_positions(lines: list) -> list:
+    """줄 목록 → 줄별 (세로 위치, 가로 위치) 0~1 (좌표가 없으면 줄 순서로)"""
+    boxes = [line.get('box') for line in lines]
+    if not lines or None in boxes:
+        return [(index / max(1, len(lines) - 1), 0.0) for index in range(len(lines))]
+    top, bottom = min(box[1] for box in boxes), max(box[3] for box in boxes)
+    left, right = min(box[0] for box in boxes), max(box[2] for box in boxes)
+    return [((box[1] - top) / max(1, bottom - top), (box[0] - left) / max(1, right - left)) for box in boxes]
+
+
+def features(text: str, position: tuple, first: bool, last: bool) -> np.ndarray:
+    """줄 하나의 해시 특징 인덱스 (중복 제거)"""
+    shape = _DIGIT.sub('0', text.lower())
+    padded = f"^{shape}$"
+    names = [f"g{size}:{padded[start:start + size]}" for size in (1, 2, 3) for start in range(len(padded) - size + 1)]
+    length = max(1, len(text))
+    names += [
+        f"digits:{min(4, 5 * len(_DIGIT.findall(text)) // length)}",
+        f"hangul:{min(4, 5 * len(_HANGUL.findall(text)) // length)}",
+        f"latin:{min(4, 5 * len(_LATIN.findall(text)) // length)}",
+        f"length:{min(6, len(text) // 5)}",
+        f"words:{min(4, len(text.split()))}",
+        f"y:{min(4, int(position[0] * 5))}",
+        f"x:{min(4, int(position[1] * 5))}",
+        f"first:{first}",
+        f"last:{last}",
+        'bias',
+    ]
+    return np.unique(np.fromiter((zlib.crc32(name.encode('utf-8')) % HASH_DIM for name in names), dtype=np.int64))
+
+
+def training_labels(lines: list, data: dict) -> list:
+    """최종 값 기준 줄별 라벨 ('name title' / 'other'): 값이 줄에 들어 있거나, 여러 줄에 걸친 값(주소 등)의 일부인 줄"""
+    values = {field: _compact(str(data.get(field, ''))) for field in FIELDS}
+    values['phone'] = re.sub(r'\D', '', values['phone'])
+    labels = []
+    for line in lines:
+        text = _compact(line['text'])
+        digits = re.sub(r'\D', '', text)
+        found = []
+        for field, value in values.items():
+            if not value:
+                continue
+            haystack = digits if field == 'phone' else text
+            if value in haystack:
+                found.append((haystack.find(value), field))
+            elif field == 'address' and len(text) >= 4 and text in value:
+                found.append((0, field))
+        labels.append(' '.join(field for _, field in sorted(found)) or LABEL_OTHER)
+    return labels
+
+
+class LineClassifier:
+    """점진 학습 줄 분류기 (스레드 안전, directory가 있으면 학습할 때마다 새 버전으로 저장)"""
+
+    def __init__(self, directory: str = None):
+        self.directory = directory
+        self._lock = threading.Lock()
+        self._rng = random.Random(0)
+        self.classes = [LABEL_OTHER]
+        self.weights = np.zeros((HASH_DIM, 1), dtype=np.float32)
+        self.bias = np.zeros(1, dtype=np.float32)
+        self.version = 0
+        self.cards = 0
+        self.examples = 0
+        self.replay = []  # 최근 예제 [(줄 텍스트, 위치, 첫 줄, 마지막 줄, 라벨)]
+        self.predictions = 0
+        self.confident = 0
+        if directory:
+            self.load()
+
+    def _class_index(self, label: str) -> int:
+        if label not in self.classes:
+            self.classes.append(label)
+            self.weights = np.hstack([self.weights, np.zeros((HASH_DIM, 1), dtype=np.float32)])
+            self.bias = np.append(self.bias, np.float32(0))
+        return self.classes.index(label)
+
+    def _probabilities(self, indices: np.ndarray) -> np.ndarray:
+        scores = self.weights[indices].sum(axis=0) / np.sqrt(len(indices)) + self.bias
+        scores = np.exp(scores - scores.max())
+        return scores / scores.sum()
+
+    @staticmethod
+    def _examples(lines: list, labels: list) -> list:
+        positions = line_positions(lines)
+        return [(line['text'], positions[index], index == 0, index == len(lines) - 1, labels[index])
+                for index, line in enumerate(lines)]
+
+    def learn(self, lines: list, data: dict) -> bool:
+        """수정이 끝난 명함 하나로 점진 학습하고 새 버전 저장 (학습할 줄이 없으면 False)"""
+        labels = training_labels(lines, data)
+        if not lines or all(label == LABEL_OTHER for label in labels):
+            return False
+        new = self._examples(lines, labels)
+        with self._lock:
+            batch = new + self._rng.sample(self.replay, min(REPLAY_SIZE, len(self.replay)))
+            encoded = [(features(text, position, first, last), self._class_index(label))
+                       for text, position, first, last, label in batch]
+            for _ in range(EPOCHS):
+                self._rng.shuffle(encoded)
+                for indices, target in encoded:
+                    gradient = self._probabilities(indices)
+                    gradient[target] -= 1.0
+                    step = (LEARNING_RATE / np.sqrt(len(indices))) * gradient
+                    self.weights[indices] -= step
+                    self.bias -= LEARNING_RATE * 0.1 * gradient
+            self.replay = (self.replay + new)[-MAX_REPLAY:]
+            self.cards += 1
+            self.examples += len(new)
+            self.version += 1
+            if self.directory:
+                self._save_locked()
+        return True
+
+    @property
+    def ready(self) -> bool:
+        return self.cards >= MIN_TRAINING_CARDS
+
+    def predict(self, lines: list) -> list:
+        """줄별 (라벨, 확률)"""
+        positions = line_positions(lines)
+        with self._lock:
+            results = []
+            for index, line in enumerate(lines):
+                probabilities = self._probabilities(features(line['text'], positions[index], index == 0, index == len(lines) - 1))
+                best = int(np.argmax(probabilities))
+                results.append((self.classes[best], float(probabilities[best])))
+            return results
+
+    def label(self, lines: list, min_confidence: float):
+        """line_labels 형식 라벨 {줄 번호: [필드]} - 학습이 덜 됐거나 확신이 낮은 줄이 있으면 None"""
+        if not self.ready or not lines:
+            return None
+        predictions = self.predict(lines)
+        confident = min(probability for _, probability in predictions) >= min_confidence
+        with self._lock:
+            self.predictions += 1
+            self.confident += confident
+        if not confident:
+            return None
+        return {line['id']: label.split() for line, (label, _) in zip(lines, predictions) if label != LABEL_OTHER}
+
+    def _save_locked(self):
+        os.makedirs(self.directory, exist_ok=True)
+        rows = np.flatnonzero(np.any(self.weights != 0, axis=1))
+        path = os.path.join(self.directory, f"line_model_v{self.version}.npz")
+        meta = {'version': self.version, 'classes': self.classes, 'cards': self.cards, 'examples': self.examples}
+        with open(path + '.tmp', 'wb') as f:
+            np.savez_compressed(f, rows=rows, weights=self.weights[rows], bias=self.bias,
+                                meta=np.array(json.dumps(meta, ensure_ascii=False)),
+                                replay=np.array(json.dumps(self.replay[-REPLAY_SIZE:], ensure_ascii=False)))
+        os.replace(path + '.tmp', path)
+        for old in self._versions()[:-MAX_VERSIONS]:
+            os.remove(old[1])
+
+    def _versions(self) -> list:
+        """저장된 (버전, 경로) 목록 (오래된 순)"""
+        paths = glob.glob(os.path.join(self.directory, 'line_model_v*.npz'))
+        return sorted((int(re.search(r'_v(\d+)\.npz$', path).group(1)), path) for path in paths)
+
+    def load(self):
+        """최신 버전 로드 (없으면 빈 모델)"""
+        versions = self._versions() if os.path.isdir(self.directory) else []
+        if not versions:
+            return
+        with np.load(versions[-1][1]) as saved:
+            meta = json.loads(str(saved['meta']))
+            weights = np.zeros((HASH_DIM, len(meta['classes'])), dtype=np.float32)
+            weights[saved['rows']] = saved['weights']
+            with self._lock:
+                self.classes, self.weights, self.bias = meta['classes'], weights, saved['bias'].astype(np.float32)
+                self.version, self.cards, self.examples = meta['version'], meta['cards'], meta['examples']
+                self.replay = [(text, tuple(position), first, last, label)
+                               for text, position, first, last, label in json.loads(str(saved['replay']))]
+
+    def stats(self) -> dict:
+        """헬스 체크용 통계"""
+        with self._lock:
+            return {'version': self.version, 'cards': self.cards, 'examples': self.examples, 'classes': len(self.classes),
+                    'ready': self.ready, 'predictions': self.predictions, 'llm_skipped': self.confident}
@@ -0,0 +1,114 @@
+"""
+줄 라벨링 추출 모드: LLM은 줄 번호 → 필드 이름만 답하고, 값은 OCR 텍스트에서 그대로 가져온다
+
+JSON 추출 모드는 모델이 모든 값을 다시 써내야 해서 출력 토큰이 많고(CPU 생성에서 가장 느린 부분)
+옮겨 적는 과정에서 글자가 바뀌기도 한다. 라벨링 모드의 출력은 {"1": "company", "3": ["name", "title"]}
+정도라 짧고, 값은 원래 OCR 줄에서 결정적으로 조립한다.
+
+- 전화번호/이메일은 라벨이 붙은 줄에서 정규식으로 뽑는다 (전화번호가 여러 개면 휴대폰 우선)
+- 한 줄에 여러 필드가 있으면 라벨 목록 순서대로 나눈다: 이름은 한글이면 한 단어, 영문이면 두 단어,
+  나머지 필드가 둘이면 (회사, 직책 등) 첫 단어와 나머지로 나눈다
+- 같은 필드가 여러 줄이면 주소는 이어 붙이고, 그 외에는 첫 줄을 쓴다
+- 양면은 영문면 줄 번호를 한글면 다음부터 매기고, 이름/직책/회사/주소는 줄이 나온 면에 따라 _ko/_en으로 나눈다
+"""
+import json
+import re
+
+FIELDS = ('name', 'title', 'company', 'phone', 'email', 'address')
+SIDED_FIELDS = ('name', 'title', 'company', 'address')
+TWO_SIDED_FIELDS = ('name_ko', 'name_en', 'title_ko', 'title_en', 'company_ko', 'company_en',
+                    'phone', 'email', 'address_ko', 'address_en')
+
+_EMAIL = re.compile(r'[\w.+-]+@[\w-]+(?:\.[\w-]+)+')
+_PHONE = re.compile(r'(?:\+82[\s.-]*\(?0?\)?[\s.-]*|\(?0)\d{1,2}\)?[\s.-]*\d{3,4}[\s.-]*\d{4}(?!\d)')
+_HANGUL = re.compile(r'[가-힣]')
+_PREFIX = re.compile(r'^(?:주소|address|add|addr|a|name|이름|tel|t|m|mobile|e|e-mail|email)\s*[.:)]\s*', re.IGNORECASE)
+
+
+def renumber(ocr_list: list, start: int) -> list:
+    """줄 번호를 start + 1부터 다시 매긴 사본 (양면 프롬프트에서 영문면 번호가 겹치지 않게)"""
+    return [{**line, 'id': start + index + 1} for index, line in enumerate(ocr_list)]
+
+
+def parse_labels(content, line_ids) -> dict:
+    """LLM 응답 → {줄 번호: [필드, ...]} (JSON이 아니거나 아는 필드 라벨이 하나도 없으면 None)"""
+    try:
+        raw = json.loads(content) if isinstance(content, str) else content
+    except (TypeError, ValueError):
+        return None
+    if not isinstance(raw, dict):
+        return None
+    labels = {}
+    for key, value in raw.items():
+        try:
+            line_id = int(str(key).strip().rstrip(':'))
+        except ValueError:
+            continue
+        names = value if isinstance(value, list) else re.split(r'[,+/ ]+', str(value))
+        names = [re.sub(r'_(ko|en)$', '', str(name).strip().lower()) for name in names]  # 면은 줄 위치로 정함
+        names = [name for name in names if name in FIELDS]
+        if line_id in line_ids and names:
+            labels[line_id] = names
+    return labels or None
+
+
+def _clean(text: str) -> str:
+    return _PREFIX.sub('', text).strip(' ,|:')
+
+
+def _split(text: str, names: list) -> dict:
+    """한 줄 → {필드: 값} (라벨 순서대로)"""
+    values = {}
+    for name, pattern in (('email', _EMAIL), ('phone', _PHONE)):
+        if name in names:
+            values[name] = [match.group(0) for match in pattern.finditer(text)]
+            text = pattern.sub(' ', text)
+    rest = [name for name in names if name not in ('email', 'phone')]
+    words = _clean(' '.join(text.split())).split()
+    if 'name' in rest and len(rest) > 1:
+        index = rest.index('name')
+        size = 1 if _HANGUL.search(' '.join(words)) else 2
+        if index == 0:
+            values['name'], words = [' '.join(words[:size])], words[size:]
+        elif index == len(rest) - 1:
+            values['name'], words = [' '.join(words[-size:])], words[:-size]
+        rest.remove('name')
+    if len(rest) == 1:
+        values[rest[0]] = [' '.join(words)]
+    elif len(rest) > 1:
+        values[rest[0]] = [' '.join(words[:1])]
+        values[rest[1]] = [' '.join(words[1:])]
+    return values
+
+
+def _pick(name: str, values: list) -> str:
+    values = [value for value in values if value]
+    if not values:
+        return ''
+    if name == 'address':
+        return ' '.join(values)
+    if name == 'phone':
+        mobile = [value for value in values if re.sub(r'^82', '0', re.sub(r'\D', '', value)).startswith('01')]
+        return (mobile or values)[0]
+    return values[0]
+
+
+def assemble(ocr_list: list, labels: dict) -> dict:
+    """단면: OCR 줄 + 라벨 → 추출 결과 ({"name", "title", "company", "phone", "email", "address"})"""
+    collected = {name: [] for name in FIELDS}
+    for line in ocr_list:
+        if line['id'] in labels:
+            for name, values in _split(line['text'], labels[line['id']]).items():
+                collected[name].extend(values)
+    return {name: _pick(name, values) for name, values in collected.items()}
+
+
+def assemble_two_sided(front: list, back: list, labels: dict) -> dict:
+    """양면: 한글면/영문면 OCR 줄 (번호가 이어지게 매긴 것) + 라벨 → 양면 추출 결과"""
+    collected = {name: [] for name in TWO_SIDED_FIELDS}
+    for suffix, ocr_list in (('_ko', front), ('_en', back)):
+        for line in ocr_list:
+            if line['id'] in labels:
+                for name, values in _split(line['text'], labels[line['id']]).items():
+                    collected[name + suffix if name in SIDED_FIELDS else name].extend(values)
+    return {name: _pick(name.split('_')[0], values) for name, values in collected.items()}
@@ -0,0 +1,145 @@
+"""
+CLOVA OCR 필드 → 읽기 순서 줄 목록
+
+예전에는 모든 inferText를 공백으로 이은 뒤 '.'으로 잘랐기 때문에 이메일/URL이 여러 '문장'으로
+쪼개지고 (hong.gd@corp.co.kr → 'hong', 'gd@corp', 'co', 'kr') 줄 구조도 사라졌다.
+
+1) 글자 정규화: 전각 → 반각 (＠, ０-９, 전각 공백), NFC
+2) boundingPoly 세로 구간이 겹치는 필드끼리 한 행으로 묶음 (약간 기울어진 줄은 가로로 가장 가까운
+   필드와 비교하여 따라감)
+3) 행 안에서 가로로 정렬하고, 간격이 크거나 CLOVA가 lineBreak로 끊은 곳에서 나눔 (Tel/Fax 두 칸 등)
+4) 위 → 아래, 왼쪽 → 오른쪽 순서로 번호를 매김
+
+inferConfidence가 NOISE_CONFIDENCE 미만인 필드(로고/배경 무늬 등)는 프롬프트에서 뺀다.
+전화번호/이메일/URL처럼 보이는 필드는 신뢰도가 낮아도 남긴다 (ocr_refine에서 다시 OCR 대상).
+줄마다 필드 신뢰도의 최솟값을 confidence로 기록한다.
+
+좌표가 없는 응답은 CLOVA 순서와 lineBreak만으로 줄을 나눈다.
+"""
+import re
+import unicodedata
+
+ROW_OVERLAP = 0.5  # 세로 구간이 작은 쪽 높이의 이 비율 이상 겹치면 같은 행
+COLUMN_GAP = 1.5  # 글자 높이의 이 배수보다 멀리 떨어지면 다른 칸 (별도 줄)
+LINE_BREAK_GAP = 0.5  # CLOVA가 다른 줄로 본 필드는 이 정도 간격만 있어도 나눔
+TIGHT_GAP = 0.1  # 이보다 붙어 있는 필드는 공백 없이 이음 (한 단어가 둘로 인식된 경우)
+NOISE_CONFIDENCE = 0.4  # 이보다 신뢰도가 낮은 필드는 잡음으로 보고 제외 (연락처 토큰 제외)
+
+CONTACT_TOKEN = re.compile(r'@|\d{3,}|\d+[-.)]\d+|www|http', re.IGNORECASE)  # 전화번호/이메일/URL 조각
+
+_FULL_WIDTH = {code: code - 0xFEE0 for code in range(0xFF01, 0xFF5F)}
+_FULL_WIDTH[0x3000] = ord(' ')
+
+
+def normalize(text: str) -> str:
+    """전각 영숫자/기호 → 반각, NFC, 연속 공백 정리"""
+    return ' '.join(unicodedata.normalize('NFC', text.translate(_FULL_WIDTH)).split())
+
+
+def is_noise(field: dict) -> bool:
+    """신뢰도가 매우 낮고 연락처 조각도 아닌 필드"""
+    return (field.get('inferConfidence', 1.0) < NOISE_CONFIDENCE
+            and not CONTACT_TOKEN.search(normalize(field.get('inferText', ''))))
+
+
+def _words(result_json: dict) -> list:
+    """[{text, box, line, confidence, reocr}] - line은 CLOVA lineBreak 기준 줄 번호, box는 좌표가 없으면 None"""
+    words, line = [], 0
+    for image_result in result_json.get('images', []):
+        for field in image_result.get('fields', []):
+            text = '' if is_noise(field) else normalize(field.get('inferText', ''))
+            vertices = (field.get('boundingPoly') or {}).get('vertices') or []
+            xs = [vertex.get('x') for vertex in vertices]
+            ys = [vertex.get('y') for vertex in vertices]
+            box = None
+            if xs and None not in xs and None not in ys:
+                box = (min(xs), min(ys), max(xs), max(ys))
+            if text:
+                words.append({'text': text, 'box': box, 'line': line,
+                              'confidence': field.get('inferConfidence', 1.0), 'reocr': field.get('reocr')})
+            if field.get('lineBreak'):
+                line += 1
+        line += 1
+    return words
+
+
+def _line(words: list, text: str, box) -> dict:
+    """줄 항목: 최소 신뢰도, 다시 OCR한 필드가 있으면 reocr ('improved' / 'kept')"""
+    line = {'text': text, 'box': box, 'confidence': round(min(word['confidence'] for word in words), 3)}
+    attempts = [word['reocr'] for word in words if word['reocr']]
+    if attempts:
+        line['reocr'] = 'improved' if 'improved' in attempts else 'kept'
+    return line
+
+
+def _join(words: list) -> dict:
+    """한 줄의 필드들 → 줄 항목"""
+    text = words[0]['text']
+    for previous, word in zip(words, words[1:]):
+        height = max(1, min(previous['box'][3] - previous['box'][1], word['box'][3] - word['box'][1]))
+        tight = word['box'][0] - previous['box'][2] < TIGHT_GAP * height
+        text += ('' if tight else ' ') + word['text']
+    boxes = [word['box'] for word in words]
+    return _line(words, text, [min(b[0] for b in boxes), min(b[1] for b in boxes),
+                               max(b[2] for b in boxes), max(b[3] for b in boxes)])
+
+
+def _rows(words: list) -> list:
+    """세로로 겹치는 필드끼리 행으로 묶음 (위에서부터)"""
+    rows = []
+    for word in sorted(words, key=lambda word: word['box'][1] + word['box'][3]):
+        top, bottom = word['box'][1], word['box'][3]
+        best, best_overlap = None, 0.0
+        for row in rows:
+            nearest = min(row, key=lambda other: max(other['box'][0] - word['box'][2], word['box'][0] - other['box'][2]))
+            overlap = min(bottom, nearest['box'][3]) - max(top, nearest['box'][1])
+            ratio = overlap / max(1, min(bottom - top, nearest['box'][3] - nearest['box'][1]))
+            if ratio >= ROW_OVERLAP and ratio > best_overlap:
+                best, best_overlap = row, ratio
+        if best is None:
+            rows.append([word])
+        else:
+            best.append(word)
+    return rows
+
+
+def _segments(row: list) -> list:
+    """한 행을 가로 정렬한 뒤 칸 사이 간격/CLOVA 줄바꿈에서 나눔"""
+    row = sorted(row, key=lambda word: word['box'][0])
+    segments = [[row[0]]]
+    for previous, word in zip(row, row[1:]):
+        height = max(1, min(previous['box'][3] - previous['box'][1], word['box'][3] - word['box'][1]))
+        gap = (word['box'][0] - previous['box'][2]) / height
+        if gap > COLUMN_GAP or (gap > LINE_BREAK_GAP and word['line'] != previous['line']):
+            segments.append([word])
+        else:
+            segments[-1].append(word)
+    return segments
+
+
+def assemble(result_json: dict) -> list:
+    """CLOVA OCR 응답 → [{'id', 'text', 'box', 'confidence'}] 읽기 순서 줄 목록 (id는 1부터)"""
+    words = _words(result_json)
+    if not words:
+        return []
+    if any(word['box'] is None for word in words):
+        lines = {}
+        for word in words:
+            lines.setdefault(word['line'], []).append(word)
+        return [{'id': index + 1, **_line(line, ' '.join(word['text'] for word in line), None)}
+                for index, line in enumerate(lines.values())]
+
+    lines = []
+    for row in sorted(_rows(words), key=lambda row: min(word['box'][1] for word in row)):
+        lines.extend(_join(segment) for segment in _segments(row))
+    return [{'id': index + 1, **line} for index, line in enumerate(lines)]
+
+
+def plain_text(ocr_list: list) -> str:
+    """JSON 추출 프롬프트용 텍스트: 줄바꿈으로만 구분 (줄 번호는 라벨링 모드에서만 필요하므로 토큰을 아낌)"""
+    return '\n'.join(item['text'] for item in ocr_list)
+
+
+def numbered_text(ocr_list: list) -> str:
+    """라벨링 모드 프롬프트용 줄 번호 텍스트 ('1: 홍길동\\n2: ...')"""
+    return '\n'.join(f"{item['id']}: {item['text']}" for item in ocr_list)
@@ -0,0 +1,137 @@
+"""
+신뢰도가 낮은 연락처 필드만 고해상도로 다시 OCR
+
+전화번호/이메일/URL 필드(ocr_layout.CONTACT_TOKEN)의 inferConfidence가 REOCR_CONFIDENCE 미만이면
+그 필드 영역만 원본 해상도에서 잘라 글자 높이가 REOCR_TEXT_HEIGHT가 되도록 확대하고,
+여러 영역을 세로로 이어 붙인 한 장으로 CLOVA OCR을 한 번 더 호출한다 (영역 수만큼 호출하지 않음).
+다시 읽은 결과의 신뢰도가 더 높을 때만 필드 텍스트를 바꾼다.
+이미지 전체를 다시 OCR하거나 LLM을 다시 호출하지 않는다.
+
+필드에는 reocr = 'improved' / 'kept' 표시가 남아 ocr_layout 줄 항목까지 전달된다.
+"""
+import copy
+import io
+import threading
+
+from PIL import Image, ImageOps
+
+from ocr_layout import CONTACT_TOKEN, normalize
+
+REOCR_CONFIDENCE = 0.9  # 연락처 필드 신뢰도가 이보다 낮으면 다시 OCR
+REOCR_TEXT_HEIGHT = 64  # 다시 OCR할 영역의 확대 후 글자 높이 (px)
+MAX_SCALE = 4.0
+REGION_PADDING = 0.35  # 영역 여백 (글자 높이 대비)
+MAX_REGIONS = 8  # 한 명함에서 다시 OCR할 최대 필드 수 (신뢰도 낮은 순)
+
+
+def _box(field: dict):
+    vertices = (field.get('boundingPoly') or {}).get('vertices') or []
+    xs = [vertex.get('x') for vertex in vertices]
+    ys = [vertex.get('y') for vertex in vertices]
+    if not xs or None in xs or None in ys:
+        return None
+    return min(xs), min(ys), max(xs), max(ys)
+
+
+def weak_fields(result_json: dict) -> list:
+    """다시 OCR할 필드 위치 [(이미지 번호, 필드 번호)] (신뢰도 낮은 순, 좌표가 있는 연락처 필드만)"""
+    targets = []
+    for image_index, image_result in enumerate(result_json.get('images', [])):
+        for field_index, field in enumerate(image_result.get('fields', [])):
+            confidence = field.get('inferConfidence', 1.0)
+            if (confidence < REOCR_CONFIDENCE and _box(field)
+                    and CONTACT_TOKEN.search(normalize(field.get('inferText', '')))):
+                targets.append((confidence, image_index, field_index))
+    return [(image_index, field_index) for _, image_index, field_index in sorted(targets)[:MAX_REGIONS]]
+
+
+def region_strip(image_path: str, result_json: dict, targets: list) -> tuple:
+    """필드 영역들을 확대해 세로로 이어 붙인 PNG → (바이트, 영역별 세로 구간 [(top, bottom)])"""
+    with Image.open(image_path) as image:
+        image = ImageOps.exif_transpose(image).convert('RGB')
+        regions = []
+        for image_index, field_index in targets:
+            left, top, right, bottom = _box(result_json['images'][image_index]['fields'][field_index])
+            height = max(1, bottom - top)
+            padding = REGION_PADDING * height
+            region = image.crop((max(0, int(left - padding)), max(0, int(top - padding)),
+                                 min(image.width, int(right + padding) + 1), min(image.height, int(bottom + padding) + 1)))
+            scale = min(MAX_SCALE, max(1.0, REOCR_TEXT_HEIGHT / height))
+            regions.append(region.resize((max(1, round(region.width * scale)), max(1, round(region.height * scale))), Image.LANCZOS))
+
+    gap = REOCR_TEXT_HEIGHT
+    strip = Image.new('RGB', (max(region.width for region in regions) + 2 * gap,
+                              sum(region.height for region in regions) + gap * (len(regions) + 1)), 'white')
+    spans, y = [], gap
+    for region in regions:
+        strip.paste(region, (gap, y))
+        spans.append((y, y + region.height))
+        y += region.height + gap
+    buffer = io.BytesIO()
+    strip.save(buffer, 'PNG')
+    return buffer.getvalue(), spans
+
+
+def apply_reocr(result_json: dict, targets: list, strip_json: dict, spans: list) -> dict:
+    """다시 읽은 결과를 원래 필드에 반영한 사본 (신뢰도가 높아진 필드만 텍스트 교체)"""
+    found = [[] for _ in spans]
+    for image_result in strip_json.get('images', []):
+        for field in image_result.get('fields', []):
+            box = _box(field)
+            if not box or not field.get('inferText'):
+                continue
+            center = (box[1] + box[3]) / 2
+            for index, (top, bottom) in enumerate(spans):
+                if top <= center <= bottom:
+                    found[index].append((box[0], field))
+                    break
+
+    result_json = copy.deepcopy(result_json)
+    for (image_index, field_index), fields in zip(targets, found):
+        field = result_json['images'][image_index]['fields'][field_index]
+        fields.sort(key=lambda item: item[0])
+        confidence = min((item[1].get('inferConfidence', 0.0) for item in fields), default=0.0)
+        if fields and confidence > field.get('inferConfidence', 1.0):
+            # 원래 필드는 공백 없는 한 토큰이므로 다시 읽은 조각을 그대로 이어 붙인다
+            field['inferText'] = ''.join(item[1]['inferText'] for item in fields)
+            field['inferConfidence'] = confidence
+            field['reocr'] = 'improved'
+        else:
+            field['reocr'] = 'kept'
+    return result_json
+
+
+def refine(image_path: str, result_json: dict, ocr_image) -> dict:
+    """신뢰도 낮은 연락처 필드를 다시 OCR한 응답 (대상이 없으면 그대로)
+
+    ocr_image(name, data, fmt)는 이미지 바이트를 CLOVA OCR 응답으로 바꾸는 함수.
+    """
+    targets = weak_fields(result_json)
+    if not targets:
+        return result_json
+    data, spans = region_strip(image_path, result_json, targets)
+    return apply_reocr(result_json, targets, ocr_image('reocr.png', data, 'png'), spans)
+
+
+class RefineStats:
+    """다시 OCR 통계 (스레드 안전): 다시 읽은 줄 수, 그중 신뢰도가 높아져 바뀐 줄 수"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.cards = 0
+        self.lines = 0
+        self.improved = 0
+
+    def record(self, ocr_list: list):
+        attempts = [line['reocr'] for line in ocr_list if line.get('reocr')]
+        if not attempts:
+            return
+        with self._lock:
+            self.cards += 1
+            self.lines += len(attempts)
+            self.improved += attempts.count('improved')
+
+    def stats(self) -> dict:
+        """헬스 체크용 통계"""
+        with self._lock:
+            return {'cards': self.cards, 'lines': self.lines, 'improved': self.improved}
@@ -0,0 +1,150 @@
+"""
+업로드 이미지의 지각 해시(pHash)와 근접 중복 검색 (multi-index hashing)
+
+같은 명함을 다시 찍거나 JPEG 품질만 바꿔 다시 저장한 이미지는 바이트 해시(SHA-256)가 달라도
+32x32 흑백 축소본의 저주파 DCT 계수 부호는 거의 같다. 64비트 해시의 해밍 거리가
+임계값 이하인 이미지를 같은 명함으로 본다.
+
+주의: 같은 디자인의 동료 명함(이름만 다름)도 거리 2~3으로 가깝게 나오므로
+근접 중복 결과의 자동 재사용은 요청에서 명시적으로 켠 경우에만 사용한다.
+"""
+import io
+import threading
+
+import numpy as np
+from PIL import Image, ImageOps
+
+HASH_BITS = 64
+DCT_SIZE = 32
+LOW_FREQUENCY = 8  # DCT_SIZE x DCT_SIZE 계수 중 왼쪽 위 8x8 → 64비트
+DEFAULT_MAX_DISTANCE = 4
+
+
+def _dct_matrix(size: int) -> np.ndarray:
+    """직교 DCT-II 행렬 (모듈 로드 시 한 번)"""
+    k = np.arange(size)
+    matrix = np.sqrt(2 / size) * np.cos(np.pi * (2 * k[None, :] + 1) * k[:, None] / (2 * size))
+    matrix[0] /= np.sqrt(2)
+    return matrix.astype(np.float32)
+
+
+_DCT = _dct_matrix(DCT_SIZE)
+
+
+def _grayscale(data: bytes, size: int) -> np.ndarray:
+    """작은 흑백 축소본 (JPEG은 draft로 디코드 단계에서 축소하여 원본 크기 디코드를 피함)"""
+    with Image.open(io.BytesIO(data)) as image:
+        image.draft('L', (size * 4, size * 4))
+        image = ImageOps.exif_transpose(image)
+        return np.asarray(image.convert('L').resize((size, size), Image.BILINEAR), dtype=np.float32)
+
+
+def phash(data: bytes) -> int:
+    """이미지 바이트 → 64비트 pHash (저주파 DCT 계수가 중앙값보다 크면 1)"""
+    coefficients = _DCT @ _grayscale(data, DCT_SIZE) @ _DCT.T
+    low = coefficients[:LOW_FREQUENCY, :LOW_FREQUENCY].ravel()
+    bits = low > np.median(low[1:])  # DC 성분은 밝기만 나타내므로 중앙값 계산에서 제외
+    return int.from_bytes(np.packbits(bits).tobytes(), 'big')
+
+
+def hamming(a: int, b: int) -> int:
+    return (a ^ b).bit_count()
+
+
+def to_hex(value: int) -> str:
+    return f'{value:016x}'
+
+
+class MultiIndexHash:
+    """해밍 거리 max_distance 이내 검색용 multi-index hashing
+
+    64비트를 max_distance + 1 조각으로 나누면, 거리가 max_distance 이내인 두 해시는
+    적어도 한 조각이 정확히 같다(비둘기집 원리). 조각별 dict에서 후보를 모아 거리만 확인한다.
+    (64비트 해밍 공간에서는 BK-tree가 가지를 거의 쳐내지 못해 선형 비교와 비슷하게 느림)
+    """
+
+    def __init__(self, max_distance: int):
+        self.max_distance = max_distance
+        chunks = max_distance + 1
+        widths = [HASH_BITS // chunks + (index < HASH_BITS % chunks) for index in range(chunks)]
+        shifts = [sum(widths[index + 1:]) for index in range(chunks)]
+        self._chunks = [(shift, (1 << width) - 1) for shift, width in zip(shifts, widths)]
+        self._tables = [{} for _ in range(chunks)]
+        self._hashes = []
+        self._values = []
+
+    @property
+    def size(self) -> int:
+        return len(self._hashes)
+
+    def add(self, value_hash: int, value):
+        position = len(self._hashes)
+        self._hashes.append(value_hash)
+        self._values.append(value)
+        for table, (shift, mask) in zip(self._tables, self._chunks):
+            table.setdefault((value_hash >> shift) & mask, []).append(position)
+
+    def search(self, value_hash: int) -> list:
+        """(거리, 값) 목록, 가까운 순"""
+        candidates = set()
+        for table, (shift, mask) in zip(self._tables, self._chunks):
+            candidates.update(table.get((value_hash >> shift) & mask, ()))
+        found = []
+        for position in candidates:
+            distance = hamming(value_hash, self._hashes[position])
+            if distance <= self.max_distance:
+                found.append((distance, self._values[position]))
+        found.sort(key=lambda item: item[0])
+        return found
+
+
+class ImageHashIndex:
+    """처리된 명함 이미지의 pHash 색인 (스레드 안전, 저장소에서 한 번 load 후 add로 갱신)"""
+
+    def __init__(self, max_distance: int = DEFAULT_MAX_DISTANCE):
+        self.max_distance = max_distance
+        self.loaded = False
+        self._lock = threading.Lock()
+        self._table = MultiIndexHash(max_distance)
+        self.hits = 0
+        self.lookups = 0
+        self.reused = 0
+
+    def load(self, pairs):
+        """(명함 id, 16진 pHash) 목록으로 색인 구성 (이미 구성되었으면 무시)"""
+        with self._lock:
+            if self.loaded:
+                return
+            for card_id, hex_hash in pairs:
+                self._table.add(int(hex_hash, 16), card_id)
+            self.loaded = True
+
+    def add_many(self, records):
+        """image_phash가 있는 새 결과를 색인에 추가 (load 전이면 load 때 반영되므로 무시)"""
+        with self._lock:
+            if not self.loaded:
+                return
+            for record in records:
+                if record.get('image_phash'):
+                    self._table.add(int(record['image_phash'], 16), record['id'])
+
+    def search(self, value_hash: int) -> list:
+        """max_distance 이내의 (거리, 명함 id) 목록, 가까운 순"""
+        with self._lock:
+            found = self._table.search(value_hash)
+            self.lookups += 1
+            self.hits += bool(found)
+            return found
+
+    def record_reuse(self):
+        """저장된 결과를 재사용하여 OCR/LLM을 생략한 업로드 수"""
+        with self._lock:
+            self.reused += 1
+
+    def stats(self) -> dict:
+        """헬스 체크용 통계"""
+        with self._lock:
+            return {
+                'loaded': self.loaded, 'images': self._table.size, 'max_distance': self.max_distance,
+                'lookups': self.lookups, 'hits': self.hits, 'reused': self.reused,
+            }
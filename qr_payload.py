@@ -0,0 +1,103 @@
+"""
+QR 코드용 연락처 페이로드
+
+다운로드용 VCF(CHARSET 파라미터, REV 포함)를 그대로 QR에 넣으면 양면 명함은 버전이 높아져
+렌더링이 느리고 휴대폰에서 잘 인식되지 않는다. 같은 연락처를 더 짧게 표현하고,
+그 길이에서 가장 낮은 QR 버전을 유지하는 범위 안에서 가장 높은 오류 정정 레벨을 고른다.
+
+- vcard: 다운로드용 VCF 그대로
+- vcard-min: 파라미터/REV 없는 최소 vCard 3.0 (기본)
+- mecard: MECARD (가장 짧음, 직책은 NOTE로 들어감)
+"""
+from dataclasses import dataclass
+from functools import lru_cache
+
+import qrcode
+from qrcode.exceptions import DataOverflowError
+
+import vcard
+from qr_render import ERROR_CORRECTION
+
+PAYLOAD_STYLES = ('vcard', 'vcard-min', 'mecard')
+DEFAULT_STYLE = 'vcard-min'
+
+
+@dataclass(frozen=True)
+class QrPayload:
+    """QR에 넣을 문자열과 선택된 인코딩"""
+    payload: str
+    style: str
+    error_correction: str
+    version: int
+
+    @property
+    def modules(self) -> int:
+        """한 변의 모듈 수 (테두리 제외)"""
+        return self.version * 4 + 17
+
+    def info(self) -> dict:
+        """API 응답에 포함하는 QR 정보"""
+        return {
+            'qrPayloadStyle': self.style,
+            'qrVersion': self.version,
+            'qrModules': self.modules,
+            'qrErrorCorrection': self.error_correction,
+            'qrPayloadBytes': len(self.payload.encode('utf-8')),
+        }
+
+
+def _mecard_escape(value: str) -> str:
+    return (value.replace('\\', '\\\\').replace(';', '\\;').replace(':', '\\:').replace(',', '\\,')
+            .replace('\r', '').replace('\n', ' '))
+
+
+def serialize_mecard(data: dict) -> str:
+    """MECARD 문자열 (ORG는 ZXing 계열 스캐너가 지원, 직책은 표준 필드가 없어 NOTE 사용)"""
+    name_ko = data.get('name_ko') or data.get('name', '')
+    fields = (
+        ('N', f"{name_ko} {data.get('name_en', '')}".strip()),
+        ('ORG', vcard.bilingual(data, 'company')),
+        ('TEL', data.get('phone', '')),
+        ('EMAIL', data.get('email', '')),
+        ('ADR', data.get('address_ko', '') or data.get('address', '')),
+        ('NOTE', vcard.bilingual(data, 'title')),
+    )
+    return 'MECARD:' + ''.join(f"{key}:{_mecard_escape(value)};" for key, value in fields if value) + ';'
+
+
+@lru_cache(maxsize=4096)
+def choose_error_correction(payload: str):
+    """(오류 정정 레벨, 버전): L 기준 최소 버전을 유지하는 가장 높은 레벨
+
+    모드(숫자/영숫자/바이트) 분할은 qrcode의 add_data 최적화에 맡긴다.
+    """
+    best_level, best_version = None, None
+    for level in ('L', 'M', 'Q', 'H'):
+        qr = qrcode.QRCode(error_correction=ERROR_CORRECTION[level])
+        qr.add_data(payload)
+        try:
+            version = qr.best_fit()
+        except DataOverflowError:
+            break
+        if best_version is None:
+            best_version = version
+        if version > best_version:
+            break
+        best_level = level
+    if best_level is None:
+        raise ValueError("QR 코드에 담기에는 연락처 정보가 너무 깁니다.")
+    return best_level, best_version
+
+
+def build_qr_payload(data: dict, style: str = DEFAULT_STYLE, vcf_content: str = None) -> QrPayload:
+    """연락처 → QR 페이로드 (style='vcard'면 vcf_content를 그대로 사용)"""
+    if style == 'mecard':
+        payload = serialize_mecard(data)
+    elif style == 'vcard':
+        payload = vcf_content or vcard.serialize(data)
+    elif style == 'vcard-min':
+        payload = vcard.serialize_compact(data)
+    else:
+        raise ValueError(f"지원하지 않는 QR 페이로드 형식입니다: {style}")
+    error_correction, version = choose_error_correction(payload)
+    return QrPayload(payload, style, error_correction, version)
@@ -0,0 +1,164 @@
+"""
+QR 코드 렌더링 엔진
+
+- 페이로드 해시 기반 QR 매트릭스 LRU 캐시 (같은 VCF를 다시 인코딩하지 않음)
+- 매트릭스 → SVG path 직접 변환
+- numpy 기반 1비트 PNG 인코더 (PIL 이미지 생성/그리기 생략)
+"""
+import base64
+import hashlib
+import struct
+import threading
+import zlib
+from collections import OrderedDict
+
+import numpy as np
+import qrcode
+
+ERROR_CORRECTION = {
+    'L': qrcode.constants.ERROR_CORRECT_L,
+    'M': qrcode.constants.ERROR_CORRECT_M,
+    'Q': qrcode.constants.ERROR_CORRECT_Q,
+    'H': qrcode.constants.ERROR_CORRECT_H,
+}
+
+DEFAULT_BOX_SIZE = 10
+DEFAULT_BORDER = 4
+
+MIME_TYPES = {'png': 'image/png', 'svg': 'image/svg+xml'}
+
+
+def payload_hash(payload: str, error_correction: str = 'L') -> str:
+    """캐시 키 / ETag로 쓰는 페이로드 해시"""
+    return hashlib.sha256(f"{error_correction}:{payload}".encode('utf-8')).hexdigest()
+
+
+class MatrixCache:
+    """페이로드 해시 → QR 매트릭스(numpy bool, 테두리 포함) LRU 캐시"""
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, np.ndarray] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def peek(self, payload: str, error_correction: str = 'L', border: int = DEFAULT_BORDER):
+        """캐시에 있으면 매트릭스, 없으면 None (새로 계산하지 않음)"""
+        key = payload_hash(payload, error_correction) + f":{border}"
+        with self._lock:
+            matrix = self._entries.get(key)
+            if matrix is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+            return matrix
+
+    def put(self, payload: str, matrix: np.ndarray, error_correction: str = 'L', border: int = DEFAULT_BORDER):
+        """다른 프로세스에서 계산한 매트릭스를 캐시에 추가"""
+        key = payload_hash(payload, error_correction) + f":{border}"
+        matrix.setflags(write=False)
+        with self._lock:
+            self._entries[key] = matrix
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get(self, payload: str, error_correction: str = 'L', border: int = DEFAULT_BORDER) -> np.ndarray:
+        key = payload_hash(payload, error_correction) + f":{border}"
+        with self._lock:
+            matrix = self._entries.get(key)
+            if matrix is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return matrix
+            self.misses += 1
+
+        matrix = build_matrix(payload, error_correction, border)
+        self.put(payload, matrix, error_correction, border)
+        return matrix
+
+    def stats(self) -> dict:
+        """헬스 체크용 통계"""
+        with self._lock:
+            return {'entries': len(self._entries), 'hits': self.hits, 'misses': self.misses}
+
+
+def build_matrix(payload: str, error_correction: str = 'L', border: int = DEFAULT_BORDER) -> np.ndarray:
+    """qrcode 라이브러리로 모듈 매트릭스만 계산 (이미지 생성 없음)"""
+    qr = qrcode.QRCode(version=None, error_correction=ERROR_CORRECTION[error_correction], border=border)
+    qr.add_data(payload)
+    qr.make(fit=True)
+    matrix = np.array(qr.get_matrix(), dtype=bool)
+    matrix.setflags(write=False)  # 캐시에서 공유되므로 읽기 전용
+    return matrix
+
+
+def _png_chunk(tag: bytes, data: bytes) -> bytes:
+    return struct.pack('>I', len(data)) + tag + data + struct.pack('>I', zlib.crc32(tag + data))
+
+
+def render_png(matrix: np.ndarray, box_size: int = DEFAULT_BOX_SIZE) -> bytes:
+    """매트릭스 → 1비트 흑백 PNG 바이트"""
+    # 검은 모듈 = 0, 흰 배경 = 1 (그레이스케일 1비트)
+    pixels = np.repeat(np.repeat(~matrix, box_size, axis=0), box_size, axis=1)
+    height, width = pixels.shape
+    rows = np.packbits(pixels, axis=1)
+    scanlines = np.hstack([np.zeros((height, 1), dtype=np.uint8), rows])  # 각 행 앞 필터 바이트(0)
+
+    return b''.join([
+        b'\x89PNG\r\n\x1a\n',
+        _png_chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 1, 0, 0, 0, 0)),
+        _png_chunk(b'IDAT', zlib.compress(scanlines.tobytes(), 6)),
+        _png_chunk(b'IEND', b''),
+    ])
+
+
+def render_svg(matrix: np.ndarray, box_size: int = DEFAULT_BOX_SIZE) -> str:
+    """매트릭스 → SVG (행마다 연속된 검은 모듈을 하나의 사각형 path로 묶음)"""
+    size = matrix.shape[0]
+    padded = np.zeros((size, size + 2), dtype=np.int8)
+    padded[:, 1:-1] = matrix
+    edges = np.diff(padded, axis=1)
+
+    path = []
+    for y in range(size):
+        starts = np.flatnonzero(edges[y] == 1)
+        ends = np.flatnonzero(edges[y] == -1)
+        for x, end in zip(starts, ends):
+            path.append(f"M{x} {y}h{end - x}v1h-{end - x}z")
+
+    pixels = size * box_size
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{pixels}" height="{pixels}" '
+        f'viewBox="0 0 {size} {size}" shape-rendering="crispEdges">'
+        f'<rect width="{size}" height="{size}" fill="#fff"/>'
+        f'<path d="{"".join(path)}" fill="#000"/></svg>'
+    )
+
+
+def render(matrix: np.ndarray, fmt: str = 'png', box_size: int = DEFAULT_BOX_SIZE) -> bytes:
+    """지정 형식(png/svg)으로 렌더링한 바이트"""
+    if fmt == 'svg':
+        return render_svg(matrix, box_size).encode('utf-8')
+    return render_png(matrix, box_size)
+
+
+def negotiate_format(accept_mimetypes) -> str:
+    """Accept 헤더로 형식 선택 (명시적으로 SVG를 선호할 때만 svg, 기본 png)"""
+    best = accept_mimetypes.best_match([MIME_TYPES['png'], MIME_TYPES['svg']], default=MIME_TYPES['png'])
+    return 'svg' if best == MIME_TYPES['svg'] else 'png'
+
+
+MATRIX_CACHE = MatrixCache()
+
+
+def qr_base64(payload: str, fmt: str = 'png', error_correction: str = 'L') -> str:
+    """캐시된 매트릭스로 QR 이미지를 렌더링해 base64 문자열로 반환"""
+    matrix = MATRIX_CACHE.get(payload, error_correction)
+    return base64.b64encode(render(matrix, fmt)).decode()
+
+
+def render_qr_job(payload: str, fmt: str = 'png', error_correction: str = 'L'):
+    """워커 프로세스용: (매트릭스, base64 이미지) 반환 - 호출한 쪽이 매트릭스를 자기 캐시에 넣는다"""
+    matrix = MATRIX_CACHE.get(payload, error_correction)
+    return matrix, base64.b64encode(render(matrix, fmt)).decode()
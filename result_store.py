@@ -0,0 +1,79 @@
+"""
+처리된 명함 결과를 card id로 보관하는 TTL 저장소
+
+다운로드/VCF·QR 재생성 요청이 썸네일을 포함한 전체 데이터를 다시 보내지 않고
+id 목록과 필드 단위 수정사항만 보내도록 서버 쪽에 결과를 보관한다.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+
+class ResultStore:
+    """스레드 안전한 TTL + 최대 개수 제한 저장소 (오래된 항목부터 제거)"""
+
+    def __init__(self, ttl_seconds: float, max_items: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_items = max_items
+        self._lock = threading.Lock()
+        self._items: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+
+    def _purge_locked(self, now: float):
+        while self._items:
+            card_id, (expires_at, _) = next(iter(self._items.items()))
+            if expires_at > now and len(self._items) <= self.max_items:
+                break
+            del self._items[card_id]
+
+    def put(self, card_id: str, record: dict):
+        """결과 저장 (record: id, source, data 등)"""
+        now = time.time()
+        with self._lock:
+            self._items.pop(card_id, None)
+            self._items[card_id] = (now + self.ttl_seconds, record)
+            self._purge_locked(now)
+
+    def get(self, card_id: str):
+        """저장된 결과 (없거나 만료되면 None)"""
+        with self._lock:
+            entry = self._items.get(card_id)
+            if entry is None or entry[0] <= time.time():
+                return None
+            return entry[1]
+
+    def apply_edits(self, card_id: str, edits: dict = None):
+        """필드 단위 수정사항을 반영한 결과를 반환하고 만료 시간을 연장 (없으면 None)"""
+        now = time.time()
+        with self._lock:
+            entry = self._items.get(card_id)
+            if entry is None or entry[0] <= now:
+                return None
+            record = entry[1]
+            if edits:
+                record['data'] = {**record['data'], **{key: str(value) for key, value in edits.items()}}
+            self._items.move_to_end(card_id)
+            self._items[card_id] = (now + self.ttl_seconds, record)
+            return record
+
+    def resolve(self, card_ids, edits: dict = None):
+        """id 목록을 결과 목록으로 변환: (찾은 결과들, 만료/없는 id들)"""
+        edits = edits or {}
+        found, missing = [], []
+        for card_id in card_ids:
+            record = self.apply_edits(card_id, edits.get(card_id))
+            if record is None:
+                missing.append(card_id)
+            else:
+                found.append(record)
+        return found, missing
+
+    def discard(self, card_ids):
+        """삭제/병합된 연락처의 결과 제거 (QR/다운로드가 지워진 데이터를 돌려주지 않도록)"""
+        with self._lock:
+            for card_id in card_ids:
+                self._items.pop(card_id, None)
+
+    def stats(self) -> dict:
+        """헬스 체크용 통계"""
+        with self._lock:
+            return {'items': len(self._items), 'ttl_seconds': self.ttl_seconds, 'max_items': self.max_items}
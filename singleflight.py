@@ -0,0 +1,68 @@
+"""
+동일한 작업이 동시에 여러 번 실행되지 않도록 진행 중인 계산을 공유하는 single-flight 유틸리티
+"""
+import hashlib
+import threading
+from concurrent.futures import Future
+
+
+def content_hash(data) -> str:
+    """이미지 바이트 또는 텍스트의 SHA-256 해시"""
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+    return hashlib.sha256(data).hexdigest()
+
+
+class SingleFlight:
+    """키별로 진행 중인 Future를 공유하는 single-flight 그룹
+
+    같은 키로 작업이 이미 실행 중이면 새로 제출하지 않고 기존 Future를 돌려준다.
+    작업이 끝나면 키가 제거되므로 완료된 결과를 캐싱하지는 않는다.
+
+    waiter를 넘기면 키별 대기자 목록에 추가되고, 처음 작업을 시작하는 호출은
+    그 목록을 waiters 키워드 인자로 받는다. (예: 대기 중인 모든 요청의 마감시간 확인)
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self._inflight: dict[str, tuple[Future, list]] = {}
+        self.started = 0
+        self.coalesced = 0
+
+    def submit(self, key: str, submit_fn, *args, waiter=None, **kwargs) -> Future:
+        """진행 중인 작업이 있으면 합류하고, 없으면 submit_fn(*args, **kwargs)로 새 작업을 시작"""
+        with self._lock:
+            entry = self._inflight.get(key)
+            if entry is not None:
+                future, waiters = entry
+                if waiter is not None:
+                    waiters.append(waiter)
+                self.coalesced += 1
+                return future
+
+            waiters = []
+            if waiter is not None:
+                waiters.append(waiter)
+                kwargs['waiters'] = waiters
+            future = submit_fn(*args, **kwargs)
+            self._inflight[key] = (future, waiters)
+            self.started += 1
+
+        future.add_done_callback(lambda done, key=key: self._forget(key, done))
+        return future
+
+    def _forget(self, key: str, future: Future):
+        with self._lock:
+            entry = self._inflight.get(key)
+            if entry is not None and entry[0] is future:
+                del self._inflight[key]
+
+    def stats(self) -> dict:
+        """헬스 체크용 통계"""
+        with self._lock:
+            return {
+                'in_flight': len(self._inflight),
+                'started': self.started,
+                'coalesced': self.coalesced,
+            }
@@ -0,0 +1,81 @@
+"""
+multipart/form-data 요청 본문을 도착하는 대로 파싱하는 스트리밍 업로드 파서
+
+Flask의 request.files는 본문 전체를 받은 뒤에야 사용할 수 있으므로,
+파일 파트가 완성되는 즉시 파이프라인에 넘기기 위해 werkzeug의 sans-io 디코더를 직접 사용한다.
+"""
+import hashlib
+import os
+from dataclasses import dataclass
+
+from werkzeug.http import parse_options_header
+from werkzeug.sansio.multipart import Data, Epilogue, File, MultipartDecoder, NeedData
+from werkzeug.utils import secure_filename
+
+READ_CHUNK_SIZE = 64 * 1024
+
+
+class UploadTooLarge(Exception):
+    """파일 하나가 크기 제한을 넘음 (HTTP 413 으로 응답)"""
+
+
+@dataclass
+class UploadedFile:
+    """스트림에서 완성된 파일 파트 하나"""
+    index: int
+    filename: str
+    path: str
+    data: bytes
+    sha256: str
+
+
+def get_multipart_boundary(content_type: str):
+    """Content-Type 헤더에서 multipart boundary 추출 (multipart가 아니면 None)"""
+    mimetype, options = parse_options_header(content_type or '')
+    if mimetype != 'multipart/form-data' or not options.get('boundary'):
+        return None
+    return options['boundary'].encode('latin-1')
+
+
+def iter_uploaded_files(stream, boundary: bytes, temp_dir: str, field_name: str, max_file_size: int):
+    """요청 스트림에서 field_name 파일 파트가 완성될 때마다 UploadedFile을 yield
+
+    파일 크기 제한은 바이트가 들어오는 동안 검사하므로, 큰 파일은 끝까지 받기 전에 거절된다.
+    다른 필드의 데이터는 읽고 버린다.
+    """
+    decoder = MultipartDecoder(boundary)
+    current = None  # (filename, bytearray) - 수집 중인 파일 파트
+    index = 0
+
+    while True:
+        event = decoder.next_event()
+
+        if isinstance(event, NeedData):
+            # 스트림이 끝나면 None을 넘겨 완료 처리 (본문이 잘린 경우 디코더가 ValueError 발생)
+            chunk = stream.read(READ_CHUNK_SIZE)
+            decoder.receive_data(chunk or None)
+            continue
+
+        if isinstance(event, File):
+            current = (event.filename, bytearray()) if event.name == field_name and event.filename else None
+
+        elif isinstance(event, Data):
+            if current is None:
+                continue
+            filename, buffer = current
+            buffer += event.data
+            if len(buffer) > max_file_size:
+                raise UploadTooLarge(f"'{filename}' 파일이 최대 크기({max_file_size // (1024 * 1024)}MB)를 초과합니다.")
+
+            if not event.more_data:
+                data = bytes(buffer)
+                safe_name = secure_filename(filename) or 'image'
+                path = os.path.join(temp_dir, f"{index}_{safe_name}")
+                with open(path, 'wb') as f:
+                    f.write(data)
+                yield UploadedFile(index, safe_name, path, data, hashlib.sha256(data).hexdigest())
+                index += 1
+                current = None
+
+        elif isinstance(event, Epilogue):
+            break
@@ -0,0 +1,164 @@
+"""
+vCard 3.0 / 4.0 직렬화
+
+- 버전별 필드 레이아웃(속성 접두어 + 값 함수)을 모듈 로드 시 한 번만 구성
+- RFC 6350 텍스트 이스케이프 (\\ , ; 줄바꿈) 및 75옥텟 줄 접기 (UTF-8 문자 중간에서 자르지 않음)
+- REV 등 공통 값은 VCardSerializer 생성 시 한 번만 계산 (배치 단위로 재사용)
+"""
+from datetime import datetime, timezone
+
+DEFAULT_VERSION = '3.0'
+MAX_LINE_OCTETS = 75
+CRLF = '\r\n'
+
+
+def escape(value: str) -> str:
+    """TEXT 값 이스케이프 (str.translate보다 해당 문자가 없을 때 훨씬 빠른 replace 연쇄)"""
+    if not value:
+        return ''
+    return (value.replace('\\', '\\\\').replace(',', '\\,').replace(';', '\\;')
+            .replace('\r', '').replace('\n', '\\n'))
+
+
+def fold(line: str) -> str:
+    """75옥텟을 넘는 줄을 CRLF + 공백으로 접음 (UTF-8 멀티바이트 문자는 나누지 않음)"""
+    # 한 글자는 최대 3바이트(BMP)이므로 25자 이하면 인코딩할 필요 없음
+    if len(line) <= MAX_LINE_OCTETS // 3:
+        return line
+    data = line.encode('utf-8')
+    if len(data) <= MAX_LINE_OCTETS:
+        return line
+
+    parts = []
+    start, limit = 0, MAX_LINE_OCTETS
+    while len(data) - start > limit:
+        end = start + limit
+        while data[end] & 0xC0 == 0x80:  # continuation byte면 문자 시작 위치로 후퇴
+            end -= 1
+        parts.append(data[start:end].decode('utf-8'))
+        start, limit = end, MAX_LINE_OCTETS - 1  # 이어지는 줄은 앞의 공백 1바이트 포함
+    parts.append(data[start:].decode('utf-8'))
+    return (CRLF + ' ').join(parts)
+
+
+def bilingual(data: dict, key: str) -> str:
+    """한글/영문 필드를 '한글 / 영문'으로 합침 (단면 명함은 key 필드 사용)"""
+    ko = data.get(f'{key}_ko') or data.get(key, '')
+    en = data.get(f'{key}_en', '')
+    return f"{ko}{' / ' if ko and en else ''}{en}"
+
+
+# 필드 값 함수: 이스케이프된 값 (없으면 빈 문자열)
+
+def _full_name(data: dict) -> str:
+    name_ko = data.get('name_ko') or data.get('name', '')
+    return escape(f"{name_ko} {data.get('name_en', '')}".strip())
+
+
+def _structured_name(data: dict) -> str:
+    name_ko = data.get('name_ko') or data.get('name', '')
+    name_en = data.get('name_en', '')
+    if not (name_ko or name_en):
+        return ''
+    return f"{escape(name_ko or name_en)};{escape(name_en if name_ko else '')};;;"
+
+
+def _title(data: dict) -> str:
+    return escape(bilingual(data, 'title'))
+
+
+def _org(data: dict) -> str:
+    return escape(bilingual(data, 'company'))
+
+
+def _phone(data: dict) -> str:
+    return escape(data.get('phone', ''))
+
+
+def _email(data: dict) -> str:
+    return escape(data.get('email', ''))
+
+
+def _address(data: dict) -> str:
+    address = data.get('address_ko', '') or data.get('address', '')
+    return f";;{escape(address)};;;;" if address else ''
+
+
+# (속성 접두어, 값 함수, 값이 없어도 출력할지)
+LAYOUTS = {
+    '3.0': (
+        ('FN;CHARSET=UTF-8:', _full_name, False),
+        ('N;CHARSET=UTF-8:', _structured_name, False),
+        ('TITLE;CHARSET=UTF-8:', _title, False),
+        ('ORG;CHARSET=UTF-8:', _org, False),
+        ('TEL;TYPE=WORK,VOICE:', _phone, False),
+        ('EMAIL;TYPE=WORK:', _email, False),
+        ('ADR;TYPE=WORK;CHARSET=UTF-8:', _address, False),
+    ),
+    '4.0': (
+        ('FN:', _full_name, True),  # 4.0에서 FN은 필수
+        ('N:', _structured_name, False),
+        ('TITLE:', _title, False),
+        ('ORG:', _org, False),
+        ('TEL;TYPE=work,voice:', _phone, False),
+        ('EMAIL;TYPE=work:', _email, False),
+        ('ADR;TYPE=work:', _address, False),
+    ),
+}
+
+
+# QR 페이로드용 최소 vCard 3.0: 파라미터(CHARSET/TYPE)와 REV 없음, LF 줄바꿈, 줄 접기 없음
+COMPACT_LAYOUT = (
+    ('FN:', _full_name),
+    ('N:', _structured_name),
+    ('TITLE:', _title),
+    ('ORG:', _org),
+    ('TEL:', _phone),
+    ('EMAIL:', _email),
+    ('ADR:', _address),
+)
+
+
+class VCardSerializer:
+    """버전과 REV를 고정한 직렬화기 (배치마다 하나 생성)"""
+
+    def __init__(self, version: str = DEFAULT_VERSION, rev: datetime = None):
+        if version not in LAYOUTS:
+            raise ValueError(f"지원하지 않는 vCard 버전입니다: {version}")
+        rev = rev or datetime.now(timezone.utc)
+        self.version = version
+        self._layout = LAYOUTS[version]
+        self._head = f"BEGIN:VCARD{CRLF}VERSION:{version}"
+        self._tail = f"REV:{rev.strftime('%Y%m%dT%H%M%SZ')}{CRLF}END:VCARD{CRLF}"
+
+    def serialize(self, data: dict) -> str:
+        """연락처 하나 → vCard 문자열 (모든 줄 CRLF로 끝남)"""
+        lines = [self._head]
+        for prefix, value_fn, required in self._layout:
+            value = value_fn(data)
+            if value or required:
+                lines.append(fold(prefix + value))
+        lines.append(self._tail)
+        return CRLF.join(lines)
+
+    def serialize_many(self, contacts):
+        """연락처 이터러블 → vCard 문자열 스트림"""
+        serialize = self.serialize
+        for data in contacts:
+            yield serialize(data)
+
+
+def serialize(data: dict, version: str = DEFAULT_VERSION) -> str:
+    """연락처 하나를 직렬화 (REV는 현재 시각)"""
+    return VCardSerializer(version).serialize(data)
+
+
+def serialize_compact(data: dict) -> str:
+    """QR 코드에 넣을 가장 짧은 vCard (스캐너가 받아들이는 최소 형식)"""
+    lines = ['BEGIN:VCARD', 'VERSION:3.0']
+    for prefix, value_fn in COMPACT_LAYOUT:
+        value = value_fn(data)
+        if value:
+            lines.append(prefix + value)
+    lines.append('END:VCARD')
+    return '\n'.join(lines)
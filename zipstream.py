@@ -0,0 +1,129 @@
+"""
+메모리에 ZIP 전체를 만들지 않고 항목이 생성되는 대로 내보내는 스트리밍 ZIP 작성기
+
+각 항목은 이미 메모리에 있는 작은 파일(VCF 등)이므로 CRC와 크기를 먼저 계산하여
+local file header에 바로 기록한다 (data descriptor 불필요).
+central directory 항목(항목당 약 100바이트)만 끝까지 보관한다.
+오프셋이나 항목 수가 ZIP 한계를 넘으면 ZIP64 레코드를 사용한다.
+"""
+import struct
+import time
+import zlib
+
+ZIP_STORED = 0
+ZIP_DEFLATED = 8
+
+ZIP64_LIMIT = 0xFFFFFFFF
+ZIP64_COUNT_LIMIT = 0xFFFF
+UTF8_FLAG = 0x0800  # 파일명 UTF-8 (한글 파일명)
+VERSION_DEFAULT = 20
+VERSION_ZIP64 = 45
+
+
+def _dos_datetime(timestamp: float = None):
+    t = time.localtime(timestamp)
+    dos_time = (t.tm_hour << 11) | (t.tm_min << 5) | (t.tm_sec // 2)
+    dos_date = ((t.tm_year - 1980) << 9) | (t.tm_mon << 5) | t.tm_mday
+    return dos_time, dos_date
+
+
+class ZipStreamWriter:
+    """항목 단위로 바이트 청크를 생성하는 ZIP 작성기"""
+
+    def __init__(self, compresslevel: int = 6, timestamp: float = None):
+        self.compresslevel = compresslevel
+        self._dos_time, self._dos_date = _dos_datetime(timestamp)
+        self._offset = 0
+        self._central = []
+        self._names = set()
+        self._next_suffix = {}
+
+    def _unique_name(self, name: str) -> str:
+        """스트림에서는 덮어쓸 수 없으므로 중복 파일명에 번호를 붙임"""
+        if name not in self._names:
+            self._names.add(name)
+            return name
+        stem, dot, ext = name.rpartition('.')
+        if not dot:
+            stem, ext = name, ''
+        counter = self._next_suffix.get(name, 2)  # 같은 이름이 많아도 매번 2부터 다시 세지 않음
+        while True:
+            candidate = f"{stem}_{counter}{dot}{ext}"
+            counter += 1
+            if candidate not in self._names:
+                self._names.add(candidate)
+                self._next_suffix[name] = counter
+                return candidate
+
+    def _compress(self, data: bytes):
+        """deflate 결과가 원본보다 작을 때만 압축 (작은 VCF는 stored가 더 작고 빠름)"""
+        compressor = zlib.compressobj(self.compresslevel, zlib.DEFLATED, -15)
+        compressed = compressor.compress(data) + compressor.flush()
+        if len(compressed) < len(data):
+            return ZIP_DEFLATED, compressed
+        return ZIP_STORED, data
+
+    def add(self, name: str, data):
+        """항목 하나를 local file header + 데이터 청크로 yield"""
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+        filename = self._unique_name(name).encode('utf-8')
+        crc = zlib.crc32(data)
+        method, payload = self._compress(data)
+
+        header = struct.pack(
+            '<IHHHHHIIIHH',
+            0x04034B50, VERSION_DEFAULT, UTF8_FLAG, method,
+            self._dos_time, self._dos_date, crc, len(payload), len(data),
+            len(filename), 0,
+        )
+        self._central.append((filename, method, crc, len(payload), len(data), self._offset))
+        self._offset += len(header) + len(filename) + len(payload)
+        yield header + filename
+        yield payload
+
+    def finish(self):
+        """central directory와 end of central directory 레코드를 yield"""
+        cd_start = self._offset
+        cd_size = 0
+        for filename, method, crc, compressed_size, size, offset in self._central:
+            extra = b''
+            version = VERSION_DEFAULT
+            if offset >= ZIP64_LIMIT:
+                extra = struct.pack('<HHQ', 0x0001, 8, offset)
+                offset = ZIP64_LIMIT
+                version = VERSION_ZIP64
+            record = struct.pack(
+                '<IHHHHHHIIIHHHHHII',
+                0x02014B50, version, version, UTF8_FLAG, method,
+                self._dos_time, self._dos_date, crc, compressed_size, size,
+                len(filename), len(extra), 0, 0, 0, 0, offset,
+            ) + filename + extra
+            cd_size += len(record)
+            yield record
+
+        count = len(self._central)
+        cd_end = cd_start + cd_size
+        if count >= ZIP64_COUNT_LIMIT or cd_start >= ZIP64_LIMIT or cd_size >= ZIP64_LIMIT:
+            yield struct.pack(
+                '<IQHHIIQQQQ',
+                0x06064B50, 44, VERSION_ZIP64, VERSION_ZIP64, 0, 0,
+                count, count, cd_size, cd_start,
+            )
+            yield struct.pack('<IIQI', 0x07064B50, 0, cd_end, 1)
+            yield struct.pack(
+                '<IHHHHIIH',
+                0x06054B50, 0, 0,
+                min(count, ZIP64_COUNT_LIMIT), min(count, ZIP64_COUNT_LIMIT),
+                min(cd_size, ZIP64_LIMIT), min(cd_start, ZIP64_LIMIT), 0,
+            )
+        else:
+            yield struct.pack('<IHHHHIIH', 0x06054B50, 0, 0, count, count, cd_size, cd_start, 0)
+
+
+def stream_zip(entries, compresslevel: int = 6):
+    """(파일명, 내용) 이터러블을 ZIP 바이트 청크 스트림으로 변환"""
+    writer = ZipStreamWriter(compresslevel)
+    for name, data in entries:
+        yield from writer.add(name, data)
+    yield from writer.finish()